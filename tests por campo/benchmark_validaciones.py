@@ -0,0 +1,206 @@
+import argparse
+import datetime
+import gc
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from clasificador_fechas import clasificar_fechas
+from coercion import convertir_columna
+from columna_diccionario import codificar_columnas, columna_diccionario
+from consistencia_total import comparar_total
+from dataset_ventas import COLUMNAS_VENTAS, cargar_ventas, ruta_ventas
+from generador_ventas import PerfilVentas, generar_dataframe
+from indice_duplicados import IndiceDuplicados
+from multipatron import buscar_patrones
+from perfil_numerico import perfilar_columna
+from reglas import cargar_reglas, evaluar_reglas
+from snapshot_columnar import leer_snapshot, publicar_snapshot
+
+'''
+Benchmark de las validaciones por columna con volúmenes mayores que ventas1.xlsx.
+
+Para cada cantidad de filas se arma un conjunto de datos con el esquema de ventas y se mide, por
+etapa, el tiempo (de reloj y de CPU) y el pico de memoria de Python (tracemalloc):
+
+- carga: abrir la instantánea columnar y codificar las columnas de texto (y leer el xlsx hasta
+  --max-filas-xlsx filas, porque escribir y leer xlsx más grandes no es práctico).
+- coercion: conversión a número y perfil de precio, cantidad_vendida y total_venta.
+- consistencia: conversión de las tres columnas y total_venta = precio × cantidad_vendida por fila.
+- textos: búsqueda de patrones y caracteres especiales en las columnas de texto.
+- fechas: clasificación de formatos de fecha_venta.
+- duplicados: índice de duplicados de id_producto y su relación con nombre_producto.
+- reglas: evaluación de reglas_ventas.json.
+
+El tiempo se mide sin tracemalloc (que hace más lento el código Python) y la memoria en una segunda
+ejecución de la etapa; con --sin-memoria se omite esa segunda ejecución. Por defecto las filas se
+toman al azar del archivo; con --sintetico se generan con generador_ventas.py (valores nuevos con los
+mismos defectos y la misma distribución de repeticiones de id_producto). Si una etapa falla (por
+ejemplo con MemoryError) se registra el error y se sigue con las demás. Los resultados se reescriben
+en el archivo JSON después de cada medición:
+
+python benchmark_validaciones.py --filas 10000 100000 1000000 10000000 --salida resultados_benchmark.json
+'''
+
+FILAS = [10_000, 100_000, 1_000_000, 10_000_000]
+MAX_FILAS_XLSX = 100_000
+RUTA_REGLAS = Path(__file__).parent / "reglas_ventas.json"
+
+COLUMNAS_NUMERICAS = ['precio', 'cantidad_vendida', 'total_venta']
+CARACTERES_ESPECIALES = ['Ã³', 'Ã©', 'Ã¡', 'Ã']
+PATRONES = {
+    'region': CARACTERES_ESPECIALES + ['Centro', 'Este', 'Norte', 'Oeste', 'Sur'],
+    'metodo_pago': CARACTERES_ESPECIALES + ['Efectivo', 'PayPal', 'Tarjeta de CrÃ©dito'],
+    'nombre_cliente': CARACTERES_ESPECIALES + ['Miguel Torres', 'Carlos', 'Ana'],
+}
+
+
+def ampliar_datos(base, filas, semilla=0):
+    '''Conjunto de datos de filas registros tomados al azar (con reposición) de los datos base.'''
+    posiciones = np.random.default_rng(semilla).integers(0, len(base), size=filas)
+    return base.take(posiciones).reset_index(drop=True)
+
+
+def etapa_carga(directorio):
+    snapshot = leer_snapshot(directorio / "snapshot")
+    data = snapshot.a_dataframe()
+    codificar_columnas(data, snapshot=snapshot)
+    return data
+
+
+def etapa_carga_xlsx(directorio):
+    return pd.read_excel(directorio / "ventas.xlsx")
+
+
+def etapa_coercion(data):
+    return [perfilar_columna(data[columna], rangos=[(100, 200)], prefijos=['$', '-'], contiene=['-'],
+                             numerica=convertir_columna(data[columna])) for columna in COLUMNAS_NUMERICAS]
+
+
+def etapa_consistencia(data):
+    return comparar_total(*(convertir_columna(data[columna]) for columna in COLUMNAS_NUMERICAS), indice=data.index).resumen()
+
+
+def etapa_textos(data):
+    conteos = {columna: buscar_patrones(data[columna], patrones).conteos() for columna, patrones in PATRONES.items()}
+    for columna in ['categoria', 'nombre_producto']:
+        conteos[columna] = int(columna_diccionario(data, columna).evaluar(
+            lambda valores: valores.str.contains('|'.join(CARACTERES_ESPECIALES), na=False)).sum())
+    return conteos
+
+
+def etapa_fechas(data):
+    return clasificar_fechas(data['fecha_venta']).conteos()
+
+
+def etapa_duplicados(data):
+    indice = IndiceDuplicados(data['id_producto'])
+    return indice.histograma(), len(indice.inconsistentes(data['nombre_producto']))
+
+
+def etapa_reglas(data):
+    return evaluar_reglas(data, cargar_reglas(RUTA_REGLAS))
+
+
+def medir(funcion, argumento, memoria=True):
+    '''Ejecuta la etapa y devuelve (resultado, medición).'''
+    gc.collect()
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    resultado = funcion(argumento)
+    medicion = {"segundos": round(time.perf_counter() - inicio, 4),
+                "cpu_segundos": round(time.process_time() - inicio_cpu, 4)}
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            funcion(argumento)
+            medicion["memoria_pico_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        finally:
+            tracemalloc.stop()
+    return resultado, medicion
+
+
+def _entorno():
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+    }
+
+
+def _guardar(salida, resultados):
+    temporal = salida.with_suffix(".tmp")
+    temporal.write_text(json.dumps(resultados, ensure_ascii=False, indent=2), encoding="utf-8")
+    temporal.replace(salida)
+
+
+def ejecutar(base, filas=FILAS, salida="resultados_benchmark.json", semilla=0, memoria=True,
+             max_filas_xlsx=MAX_FILAS_XLSX, generar=ampliar_datos):
+    '''Corre todas las etapas para cada cantidad de filas y devuelve los resultados guardados en salida.'''
+    salida = Path(salida)
+    resultados = {"entorno": _entorno(), "mediciones": []}
+    etapas = [("coercion", etapa_coercion), ("consistencia", etapa_consistencia), ("textos", etapa_textos), ("fechas", etapa_fechas),
+              ("duplicados", etapa_duplicados), ("reglas", etapa_reglas)]
+
+    def registrar(cantidad, etapa, medicion):
+        resultados["mediciones"].append({"filas": cantidad, "etapa": etapa, **medicion})
+        _guardar(salida, resultados)
+        detalle = medicion.get("error") or f"{medicion['segundos']:.3f} s, {medicion.get('memoria_pico_mb', '-')} MB"
+        print(f"{cantidad:>12,} filas  {etapa:<12} {detalle}")
+
+    for cantidad in filas:
+        with tempfile.TemporaryDirectory() as temporal:
+            directorio = Path(temporal)
+            try:
+                datos = generar(base, cantidad, semilla)
+                publicar_snapshot(datos, directorio / "snapshot")
+                if cantidad <= max_filas_xlsx:
+                    datos.to_excel(directorio / "ventas.xlsx", index=False)
+                del datos
+                data, medicion = medir(etapa_carga, directorio, memoria)
+            except MemoryError as error:
+                registrar(cantidad, "carga", {"error": f"{type(error).__name__}: {error}"})
+                continue
+            registrar(cantidad, "carga", medicion)
+            if cantidad <= max_filas_xlsx:
+                registrar(cantidad, "carga_xlsx", medir(etapa_carga_xlsx, directorio, memoria)[1])
+            for etapa, funcion in etapas:
+                try:
+                    medicion = medir(funcion, data, memoria)[1]
+                except Exception as error:
+                    medicion = {"error": f"{type(error).__name__}: {error}"}
+                registrar(cantidad, etapa, medicion)
+            del data
+    return resultados
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las validaciones por columna.")
+    parser.add_argument("--filas", type=int, nargs="+", default=FILAS, help="Cantidades de filas a medir.")
+    parser.add_argument("--ventas", default=None, help="Archivo de ventas del que se toman las filas.")
+    parser.add_argument("--salida", default="resultados_benchmark.json", help="Archivo JSON de resultados.")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sintetico", action="store_true", help="Generar filas nuevas en lugar de repetir las del archivo.")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir el pico de memoria.")
+    parser.add_argument("--max-filas-xlsx", type=int, default=MAX_FILAS_XLSX,
+                        help="Medir también la lectura del xlsx hasta esta cantidad de filas.")
+    opciones = parser.parse_args(argumentos)
+    base = cargar_ventas(opciones.ventas or ruta_ventas())[COLUMNAS_VENTAS]
+    generar = ampliar_datos
+    if opciones.sintetico:
+        perfil = PerfilVentas.aprender(base)
+        generar = lambda base, filas, semilla: generar_dataframe(perfil, filas, semilla)
+    ejecutar(base, opciones.filas, opciones.salida, opciones.semilla, not opciones.sin_memoria, opciones.max_filas_xlsx,
+             generar=generar)
+
+
+if __name__ == "__main__":
+    main()
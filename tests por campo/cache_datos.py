@@ -0,0 +1,31 @@
+import weakref
+
+'''
+Resultados calculados una sola vez por DataFrame.
+
+Los módulos de columnas (coercion, columna_diccionario, reparacion_texto, indice_duplicados) guardan
+aquí lo que calculan sobre el DataFrame compartido de la sesión, que no se modifica. El DataFrame se
+identifica por id y sus resultados se liberan cuando deja de existir. Todos comparten el mismo
+diccionario por DataFrame, por eso cada módulo usa claves con su propio prefijo:
+
+columna = en_cache(data, ("numerica", "precio"), lambda: convertir_columna(data["precio"]))
+'''
+
+_cache = {}
+
+
+def resultados(data):
+    '''Diccionario de resultados del DataFrame; se libera cuando el DataFrame deja de existir.'''
+    identificador = id(data)
+    if identificador not in _cache:
+        _cache[identificador] = {}
+        weakref.finalize(data, _cache.pop, identificador, None)
+    return _cache[identificador]
+
+
+def en_cache(data, clave, calcular):
+    '''Resultado de calcular() guardado bajo clave para el DataFrame, calculado solo la primera vez.'''
+    guardados = resultados(data)
+    if clave not in guardados:
+        guardados[clave] = calcular()
+    return guardados[clave]
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from columna_diccionario import codificar_columna, columna_diccionario
+
+'''
+Clasificación de los formatos de una columna de fechas (fecha_venta) en una sola pasada.
+
+Con apply, cada caso de prueba llama a pd.to_datetime una vez por registro y vuelve a recorrer la
+columna para cada formato. clasificar_fechas trabaja sobre los valores distintos de la columna: detecta
+la forma de cada texto con una expresión regular, convierte a fecha solo los textos con forma de fecha
+(una vez por valor distinto) y reparte el resultado a los registros:
+
+fechas = clasificacion_fechas(data, 'fecha_venta')
+fechas.cantidad(ISO), fechas.cantidad(DD_MM_YYYY), fechas.no_estandar.sum(), fechas.futuras.sum()
+fechas.serie_fechas()   # columna datetime64 con las fechas reconocidas (NaT en las demás)
+
+fechas.futuras marca también los textos sin formato estándar que pd.to_datetime interpreta como una
+fecha posterior a hoy ('March 3, 2090'), igual que la revisión registro por registro.
+'''
+
+# Formato de cada registro
+ISO = 0              # texto YYYY-MM-DD que representa una fecha válida
+DD_MM_YYYY = 1       # texto DD/MM/YYYY que representa una fecha válida
+DESCONOCIDA = 2      # texto que contiene 'Fecha desconocida'
+OTRO = 3             # cualquier otro texto
+NO_TEXTO = 4         # valor que no es texto (por ejemplo una celda con tipo fecha o número)
+NULO = 5             # celda vacía
+
+FORMATOS = {ISO: "iso", DD_MM_YYYY: "dd/mm/yyyy", DESCONOCIDA: "desconocida", OTRO: "otro",
+            NO_TEXTO: "no_texto", NULO: "nulo"}
+
+TEXTO_DESCONOCIDA = 'Fecha desconocida'
+
+# Forma del texto y formato con el que se convierte a fecha
+PATRONES = (
+    (ISO, r'\d{4}-\d{1,2}-\d{1,2}', '%Y-%m-%d'),
+    (DD_MM_YYYY, r'\d{1,2}/\d{1,2}/\d{4}', '%d/%m/%Y'),
+)
+
+
+@dataclass(frozen=True)
+class ClasificacionFechas:
+    '''Formato, fecha convertida y marca de fecha futura de cada registro.'''
+    nombre: str
+    formato: np.ndarray
+    fecha: np.ndarray
+    futura: np.ndarray
+    indice: pd.Index
+
+    def __len__(self):
+        return len(self.formato)
+
+    def mascara(self, *formatos):
+        '''Máscara de los registros que tienen alguno de los formatos indicados.'''
+        return np.isin(self.formato, formatos)
+
+    def cantidad(self, *formatos):
+        '''Cantidad de registros con alguno de los formatos indicados.'''
+        return int(self.mascara(*formatos).sum())
+
+    @property
+    def no_estandar(self):
+        '''Textos que no tienen el formato YYYY-MM-DD.'''
+        return self.mascara(DD_MM_YYYY, DESCONOCIDA, OTRO)
+
+    @property
+    def futuras(self):
+        '''Registros con una fecha posterior al día de la clasificación.'''
+        return self.futura
+
+    def conteos(self):
+        '''Cantidad de registros por formato.'''
+        return {nombre: self.cantidad(formato) for formato, nombre in FORMATOS.items()}
+
+    def serie_fechas(self):
+        '''Fechas reconocidas como Series datetime64 (NaT si el registro no tiene una fecha válida).'''
+        return pd.Series(self.fecha, index=self.indice, name=self.nombre, copy=False)
+
+
+def _clasificar_valores(valores, hoy):
+    '''Clasifica los valores distintos de la columna; devuelve formato y fecha de cada uno.'''
+    distintos = pd.Series(valores, dtype=object)
+    es_texto = distintos.map(lambda valor: isinstance(valor, str)).to_numpy(dtype=bool)
+    formato = np.where(es_texto, OTRO, NO_TEXTO).astype(np.int8)
+    fecha = np.full(len(distintos), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+    textos = distintos[es_texto]
+    pendientes = np.ones(len(textos), dtype=bool)
+    for codigo, forma, formato_fecha in PATRONES:
+        candidatos = pendientes & textos.str.fullmatch(forma).to_numpy(dtype=bool)
+        if not candidatos.any():
+            continue
+        convertidas = pd.to_datetime(textos[candidatos], format=formato_fecha, errors='coerce')
+        validas = convertidas.notna().to_numpy()
+        posiciones = textos.index[candidatos][validas]
+        formato[posiciones] = codigo
+        fecha[posiciones] = convertidas[validas].to_numpy(dtype="datetime64[ns]")
+        pendientes[np.flatnonzero(candidatos)[validas]] = False
+    desconocidas = textos.index[pendientes & textos.str.contains(TEXTO_DESCONOCIDA, regex=False).to_numpy(dtype=bool)]
+    formato[desconocidas] = DESCONOCIDA
+    futura = fecha > np.datetime64(hoy, "ns")
+    # Los textos sin formato estándar también se revisan como fechas futuras: se interpretan con
+    # cualquier formato que reconozca pd.to_datetime (solo para esta marca, no cuentan como fecha)
+    if pendientes.any():
+        interpretadas = pd.to_datetime(textos[pendientes], errors='coerce', format='mixed')
+        futura[textos.index[pendientes]] = (interpretadas > hoy).to_numpy(dtype=bool)
+    return formato, fecha, futura
+
+
+def clasificar_codificada(codificada, hoy=None):
+    '''Clasifica una columna codificada como diccionario (ver columna_diccionario.py).'''
+    hoy = pd.Timestamp(hoy if hoy is not None else pd.Timestamp.now().normalize())
+    formato, fecha, futura = _clasificar_valores(codificada.valores, hoy)
+    # La posición adicional al final corresponde al código -1 (celda vacía)
+    return ClasificacionFechas(
+        nombre=codificada.nombre,
+        formato=np.append(formato, np.int8(NULO)).take(codificada.codigos),
+        fecha=np.append(fecha, np.datetime64("NaT", "ns")).take(codificada.codigos),
+        futura=np.append(futura, False).take(codificada.codigos),
+        indice=codificada.indice,
+    )
+
+
+def clasificar_fechas(serie, hoy=None):
+    '''Clasifica el formato de cada registro de la serie, evaluando cada valor distinto una sola vez.'''
+    return clasificar_codificada(codificar_columna(serie), hoy=hoy)
+
+
+def clasificacion_fechas(data, nombre, hoy=None):
+    '''Clasificación de la columna del DataFrame, usando su codificación compartida si ya existe.'''
+    return clasificar_codificada(columna_diccionario(data, nombre), hoy=hoy)
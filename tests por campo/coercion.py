@@ -0,0 +1,230 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from cache_datos import en_cache
+
+'''
+Conversión a número de columnas con tipos mezclados.
+
+Aplicar pd.to_numeric celda por celda (data['precio'].apply(lambda x: pd.to_numeric(x, ...) > 0))
+llama a pandas una vez por registro. convertir_columna convierte la columna completa una sola vez,
+resolviendo cada valor distinto una única vez, y guarda junto a cada número el estado de la celda
+original. Cualquier condición numérica queda como una máscara vectorizada sobre ese resultado:
+
+numerica = columna_numerica(data, 'precio')
+(numerica.valores > 0).sum(), numerica.entre(100, 200).sum(), numerica.cantidad(NULO)
+
+pd.to_numeric deja como no convertibles los importes escritos con formato ('$123.45', '$-15.20',
+'1.234,56 €'). convertir_moneda quita el símbolo de moneda, interpreta el signo (adelante, después del
+símbolo, al final o entre paréntesis) y los separadores de miles y decimales según el formato indicado:
+
+precio = columna_moneda(data, 'precio')                 # 1,234.56 (decimal='.')
+importe = convertir_moneda(serie, decimal=',')          # 1.234,56
+importe = convertir_moneda(serie, decimal=None)         # detecta el formato en cada texto
+
+Como en convertir_columna, cada texto distinto se interpreta una sola vez (y la interpretación queda en
+caché para las demás columnas). Un texto con separadores que no respetan el formato ('1.234,56' con
+decimal='.') queda como no convertible en lugar de convertirse a un número equivocado.
+'''
+
+# Estado de cada celda antes de la conversión
+NUMERO = 0          # la celda ya era numérica
+TEXTO_NUMERICO = 1  # texto que se pudo convertir a número ('291.7')
+NULO = 2            # celda vacía
+NO_CONVERTIBLE = 3  # texto u otro valor que no representa un número ('$12.50', 'Total inconsistente')
+TEXTO_MONEDA = 4    # importe con formato convertido por convertir_moneda ('$12.50', '1.234,56', '(15.20)')
+AMBIGUO = 5         # con decimal=None, un solo separador seguido de tres dígitos ('1,234': ¿miles o decimal?)
+
+ESTADOS = {NUMERO: "numero", TEXTO_NUMERICO: "texto_numerico", NULO: "nulo", NO_CONVERTIBLE: "no_convertible",
+           TEXTO_MONEDA: "texto_moneda", AMBIGUO: "ambiguo"}
+
+
+@dataclass(frozen=True)
+class ColumnaNumerica:
+    '''Resultado de convertir una columna: valores numéricos (NaN si no hay número) y estado por celda.'''
+    nombre: str
+    valores: np.ndarray
+    estado: np.ndarray
+    es_texto: np.ndarray
+
+    def __len__(self):
+        return len(self.valores)
+
+    def mascara(self, *estados):
+        '''Máscara de las celdas que tienen alguno de los estados indicados.'''
+        return np.isin(self.estado, estados)
+
+    def cantidad(self, *estados):
+        '''Cantidad de celdas con alguno de los estados indicados.'''
+        return int(self.mascara(*estados).sum())
+
+    @property
+    def validos(self):
+        '''Máscara de las celdas que tienen un número.'''
+        return self.mascara(NUMERO, TEXTO_NUMERICO, TEXTO_MONEDA)
+
+    def entre(self, minimo, maximo):
+        '''Máscara de los valores entre minimo y maximo (ambos incluidos).'''
+        return (self.valores >= minimo) & (self.valores <= maximo)
+
+    def serie(self):
+        '''Valores numéricos como Series, equivalente a pd.to_numeric(columna, errors='coerce').'''
+        return pd.Series(self.valores, name=self.nombre, copy=False)
+
+
+def convertir_columna(serie):
+    '''Convierte la serie a número una sola vez y registra el estado de cada celda.'''
+    if serie.dtype.kind in "iuf":
+        valores = serie.to_numpy()
+        nulos = np.isnan(valores) if serie.dtype.kind == "f" else np.zeros(len(valores), dtype=bool)
+        estado = np.where(nulos, NULO, NUMERO).astype(np.int8)
+        return ColumnaNumerica(serie.name, valores, estado, np.zeros(len(valores), dtype=bool))
+    if serie.dtype.kind == "b":
+        valores = serie.to_numpy().astype(np.int64)
+        return ColumnaNumerica(serie.name, valores, np.full(len(valores), NUMERO, dtype=np.int8),
+                               np.zeros(len(valores), dtype=bool))
+
+    # Cada valor distinto se convierte una sola vez y el resultado se reparte con los códigos
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    unicos = pd.Series(np.asarray(unicos, dtype=object))
+    numeros_unicos = pd.to_numeric(unicos, errors='coerce').to_numpy(dtype=np.float64)
+    texto_unicos = unicos.map(lambda valor: isinstance(valor, str)).to_numpy(dtype=bool)
+    estado_unicos = np.where(np.isnan(numeros_unicos), NO_CONVERTIBLE,
+                             np.where(texto_unicos, TEXTO_NUMERICO, NUMERO)).astype(np.int8)
+
+    # La posición adicional al final corresponde al código -1 (celda vacía)
+    valores = np.append(numeros_unicos, np.nan).take(codigos)
+    estado = np.append(estado_unicos, np.int8(NULO)).take(codigos)
+    es_texto = np.append(texto_unicos, False).take(codigos)
+    return ColumnaNumerica(serie.name, valores, estado, es_texto)
+
+
+# Símbolos y códigos de moneda que se aceptan antes o después del importe
+MONEDAS = ("US$", "$", "€", "£", "USD", "EUR", "COP", "MXN")
+_SIMBOLO = "|".join(re.escape(moneda) for moneda in sorted(MONEDAS, key=len, reverse=True))
+_IMPORTE = re.compile(
+    rf"(?P<signo>[-+−])?\s*(?:{_SIMBOLO})?\s*(?P<signo_moneda>[-+−])?\s*"
+    rf"(?P<numero>[\d.,' \u00a0\u202f]*\d)\s*(?:{_SIMBOLO})?\s*(?P<signo_final>-)?", re.IGNORECASE)
+# Espacios (también los no separables) y apóstrofos son separadores de miles en cualquier formato
+# ('1 234,56', "1'234.56"); se validan con los mismos grupos de tres dígitos que el separador de miles
+_MILES_FIJOS = "' \u00a0\u202f"
+_SIN_MILES_FIJOS = str.maketrans("", "", _MILES_FIJOS)
+_OTRO_SEPARADOR = {".": ",", ",": "."}
+# Número sin formato: el único caso que también resuelve pd.to_numeric con la misma gramática
+_SIMPLE = re.compile(r"[-+]?(\d+(\.\d+)?|\.\d+)")
+
+
+def _numero_con_formato(numero, decimal):
+    '''Texto del número sin separadores de miles y con punto decimal, o None si no respeta el formato.'''
+    miles = _OTRO_SEPARADOR[decimal]
+    entero, _, fraccion = numero.partition(decimal)
+    if decimal in fraccion or miles in fraccion:
+        return None
+    if miles in entero:
+        grupos = entero.split(miles)
+        # El primer grupo tiene de 1 a 3 dígitos sin ceros a la izquierda ('0,123' no es un número con miles)
+        if not (1 <= len(grupos[0]) <= 3 and not grupos[0].startswith("0") and all(len(grupo) == 3 for grupo in grupos[1:])):
+            return None
+        entero = "".join(grupos)
+    if not entero and not fraccion:
+        return None
+    return f"{entero or '0'}.{fraccion}" if fraccion else entero
+
+
+def _detectar_decimal(numero):
+    '''Separador decimal del texto con decimal=None; AMBIGUO si puede ser de miles o decimal.'''
+    puntos, comas = numero.count("."), numero.count(",")
+    if puntos and comas:
+        return "." if numero.rfind(".") > numero.rfind(",") else ","
+    separador = "." if puntos else "," if comas else None
+    if separador is None:
+        return "."
+    if numero.count(separador) > 1:
+        return _OTRO_SEPARADOR[separador]
+    entero, _, fraccion = numero.partition(separador)
+    if len(fraccion) == 3 and 1 <= len(entero) <= 3 and entero != "0":
+        return AMBIGUO
+    return separador
+
+
+@lru_cache(maxsize=2**16)
+def interpretar_importe(texto, decimal="."):
+    '''Devuelve (valor, estado) del texto; decimal es '.', ',' o None para detectarlo.'''
+    texto = texto.strip()
+    negativo = texto.startswith("(") and texto.endswith(")")
+    if negativo:
+        texto = texto[1:-1].strip()
+    coincidencia = _IMPORTE.fullmatch(texto)
+    if coincidencia is None:
+        return np.nan, NO_CONVERTIBLE
+    signos = [signo for signo in coincidencia.group("signo", "signo_moneda", "signo_final") if signo]
+    if len(signos) + negativo > 1:
+        return np.nan, NO_CONVERTIBLE
+    numero = coincidencia.group("numero")
+    separador = _detectar_decimal(numero.translate(_SIN_MILES_FIJOS)) if decimal is None else decimal
+    if separador == AMBIGUO:
+        return np.nan, AMBIGUO
+    miles = _OTRO_SEPARADOR[separador]
+    normalizado = _numero_con_formato(numero.translate(str.maketrans(_MILES_FIJOS, miles * len(_MILES_FIJOS))), separador)
+    if normalizado is None:
+        return np.nan, NO_CONVERTIBLE
+    valor = float(normalizado)
+    if negativo or (signos and signos[0] in "-−"):
+        valor = -valor
+    # Un número sin formato ('291.7', '-13.82') es texto numérico, igual que en convertir_columna
+    simple = _SIMPLE.fullmatch(texto) is not None and not negativo and ("." not in texto or separador == ".")
+    return valor, TEXTO_NUMERICO if simple else TEXTO_MONEDA
+
+
+def convertir_moneda(serie, decimal="."):
+    '''Convierte la serie a número interpretando símbolos de moneda, signos y separadores (ver interpretar_importe).'''
+    if decimal not in (".", ",", None):
+        raise ValueError("decimal debe ser '.', ',' o None")
+    if serie.dtype.kind in "iufb":
+        return convertir_columna(serie)
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    unicos = pd.Series(np.asarray(unicos, dtype=object))
+    texto_unicos = unicos.map(lambda valor: isinstance(valor, str)).to_numpy(dtype=bool)
+    numeros_unicos = np.full(len(unicos), np.nan)
+    estado_unicos = np.full(len(unicos), NO_CONVERTIBLE, dtype=np.int8)
+    no_texto = ~texto_unicos
+    if no_texto.any():
+        numeros_unicos[no_texto] = pd.to_numeric(unicos[no_texto], errors='coerce').to_numpy(dtype=np.float64)
+        estado_unicos[no_texto] = np.where(np.isnan(numeros_unicos[no_texto]), NO_CONVERTIBLE, NUMERO)
+    pendientes = np.flatnonzero(texto_unicos)
+    if decimal == "." and len(pendientes):
+        # Los números sin formato (_SIMPLE) se resuelven de una vez con pd.to_numeric; el resto, uno por
+        # uno con interpretar_importe. Así '1e5', 'inf' o '5.' no se aceptan solo por el camino rápido
+        textos = unicos.iloc[pendientes].str.strip()
+        simples = textos.str.fullmatch(_SIMPLE.pattern).to_numpy(dtype=bool)
+        rapidos = pd.to_numeric(textos[simples]).to_numpy(dtype=np.float64)
+        numeros_unicos[pendientes[simples]] = rapidos
+        estado_unicos[pendientes[simples]] = TEXTO_NUMERICO
+        pendientes = pendientes[~simples]
+    for posicion in pendientes:
+        numeros_unicos[posicion], estado_unicos[posicion] = interpretar_importe(unicos.iat[posicion], decimal)
+
+    # La posición adicional al final corresponde al código -1 (celda vacía)
+    valores = np.append(numeros_unicos, np.nan).take(codigos)
+    estado = np.append(estado_unicos, np.int8(NULO)).take(codigos)
+    es_texto = np.append(texto_unicos, False).take(codigos)
+    return ColumnaNumerica(serie.name, valores, estado, es_texto)
+
+
+def columna_numerica(data, nombre):
+    '''
+    Devuelve la conversión de la columna, calculándola solo la primera vez para cada DataFrame.
+
+    Pensado para el DataFrame compartido de la sesión, que no se modifica; la caché del DataFrame se
+    libera cuando el DataFrame deja de existir.
+    '''
+    return en_cache(data, ("numerica", nombre), lambda: convertir_columna(data[nombre]))
+
+
+def columna_moneda(data, nombre, decimal="."):
+    '''Conversión de la columna con convertir_moneda, calculada solo la primera vez para cada DataFrame.'''
+    return en_cache(data, ("moneda", nombre, decimal), lambda: convertir_moneda(data[nombre], decimal))
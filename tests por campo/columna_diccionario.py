@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from cache_datos import en_cache, resultados
+
+'''
+Columnas de texto codificadas como diccionario (códigos + valores distintos).
+
+Columnas como region, metodo_pago, categoria o nombre_producto tienen pocos valores distintos frente
+a la cantidad de registros, pero data['categoria'].apply(...) evalúa la condición en cada registro.
+Con la columna codificada la condición se evalúa una sola vez por valor distinto y el resultado se
+reparte a los registros a través de los códigos:
+
+categoria = data.diccionario('categoria')
+categoria.aplicar(lambda x: 'Ã³' in x if isinstance(x, str) else False).sum()
+categoria.evaluar(lambda valores: valores.str.startswith('A', na=False)).sum()
+
+El resultado es una Series con el mismo índice que la columna original, igual a la que daría
+data['categoria'].apply(...) o la expresión con .str aplicada a la columna completa.
+'''
+
+# Proporción máxima de valores distintos sobre registros para codificar una columna al cargar los datos
+CARDINALIDAD_MAXIMA = 0.5
+
+
+class ColumnaDiccionario:
+    '''Columna representada por un código por registro (-1 para vacíos) y el arreglo de valores distintos.'''
+
+    def __init__(self, nombre, codigos, valores, indice):
+        self.nombre = nombre
+        self.codigos = codigos
+        self.valores = valores
+        self.indice = indice
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @property
+    def hay_vacios(self):
+        return bool((self.codigos < 0).any())
+
+    def _repartir(self, por_valor, vacio):
+        por_valor = list(por_valor)
+        if not self.hay_vacios and por_valor:
+            # Sin vacíos la última posición no se usa; se repite un valor para no alterar el tipo del resultado
+            vacio = por_valor[0]
+        # La posición adicional al final corresponde al código -1 (celda vacía)
+        resultados = pd.Series(por_valor + [vacio]).to_numpy()
+        return pd.Series(resultados.take(self.codigos), index=self.indice, name=self.nombre, copy=False)
+
+    def aplicar(self, funcion, na=None):
+        '''
+        Equivalente a serie.apply(funcion), evaluando la función una vez por valor distinto.
+
+        Si se indica na, ese es el resultado de las celdas vacías (la función no se evalúa con ellas).
+        '''
+        vacio = na if na is not None else funcion(np.nan) if self.hay_vacios else None
+        return self._repartir([funcion(valor) for valor in self.valores], vacio)
+
+    def evaluar(self, expresion, na=None):
+        '''
+        Aplica una expresión vectorizada (por ejemplo lambda valores: valores.str.strip() == 'Audio') a la
+        serie de valores distintos y reparte el resultado a todos los registros.
+        '''
+        distintos = pd.Series(np.append(self.valores, np.nan), dtype=object)
+        resultado = expresion(distintos).to_numpy()
+        vacio = na if na is not None else resultado[-1]
+        return self._repartir(resultado[:-1], vacio)
+
+    def conteos(self):
+        '''Cantidad de registros por valor distinto (sin los vacíos).'''
+        conteos = np.bincount(self.codigos[self.codigos >= 0], minlength=len(self.valores))
+        return pd.Series(conteos, index=pd.Index(self.valores, dtype=object), name=self.nombre)
+
+    def serie(self):
+        '''Reconstruye la columna original.'''
+        return self._repartir(self.valores, np.nan).astype(object)
+
+
+def codificar_columna(serie):
+    '''Codifica la serie como diccionario.'''
+    codigos, valores = pd.factorize(serie, use_na_sentinel=True)
+    return ColumnaDiccionario(serie.name, codigos, np.asarray(valores, dtype=object), serie.index)
+
+
+def es_baja_cardinalidad(cantidad_valores, filas, cardinalidad_maxima=CARDINALIDAD_MAXIMA):
+    return filas > 0 and cantidad_valores <= cardinalidad_maxima * filas
+
+
+def columna_diccionario(data, nombre):
+    '''
+    Devuelve la columna codificada, codificándola solo la primera vez para cada DataFrame.
+
+    Igual que coercion.columna_numerica, pensado para el DataFrame compartido de la sesión.
+    '''
+    return en_cache(data, ("diccionario", nombre), lambda: codificar_columna(data[nombre]))
+
+
+def codificar_columnas(data, snapshot=None, cardinalidad_maxima=CARDINALIDAD_MAXIMA):
+    '''
+    Codifica al cargar los datos las columnas de texto con pocos valores distintos.
+
+    Si los datos vienen de una instantánea columnar, se usan directamente sus códigos y su diccionario
+    (ver snapshot_columnar.py) en lugar de volver a codificar la columna. Devuelve los nombres de las
+    columnas codificadas.
+    '''
+    guardados = resultados(data)
+    codificadas = []
+    for nombre in data.columns:
+        if data[nombre].dtype != object:
+            continue
+        if snapshot is not None and snapshot.es_diccionario(nombre):
+            codificada = ColumnaDiccionario(nombre, snapshot.arreglo(nombre), snapshot.diccionario(nombre), data.index)
+        else:
+            codificada = codificar_columna(data[nombre])
+        if es_baja_cardinalidad(len(codificada.valores), len(data), cardinalidad_maxima):
+            guardados[("diccionario", nombre)] = codificada
+            codificadas.append(nombre)
+    return codificadas
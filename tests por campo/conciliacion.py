@@ -0,0 +1,198 @@
+import datetime
+import decimal
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dataset_ventas import COLUMNAS_VENTAS
+from lector_bd import leer_tabla_por_bloques
+from lector_streaming import TAMANO_BLOQUE, leer_por_bloques
+
+'''
+Conciliación entre el archivo de ventas y la tabla products.ventas mediante huellas de fila.
+
+Cargar ambos lados completos y comparar DataFrames no escala. conciliar recorre cada lado por bloques
+(ver lector_streaming.py y lector_bd.py) y de cada fila guarda solo tres enteros: la huella de su clave,
+la huella de su contenido y su posición. Las filas se reparten en particiones según la huella de la
+clave y cada partición se compara por separado:
+
+- faltantes: filas del origen cuya clave no está en el destino.
+- sobrantes: filas del destino cuya clave no está en el origen.
+- cambiadas: misma clave en ambos lados con distinto contenido.
+
+resultado = conciliar_archivo_con_tabla("ventas1.xlsx", pool, claves=['id_producto', 'fecha_venta', 'nombre_cliente'])
+resultado.coinciden, resultado.faltantes, resultado.cambiadas, resultado.filas_por_segundo
+
+Las claves repetidas se emparejan por orden de aparición. Sin claves, la fila completa es la clave: se
+detectan filas faltantes y sobrantes, pero un cambio aparece como una faltante más una sobrante.
+
+La huella de cada valor se calcula sobre su representación canónica como texto, de modo que 12, 12.0 y
+Decimal('12.00') o una fecha y su equivalente datetime dan la misma huella en ambos lados.
+'''
+
+PARTICIONES = 16
+
+# Representación canónica de una celda vacía
+NULO_CANONICO = "\x00"
+
+# Combinación de las huellas de cada columna (FNV-1a de 64 bits)
+_SEMILLA = np.uint64(0xCBF29CE484222325)
+_PRIMO = np.uint64(0x100000001B3)
+
+_TIPO_FILA = np.dtype([("clave", np.uint64), ("huella", np.uint64), ("posicion", np.int64)])
+
+
+def texto_canonico(valor):
+    '''Texto que representa el valor de la celda independientemente del tipo con el que se leyó.'''
+    if valor is None or valor is pd.NaT or (isinstance(valor, (float, np.floating)) and math.isnan(valor)):
+        return NULO_CANONICO
+    if isinstance(valor, (bool, np.bool_)):
+        return str(bool(valor))
+    if isinstance(valor, (int, np.integer)):
+        return str(int(valor))
+    if isinstance(valor, (float, np.floating, decimal.Decimal)):
+        numero = float(valor)
+        return str(int(numero)) if numero.is_integer() else repr(numero)
+    if isinstance(valor, (datetime.datetime, np.datetime64)):
+        return pd.Timestamp(valor).isoformat()
+    if isinstance(valor, datetime.date):
+        return pd.Timestamp(valor).isoformat()
+    return str(valor)
+
+
+def huellas_columna(serie, canonico=texto_canonico):
+    '''Huella de 64 bits de cada celda; el texto canónico se calcula una sola vez por valor distinto.'''
+    codigos, distintos = pd.factorize(serie, use_na_sentinel=True)
+    canonicos = np.array([canonico(valor) for valor in distintos] + [NULO_CANONICO], dtype=object)
+    # La última posición corresponde al código -1 (celda vacía)
+    return pd.util.hash_array(canonicos, categorize=False).take(codigos)
+
+
+def huellas_filas(bloque, columnas, canonico=texto_canonico):
+    '''
+    Huella de 64 bits de cada fila, combinando en orden las huellas de las columnas indicadas.
+
+    canonico convierte cada valor distinto en el texto del que se calcula su huella (por defecto
+    texto_canonico, que no distingue el tipo con el que se leyó el valor).
+    '''
+    huellas = np.full(len(bloque), _SEMILLA, dtype=np.uint64)
+    for columna in columnas:
+        huellas = (huellas ^ huellas_columna(bloque[columna], canonico)) * _PRIMO
+    return huellas
+
+
+def _particionar(bloques, columnas, claves, particiones):
+    '''Recorre los bloques y reparte (clave, huella, posición) de cada fila en las particiones.'''
+    partes = [[] for _ in range(particiones)]
+    filas = 0
+    for bloque in bloques:
+        if not len(bloque):
+            continue
+        filas_bloque = np.empty(len(bloque), dtype=_TIPO_FILA)
+        filas_bloque["huella"] = huellas_filas(bloque, columnas)
+        filas_bloque["clave"] = huellas_filas(bloque, claves) if claves else filas_bloque["huella"]
+        filas_bloque["posicion"] = bloque.index.to_numpy(dtype=np.int64)
+        particion = filas_bloque["clave"] % np.uint64(particiones)
+        # Orden estable: dentro de cada partición las filas conservan su orden en el archivo
+        orden = np.argsort(particion, kind="stable")
+        limites = np.cumsum(np.bincount(particion, minlength=particiones))[:-1]
+        for destino, trozo in zip(partes, np.split(filas_bloque[orden], limites)):
+            if len(trozo):
+                destino.append(trozo)
+        filas += len(bloque)
+    return [np.concatenate(parte) if parte else np.empty(0, dtype=_TIPO_FILA) for parte in partes], filas
+
+
+def _numerar(filas):
+    '''Tabla de la partición con el número de aparición de cada clave.'''
+    tabla = pd.DataFrame({nombre: filas[nombre] for nombre in _TIPO_FILA.names})
+    tabla["aparicion"] = tabla.groupby("clave", sort=False).cumcount()
+    return tabla
+
+
+def _comparar(origen, destino):
+    '''Compara una partición de cada lado; devuelve posiciones faltantes, sobrantes y pares cambiados.'''
+    unidas = _numerar(origen).merge(_numerar(destino), on=["clave", "aparicion"], how="outer",
+                                    suffixes=("_origen", "_destino"), indicator=True)
+    faltantes = unidas.loc[unidas["_merge"] == "left_only", "posicion_origen"]
+    sobrantes = unidas.loc[unidas["_merge"] == "right_only", "posicion_destino"]
+    ambas = unidas[unidas["_merge"] == "both"]
+    cambiadas = ambas.loc[ambas["huella_origen"] != ambas["huella_destino"], ["posicion_origen", "posicion_destino"]]
+    return (faltantes.to_numpy(dtype=np.int64), sobrantes.to_numpy(dtype=np.int64),
+            cambiadas.to_numpy(dtype=np.int64).reshape(-1, 2))
+
+
+@dataclass
+class ResultadoConciliacion:
+    '''Diferencias entre origen y destino; las posiciones son las filas de cada lado, empezando en 0.'''
+    filas_origen: int
+    filas_destino: int
+    faltantes: np.ndarray
+    sobrantes: np.ndarray
+    cambiadas: np.ndarray
+    segundos: float
+
+    @property
+    def coinciden(self):
+        return not (len(self.faltantes) or len(self.sobrantes) or len(self.cambiadas))
+
+    @property
+    def filas_por_segundo(self):
+        '''Filas procesadas (de ambos lados) por segundo.'''
+        return (self.filas_origen + self.filas_destino) / self.segundos if self.segundos else math.inf
+
+    def resumen(self):
+        return {
+            "filas_origen": self.filas_origen,
+            "filas_destino": self.filas_destino,
+            "faltantes": len(self.faltantes),
+            "sobrantes": len(self.sobrantes),
+            "cambiadas": len(self.cambiadas),
+            "segundos": round(self.segundos, 3),
+            "filas_por_segundo": round(self.filas_por_segundo),
+        }
+
+
+def conciliar(bloques_origen, bloques_destino, columnas, claves=None, particiones=PARTICIONES):
+    '''
+    Concilia dos secuencias de bloques (DataFrames) comparando las columnas indicadas.
+
+    claves son las columnas que identifican una fila en ambos lados; las huellas son de 64 bits, así que
+    la probabilidad de que dos filas distintas coincidan es despreciable para el tamaño de estas tablas.
+    '''
+    if particiones < 1:
+        raise ValueError("La cantidad de particiones debe ser mayor que 0")
+    columnas = list(columnas)
+    claves = list(claves) if claves else None
+    inicio = time.perf_counter()
+    partes_origen, filas_origen = _particionar(bloques_origen, columnas, claves, particiones)
+    partes_destino, filas_destino = _particionar(bloques_destino, columnas, claves, particiones)
+    faltantes, sobrantes, cambiadas = [], [], []
+    for origen, destino in zip(partes_origen, partes_destino):
+        diferencias = _comparar(origen, destino)
+        faltantes.append(diferencias[0])
+        sobrantes.append(diferencias[1])
+        cambiadas.append(diferencias[2])
+    cambiadas = np.concatenate(cambiadas)
+    return ResultadoConciliacion(
+        filas_origen=filas_origen,
+        filas_destino=filas_destino,
+        faltantes=np.sort(np.concatenate(faltantes)),
+        sobrantes=np.sort(np.concatenate(sobrantes)),
+        cambiadas=cambiadas[np.argsort(cambiadas[:, 0], kind="stable")],
+        segundos=time.perf_counter() - inicio,
+    )
+
+
+def conciliar_archivo_con_tabla(ruta, pool, tabla="ventas", columnas=COLUMNAS_VENTAS, claves=None,
+                                tamano_bloque=TAMANO_BLOQUE, particiones=PARTICIONES):
+    '''Concilia el archivo de ventas (origen) con la tabla de la base de datos (destino), leyendo ambos por bloques.'''
+    with pool.conexion() as conexion:
+        return conciliar(
+            leer_por_bloques(ruta, tamano_bloque=tamano_bloque, columnas=columnas),
+            leer_tabla_por_bloques(conexion, tabla, tamano_bloque=tamano_bloque, columnas=columnas, dialecto=pool.dialecto),
+            columnas=columnas, claves=claves, particiones=particiones,
+        )
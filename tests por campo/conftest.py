@@ -0,0 +1,233 @@
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from columna_diccionario import codificar_columnas
+from conexiones_bd import (TAMANO_POOL, ControladorSQLite, PoolConexiones, cargar_tabla_ventas,
+                          controlador_desde_url, tabla_existe)
+from dataset_ventas import COLUMNAS_VENTAS, cargar_ventas, ruta_ventas
+from lector_bd import cargar_ventas_bd
+from memoria_compartida import DatosCompartidos
+from plugin_mediciones import TOP, MedidorPruebas
+from plugin_reglas import ArchivoReglas
+from plugin_reporte import ReporteIncremental
+from revalidacion import Revalidador
+from vista_datos import VistaDatos
+
+'''
+Fixtures compartidas por los casos de prueba de cada campo.
+
+El archivo de ventas se lee una sola vez por sesión. Por defecto se usa "O:/productos/ventas1.xlsx"
+(o la copia del repositorio si esa ruta no existe); se puede cambiar con --ventas o con la
+variable de entorno VENTAS_XLSX:
+
+pytest test_precio.py -v --ventas=../ventas1.xlsx
+
+Con --ventas-bd los mismos casos validan la tabla ventas de la base de datos en lugar del archivo
+(ver lector_bd.py). Los casos usan el DataFrame completo, así que la tabla se carga entera en memoria,
+igual que el archivo; la lectura por bloques solo evita el buffer del conector:
+
+pytest test_precio.py -v --ventas-bd=mysql://root:@localhost/products
+
+Los archivos reglas_*.json se recolectan como casos de prueba (ver plugin_reglas.py) y usan los
+mismos datos de la sesión.
+
+Al ejecutar en paralelo con pytest-xdist, --memoria-compartida hace que el proceso principal cargue
+los datos una sola vez y los publique en memoria compartida (ver memoria_compartida.py); los workers
+se adjuntan al segmento en lugar de leer cada uno el archivo:
+
+pytest -n 4 --memoria-compartida
+
+Con --incremental las métricas por columna (perfil de precio, cantidad_vendida y total_venta) se
+guardan por bloques en .pytest_cache; en la siguiente ejecución solo se recalculan los bloques del
+archivo que cambiaron (ver revalidacion.py):
+
+pytest --incremental --ventas=ventas_nueva_entrega.xlsx
+
+Con --medir se registra el tiempo de la preparación y del cuerpo de cada caso; --medir-memoria agrega
+el pico de memoria (con tracemalloc, que también hace más lentos los casos; ver plugin_mediciones.py):
+
+pytest --medir --medir-salida=mediciones.json --medir-top=15
+
+Con --reporte una sola ejecución valida todas las columnas y escribe, a medida que terminan los casos,
+un reporte JSONL y al final su resumen HTML (ver plugin_reporte.py):
+
+pytest --reporte=reporte_ventas.jsonl
+
+Las pruebas contra la base de datos (connect_test_bd.py) usan la fixture pool_bd. La base se indica
+con --bd o con la variable de entorno VENTAS_BD; si no se indica y no hay un servidor MySQL en
+"mysql://root:@localhost/products", se usa una base SQLite en memoria con los datos de ventas. Esa base
+es una copia del archivo y no de products.ventas, así que los casos que validan datos propios de la
+tabla MySQL (fixture pool_mysql) se omiten en lugar de fallar:
+
+pytest connect_test_bd.py -v --bd=mysql://root:@localhost/products --tamano-pool=8
+'''
+
+logger = logging.getLogger(__name__)
+
+# Base de datos por defecto para las pruebas de connect_test_bd.py
+URL_BD = "mysql://root:@localhost/products"
+
+# Datos de ventas de la sesión, compartidos por las fixtures y los casos de los archivos de reglas
+_datos_sesion = pytest.StashKey()
+# Indica que pool_bd usa la base SQLite con los datos del archivo porque no hubo conexión a MySQL
+_bd_sustituta = pytest.StashKey()
+# Segmento de memoria compartida publicado (proceso principal) o adjuntado (worker)
+_datos_compartidos = pytest.StashKey()
+# Clave de config.workerinput con la descripción del segmento
+ENTRADA_WORKER = "ventas_compartidas"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--ventas", default=None, help="Ruta del archivo de ventas a validar.")
+    parser.addoption("--ventas-bd", default=None, help="URL de la base de datos cuya tabla ventas se carga completa y se valida en lugar del archivo.")
+    parser.addoption("--sin-cache-ventas", action="store_true", default=False,
+                     help="Leer siempre el xlsx sin usar la instantánea guardada en .pytest_cache.")
+    parser.addoption("--incremental", action="store_true", default=False,
+                     help="Reutilizar los resultados por bloque de la ejecución anterior y recalcular solo los bloques que cambiaron.")
+    parser.addoption("--medir", action="store_true", default=False,
+                     help="Medir el tiempo de la preparación y del cuerpo de cada caso.")
+    parser.addoption("--medir-memoria", action="store_true", default=False,
+                     help="Con --medir, medir también el pico de memoria (con tracemalloc; los tiempos incluyen su costo).")
+    parser.addoption("--medir-salida", default=None, help="Archivo .json o .csv con las mediciones de --medir.")
+    parser.addoption("--medir-top", type=int, default=TOP, help="Cantidad de casos más lentos que se muestran al final.")
+    parser.addoption("--reporte", default=None, help="Archivo JSONL con el resultado de cada caso (más su resumen .html).")
+    parser.addoption("--bd", default=None, help="URL de la base de datos de ventas (mysql://... o sqlite:///...).")
+    parser.addoption("--tamano-pool", type=int, default=TAMANO_POOL, help="Cantidad máxima de conexiones abiertas a la base.")
+    parser.addoption("--memoria-compartida", action="store_true", default=False,
+                     help="Con pytest -n, cargar los datos una vez y compartirlos con los workers en memoria compartida.")
+
+
+def pytest_configure(config):
+    if config.getoption("--medir"):
+        config.pluginmanager.register(MedidorPruebas(config.getoption("--medir-salida"), config.getoption("--medir-top"),
+                                                     memoria=config.getoption("--medir-memoria")),
+                                      "medidor_pruebas")
+    if config.getoption("--reporte"):
+        config.pluginmanager.register(ReporteIncremental(config.getoption("--reporte")), "reporte_incremental")
+    # Solo el proceso principal publica, y solo si va a haber workers
+    if (config.getoption("--memoria-compartida") and not hasattr(config, "workerinput")
+            and getattr(config.option, "numprocesses", None)):
+        config.stash[_datos_compartidos] = DatosCompartidos.publicar(datos_de_sesion(config))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # Hook de pytest-xdist: entrega a cada worker la descripción del segmento
+    compartidos = node.config.stash.get(_datos_compartidos, None)
+    if compartidos is not None:
+        node.workerinput[ENTRADA_WORKER] = compartidos.descripcion
+
+
+def pytest_unconfigure(config):
+    compartidos = config.stash.get(_datos_compartidos, None)
+    if compartidos is not None:
+        compartidos.liberar()
+
+
+def pytest_collect_file(parent, file_path):
+    if file_path.suffix == ".json" and file_path.name.startswith("reglas_"):
+        return ArchivoReglas.from_parent(parent, path=file_path, cargar_datos=datos_de_sesion)
+
+
+def ruta_de_sesion(config):
+    return Path(config.getoption("--ventas") or ruta_ventas())
+
+
+def datos_de_sesion(config):
+    '''Carga los datos de ventas la primera vez que se piden y los guarda para el resto de la sesión.'''
+    if _datos_sesion not in config.stash:
+        descripcion = getattr(config, "workerinput", {}).get(ENTRADA_WORKER)
+        if descripcion is not None:
+            compartidos = config.stash[_datos_compartidos] = DatosCompartidos.adjuntar(descripcion)
+            data = config.stash[_datos_sesion] = compartidos.a_dataframe()
+            codificar_columnas(data, snapshot=compartidos)
+            return data
+        url = config.getoption("--ventas-bd")
+        if url:
+            pool = PoolConexiones(controlador_desde_url(url), tamano=1)
+            try:
+                config.stash[_datos_sesion] = cargar_ventas_bd(pool)
+            finally:
+                pool.cerrar()
+            return config.stash[_datos_sesion]
+        dir_cache = None
+        if not config.getoption("--sin-cache-ventas") and getattr(config, "cache", None) is not None:
+            dir_cache = config.cache.mkdir("ventas")
+        config.stash[_datos_sesion] = cargar_ventas(ruta_de_sesion(config), dir_cache=dir_cache)
+    return config.stash[_datos_sesion]
+
+
+@pytest.fixture(scope="session")
+def ruta_datos_ventas(request):
+    '''Ruta del archivo de ventas de la sesión.'''
+    return ruta_de_sesion(request.config)
+
+
+@pytest.fixture(scope="session")
+def datos_ventas(request):
+    '''Carga los datos de ventas una sola vez por sesión.'''
+    return datos_de_sesion(request.config)
+
+
+@pytest.fixture
+def load_data(datos_ventas):
+    '''Entrega a cada caso de prueba una vista de solo lectura de los datos, con copia en escritura por columna.'''
+    return VistaDatos(datos_ventas)
+
+
+@pytest.fixture(scope="session")
+def revalidacion(request):
+    '''Calcula las métricas de los casos, por bloques y reutilizando la ejecución anterior con --incremental.'''
+    config = request.config
+    dir_estado = None
+    if config.getoption("--incremental") and getattr(config, "cache", None) is not None:
+        dir_estado = config.cache.mkdir("revalidacion")
+    return Revalidador(dir_estado)
+
+
+@pytest.fixture(scope="session")
+def pool_bd(request):
+    '''Pool de conexiones a la base de ventas compartido por toda la sesión.'''
+    config = request.config
+    url = config.getoption("--bd") or os.environ.get("VENTAS_BD")
+    tamano = config.getoption("--tamano-pool")
+    pool = PoolConexiones(controlador_desde_url(url or URL_BD), tamano=tamano)
+    try:
+        with pool.conexion():
+            pass
+    except Exception as error:
+        pool.cerrar()
+        if url:
+            raise
+        logger.warning(f"No se pudo conectar a {URL_BD} ({error}); se usa una base SQLite en memoria")
+        pool = PoolConexiones(ControladorSQLite(), tamano=tamano)
+        config.stash[_bd_sustituta] = str(error)
+    if isinstance(pool.controlador, ControladorSQLite) and not tabla_existe(pool, "ventas"):
+        cargar_tabla_ventas(pool, request.getfixturevalue("datos_ventas"))
+    yield pool
+    pool.cerrar()
+
+
+@pytest.fixture
+def pool_mysql(request, pool_bd):
+    '''pool_bd para los casos que validan datos de products.ventas; se omiten si la base es la copia SQLite.'''
+    error = request.config.stash.get(_bd_sustituta, None)
+    if error is not None:
+        pytest.skip(f"Sin conexión a {URL_BD} ({error}): la base SQLite con los datos del archivo no es products.ventas")
+    return pool_bd
+
+
+@pytest.fixture
+def pool_ventas(datos_ventas):
+    '''
+    Base SQLite en memoria con la tabla ventas, en reemplazo de products.ventas.
+
+    Se crea para cada caso porque algunos modifican la tabla (test_conciliacion.py).
+    '''
+    pool = PoolConexiones(ControladorSQLite(), tamano=1)
+    cargar_tabla_ventas(pool, datos_ventas[COLUMNAS_VENTAS])
+    yield pool
+    pool.cerrar()
@@ -1,35 +1,40 @@
-import mysql.connector
+from pathlib import Path
+
 import pytest
 
-def conectar_base_de_datos():
-    try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="products"
-        )
-        return conn
-    except mysql.connector.Error as err:
-        print(f"Error: {err}")
-        return None
-
-def contar_fechas_validas():
-    conn = conectar_base_de_datos()
-    if conn is None:
-        return 0
-    cursor = conn.cursor()
-    query = """
-    SELECT COUNT(*) 
-    FROM `ventas` 
-    WHERE fecha_venta REGEXP '^[0-9]{2}/[0-9]{2}/[0-9]{4}$'
-    """
-    cursor.execute(query)
-    resultado = cursor.fetchone()[0]
-    conn.close()
+from reglas import cargar_reglas
+from reglas_sql import ReglaNoCompilable, evaluar_reglas_sql
+
+# La conexión la entrega la fixture pool_bd de conftest.py (MySQL, o SQLite en memoria si no hay servidor);
+# pool_mysql omite el caso cuando la base es la copia SQLite del archivo
+
+RUTA_REGLAS = Path(__file__).parent / "reglas_ventas.json"
+
+def contar_fechas_validas(pool):
+    with pool.conexion() as conn:
+        cursor = conn.cursor()
+        query = """
+        SELECT COUNT(*) 
+        FROM `ventas` 
+        WHERE fecha_venta REGEXP '^[0-9]{2}/[0-9]{2}/[0-9]{4}$'
+        """
+        cursor.execute(query)
+        resultado = cursor.fetchone()[0]
+        cursor.close()
     return resultado
 
-def test_contar_fechas_formato_valido():
+def test_contar_fechas_formato_valido(pool_mysql):
     cantidad_esperada = 5853  # Sustituye esto con el valor que esperas
-    cantidad_obtenida = contar_fechas_validas()
+    cantidad_obtenida = contar_fechas_validas(pool_mysql)
     assert cantidad_obtenida == cantidad_esperada, f"Se esperaban {cantidad_esperada} registros, pero se encontraron {cantidad_obtenida}"
+
+def validar_reglas_en_bd(pool, ruta_reglas=RUTA_REGLAS):
+    """Evalúa todas las reglas del archivo con una sola consulta sobre products.ventas."""
+    with pool.conexion() as conn:
+        return evaluar_reglas_sql(conn, cargar_reglas(ruta_reglas), tabla="ventas", dialecto=pool.dialecto)
+
+def test_reglas_en_una_consulta(pool_bd):
+    resultados = validar_reglas_en_bd(pool_bd)
+    fallidas = [r for r in resultados.fallidas if not isinstance(r.error, ReglaNoCompilable)]
+    detalle = [f"{r.regla.id}: se esperaba {r.regla.esperado}, se encontró {r.resultado if r.error is None else r.error}" for r in fallidas]
+    assert not fallidas, f"Reglas que no se cumplen en la base de datos: {detalle}"
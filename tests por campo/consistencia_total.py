@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from coercion import columna_moneda, columna_numerica
+
+'''
+Consistencia entre columnas: total_venta = precio × cantidad_vendida.
+
+Los casos de precio, cantidad_vendida y total_venta validan cada columna por separado, así que un total
+que no corresponde al precio y la cantidad de su fila (como el mínimo de -4104288.13) pasa desapercibido.
+verificar_total convierte las tres columnas una sola vez (ver coercion.py, con la caché por DataFrame),
+calcula el total esperado de todas las filas con operaciones vectorizadas y clasifica cada fila:
+
+resultado = verificar_total(data, tolerancia=0.01)
+resultado.cantidad(INCONSISTENTE), resultado.indices(), resultado.mayores_diferencias(10)
+
+Una fila es consistente si |total_venta - precio × cantidad_vendida| <= max(tolerancia,
+tolerancia_relativa × |precio × cantidad_vendida|). Las filas en las que alguna de las tres columnas no
+tiene número (vacíos, 'Total inconsistente', ...) quedan como SIN_DATOS y no se comparan. Con
+moneda=True las columnas se convierten con columna_moneda, de modo que los importes con formato
+('$150.51') también se comparan.
+'''
+
+# Estado de cada fila
+CONSISTENTE = 0
+INCONSISTENTE = 1
+SIN_DATOS = 2
+
+ESTADOS = {CONSISTENTE: "consistente", INCONSISTENTE: "inconsistente", SIN_DATOS: "sin_datos"}
+
+# Diferencia máxima aceptada por defecto: un centavo
+TOLERANCIA = 0.01
+
+# Margen para que un total redondeado al centavo no quede afuera por el error de la multiplicación en float
+_MARGEN_FLOAT = 1e-9
+
+
+@dataclass(frozen=True)
+class ResultadoTotal:
+    '''Total esperado, diferencia con total_venta y estado de cada fila.'''
+    esperado: np.ndarray
+    diferencia: np.ndarray
+    estado: np.ndarray
+    indice: pd.Index
+
+    def __len__(self):
+        return len(self.estado)
+
+    def mascara(self, *estados):
+        '''Máscara de las filas con alguno de los estados indicados (por defecto, las inconsistentes).'''
+        return np.isin(self.estado, estados or (INCONSISTENTE,))
+
+    def cantidad(self, *estados):
+        return int(self.mascara(*estados).sum())
+
+    def indices(self, *estados):
+        '''Etiquetas del índice de las filas con alguno de los estados (por defecto, las inconsistentes).'''
+        return self.indice[self.mascara(*estados)]
+
+    def mayores_diferencias(self, cantidad=10):
+        '''Filas inconsistentes con mayor diferencia absoluta.'''
+        posiciones = np.flatnonzero(self.mascara(INCONSISTENTE))
+        posiciones = posiciones[np.argsort(-np.abs(self.diferencia[posiciones]), kind="stable")[:cantidad]]
+        return pd.DataFrame({"esperado": self.esperado[posiciones], "diferencia": self.diferencia[posiciones]},
+                            index=self.indice[posiciones])
+
+    def resumen(self):
+        return {nombre: self.cantidad(estado) for estado, nombre in ESTADOS.items()}
+
+
+def comparar_total(precio, cantidad, total, indice=None, tolerancia=TOLERANCIA, tolerancia_relativa=0.0):
+    '''Compara columnas ya convertidas (ColumnaNumerica de coercion.py) fila por fila.'''
+    if tolerancia < 0 or tolerancia_relativa < 0:
+        raise ValueError("Las tolerancias no pueden ser negativas")
+    if not len(precio) == len(cantidad) == len(total):
+        raise ValueError("Las tres columnas deben tener la misma cantidad de filas")
+    esperado = precio.valores.astype(np.float64) * cantidad.valores.astype(np.float64)
+    diferencia = total.valores.astype(np.float64) - esperado
+    limite = np.maximum(tolerancia, tolerancia_relativa * np.abs(esperado))
+    limite += _MARGEN_FLOAT * np.maximum(1.0, np.abs(esperado))
+    con_datos = precio.validos & cantidad.validos & total.validos
+    estado = np.full(len(esperado), SIN_DATOS, dtype=np.int8)
+    estado[con_datos] = np.where(np.abs(diferencia[con_datos]) <= limite[con_datos], CONSISTENTE, INCONSISTENTE)
+    return ResultadoTotal(esperado, diferencia, estado, indice if indice is not None else pd.RangeIndex(len(esperado)))
+
+
+def verificar_total(data, tolerancia=TOLERANCIA, tolerancia_relativa=0.0,
+                    precio='precio', cantidad='cantidad_vendida', total='total_venta', moneda=False):
+    '''Verifica total = precio × cantidad en todas las filas del DataFrame.'''
+    convertir = columna_moneda if moneda else columna_numerica
+    return comparar_total(convertir(data, precio), convertir(data, cantidad), convertir(data, total),
+                          indice=data.index, tolerancia=tolerancia, tolerancia_relativa=tolerancia_relativa)
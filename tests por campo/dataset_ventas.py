@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from columna_diccionario import codificar_columnas
+from snapshot_columnar import ESQUEMA, leer_snapshot, publicar_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Ruta original del archivo; se puede sobrescribir con la variable de entorno VENTAS_XLSX
+RUTA_VENTAS = "O:/productos/ventas1.xlsx"
+# Copia del archivo incluida en el repositorio
+RUTA_LOCAL = Path(__file__).resolve().parent.parent / "ventas1.xlsx"
+
+# Antigüedad (segundos) a partir de la cual un directorio temporal de instantánea se da por abandonado
+# cuando no se puede consultar si el proceso que lo escribía sigue activo
+ANTIGUEDAD_TEMPORAL = 3600
+
+# Columnas de la tabla products.ventas (el archivo tiene además columnas auxiliares sin encabezado)
+COLUMNAS_VENTAS = ['fecha_venta', 'id_producto', 'nombre_producto', 'categoria', 'precio', 'cantidad_vendida',
+                   'total_venta', 'nombre_cliente', 'region', 'metodo_pago']
+
+
+def ruta_ventas():
+    '''Devuelve la ruta del archivo de ventas a validar.'''
+    ruta = os.environ.get("VENTAS_XLSX")
+    if ruta:
+        return Path(ruta)
+    if Path(RUTA_VENTAS).exists():
+        return Path(RUTA_VENTAS)
+    return RUTA_LOCAL
+
+
+def huella_archivo(ruta, tamano_bloque=1 << 20):
+    '''Calcula el hash SHA-256 del contenido del archivo, leyéndolo por bloques.'''
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(tamano_bloque), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def cargar_ventas(ruta=None, dir_cache=None):
+    '''
+    Carga el archivo de ventas como DataFrame.
+
+    Si se indica dir_cache, guarda una instantánea columnar del archivo (ver snapshot_columnar.py)
+    identificada por el hash del archivo; mientras el archivo no cambie, las siguientes cargas mapean
+    la instantánea en memoria y no vuelven a leer el xlsx.
+
+    Las columnas de texto con pocos valores distintos quedan codificadas como diccionario (ver
+    columna_diccionario.py); con instantánea se reutilizan sus códigos.
+    '''
+    ruta = Path(ruta or ruta_ventas())
+    if dir_cache is None:
+        data = pd.read_excel(ruta)
+        codificar_columnas(data)
+        return data
+    snapshot = abrir_snapshot_ventas(ruta, dir_cache)
+    data = snapshot.a_dataframe()
+    codificar_columnas(data, snapshot=snapshot)
+    return data
+
+
+def abrir_snapshot_ventas(ruta, dir_cache):
+    '''Abre la instantánea columnar del archivo, creándola primero si no existe para su contenido actual.'''
+    ruta = Path(ruta)
+    dir_cache = Path(dir_cache)
+    huella = huella_archivo(ruta)
+    snapshot = dir_cache / f"{ruta.stem}-{huella[:16]}"
+    if (snapshot / ESQUEMA).exists():
+        logger.info(f"Abriendo instantánea de '{ruta.name}' desde {snapshot}")
+        return leer_snapshot(snapshot)
+
+    logger.info(f"Leyendo '{ruta}' y guardando instantánea en {snapshot}")
+    data = pd.read_excel(ruta)
+    dir_cache.mkdir(parents=True, exist_ok=True)
+    publicar_snapshot(data, snapshot)
+    # Eliminar instantáneas de versiones anteriores del mismo archivo y las temporales que dejó una
+    # publicación interrumpida (las de procesos que siguen publicando se conservan). Solo se consideran
+    # <nombre>-<16 hex> y <nombre>-<16 hex>.<pid>.tmp: 'ventas1-*' también incluye las de 'ventas1-2024'
+    propias = re.compile(rf"{re.escape(ruta.stem)}-[0-9a-f]{{16}}(\.\d+\.tmp)?")
+    for anterior in dir_cache.glob(f"{ruta.stem}-*"):
+        if anterior == snapshot or not anterior.is_dir() or not propias.fullmatch(anterior.name):
+            continue
+        if not anterior.name.endswith(".tmp") or _temporal_abandonado(anterior):
+            shutil.rmtree(anterior, ignore_errors=True)
+    return leer_snapshot(snapshot)
+
+
+def _proceso_activo(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _temporal_abandonado(temporal):
+    '''
+    Indica si el directorio temporal <instantánea>.<pid>.tmp quedó de una publicación interrumpida: el
+    proceso ya no existe o, donde no se puede consultar (Windows), tiene más de ANTIGUEDAD_TEMPORAL segundos.
+    '''
+    pid = temporal.name[:-len(".tmp")].rpartition(".")[2]
+    if os.name == "posix" and pid.isdigit():
+        return not _proceso_activo(int(pid))
+    try:
+        return time.time() - temporal.stat().st_mtime > ANTIGUEDAD_TEMPORAL
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,281 @@
+import math
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from conciliacion import PARTICIONES, texto_canonico
+from lector_streaming import TAMANO_BLOQUE, leer_por_bloques
+
+'''
+Verificación de dependencias funcionales entre columnas de ventas (A -> B: cada valor de A tiene un
+solo valor de B).
+
+test_duplicates_linked_to_same_name revisa solo id_producto -> nombre_producto, con los datos completos en
+memoria. verificar_dependencias revisa cualquier cantidad de dependencias en una sola pasada
+por bloques (ver lector_streaming.py), de modo que sirve para archivos de decenas de millones de filas:
+
+resultado = verificar_dependencias_archivo("ventas_10M.csv", ["id_producto -> nombre_producto",
+                                                              "nombre_producto -> categoria",
+                                                              "id_producto -> precio"])
+resultado.cumple("nombre_producto -> categoria"), resultado.violaciones["id_producto -> precio"]
+
+De cada bloque se guardan solo los pares distintos (huella de A, huella de B), con la cantidad de
+filas, la primera fila y el texto de cada valor. Los pares se reparten en particiones según la huella
+de A; si los pares en memoria superan memoria_maxima, la partición más grande se vuelca a disco. Al
+final cada partición se agrupa por separado y las claves de A con más de un valor de B son las
+violaciones, con la cantidad de valores distintos y de filas de cada uno.
+
+Como en groupby(A)[B].nunique(), las filas con A o B vacío no cuentan. Los valores se comparan por su
+texto canónico (ver conciliacion.py), así que 12 y 12.0 leídos en bloques distintos son el mismo valor.
+'''
+
+MEMORIA_MAXIMA = 256 * 2**20
+
+# Dependencias declaradas entre las columnas de ventas
+DEPENDENCIAS_VENTAS = [
+    "id_producto -> nombre_producto",
+    "nombre_producto -> categoria",
+    "id_producto -> precio",
+]
+
+_SEPARADOR_CLAVE = " | "
+
+# Tamaño estimado de un par en memoria: cuatro enteros y las referencias a los textos (que se comparten
+# entre los pares de un bloque), más una parte del texto
+_BYTES_PAR = 4 * 8 + 2 * 8 + 64
+
+
+@dataclass(frozen=True)
+class Dependencia:
+    '''Dependencia funcional determinante -> dependiente; el determinante puede tener varias columnas.'''
+    determinante: tuple
+    dependiente: str
+
+    @classmethod
+    def desde_texto(cls, texto):
+        '''Crea la dependencia a partir de 'a -> b' o 'a, b -> c'.'''
+        if isinstance(texto, Dependencia):
+            return texto
+        izquierda, separador, derecha = texto.partition("->")
+        determinante = tuple(columna.strip() for columna in izquierda.split(",") if columna.strip())
+        if not separador or not determinante or not derecha.strip():
+            raise ValueError(f"Dependencia inválida: '{texto}' (se esperaba 'columna -> columna')")
+        return cls(determinante, derecha.strip())
+
+    @property
+    def columnas(self):
+        return list(self.determinante) + [self.dependiente]
+
+    def __str__(self):
+        return f"{', '.join(self.determinante)} -> {self.dependiente}"
+
+
+def _columna_canonica(serie):
+    '''Códigos de la columna (-1 en los vacíos) y el texto canónico de cada valor distinto.'''
+    codigos, distintos = pd.factorize(serie, use_na_sentinel=True)
+    distintos = np.asarray(distintos)
+    if distintos.dtype.kind in "iu":
+        return codigos, distintos.astype(str).astype(object)
+    if distintos.dtype == np.float64 and np.isfinite(distintos).all():
+        # Igual que texto_canonico: los enteros sin decimales y los demás con repr. Los enteros desde
+        # 2**53 no caben en int64 sin riesgo, así que esos (pocos) pasan por texto_canonico
+        enteros = np.mod(distintos, 1) == 0
+        grandes = enteros & (np.abs(distintos) >= 2**53)
+        enteros &= ~grandes
+        canonicos = distintos.astype(str).astype(object)
+        canonicos[enteros] = distintos[enteros].astype(np.int64).astype(str)
+        canonicos[grandes] = [texto_canonico(float(valor)) for valor in distintos[grandes]]
+        return codigos, canonicos
+    return codigos, np.array([texto_canonico(valor) for valor in distintos], dtype=object)
+
+
+def _clave_canonica(columnas):
+    '''Combina los códigos de varias columnas en un código por combinación distinta, con su texto.'''
+    if len(columnas) == 1:
+        return columnas[0]
+    combinados = np.zeros(len(columnas[0][0]), dtype=np.int64)
+    vacios = np.zeros(len(combinados), dtype=bool)
+    for codigos, canonicos in columnas:
+        combinados = combinados * (len(canonicos) + 1) + codigos + 1
+        vacios |= codigos < 0
+    codigos = np.full(len(combinados), -1, dtype=np.int64)
+    codigos[~vacios], combinaciones = pd.factorize(combinados[~vacios])
+    # Se deshace la combinación para armar el texto de cada combinación distinta
+    partes = []
+    restante = np.asarray(combinaciones)
+    for _, canonicos in reversed(columnas):
+        partes.append(canonicos[restante % (len(canonicos) + 1) - 1])
+        restante = restante // (len(canonicos) + 1)
+    textos = np.array([_SEPARADOR_CLAVE.join(fila) for fila in zip(*reversed(partes))], dtype=object)
+    return codigos, textos
+
+
+def _pares(columnas, dependencia, inicio):
+    '''Pares distintos (A, B) del bloque con la cantidad de filas, la primera fila y el texto de cada valor.'''
+    codigos_clave, textos_clave = _clave_canonica([columnas[columna] for columna in dependencia.determinante])
+    codigos_valor, textos_valor = columnas[dependencia.dependiente]
+    validas = np.flatnonzero((codigos_clave >= 0) & (codigos_valor >= 0))
+    combinados = codigos_clave[validas].astype(np.int64) * len(textos_valor) + codigos_valor[validas]
+    distintos, primeras, filas = np.unique(combinados, return_index=True, return_counts=True)
+    claves, valores = np.divmod(distintos, len(textos_valor)) if len(distintos) else (distintos, distintos)
+    return pd.DataFrame({
+        "clave": pd.util.hash_array(textos_clave, categorize=False)[claves],
+        "valor": pd.util.hash_array(textos_valor, categorize=False)[valores],
+        "filas": filas.astype(np.int64),
+        "posicion": validas[primeras].astype(np.int64) + inicio,
+        "texto_clave": textos_clave[claves],
+        "texto_valor": textos_valor[valores],
+    })
+
+
+def _reducir(pares):
+    return pares.groupby(["clave", "valor"], sort=False).agg(
+        filas=("filas", "sum"), posicion=("posicion", "min"),
+        texto_clave=("texto_clave", "first"), texto_valor=("texto_valor", "first")).reset_index()
+
+
+def _violaciones(pares):
+    '''Claves con más de un valor dependiente, con sus valores y la cantidad de filas de cada uno.'''
+    pares = _reducir(pares)
+    distintos = pares.groupby("clave")["valor"].transform("size")
+    pares = pares[distintos > 1].sort_values(["clave", "filas"], ascending=[True, False], kind="stable")
+    if pares.empty:
+        return []
+    claves = pares["clave"].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, claves[1:] != claves[:-1]])
+    cantidades = np.diff(np.r_[inicios, len(claves)])
+    filas = pares["filas"].to_numpy(dtype=np.int64)
+    textos_valor = pares["texto_valor"].tolist()
+    return [{
+        "clave": texto_clave,
+        "valores_distintos": int(cantidad),
+        "filas": int(total),
+        "primera_fila": int(primera),
+        "valores": dict(zip(textos_valor[inicio:inicio + cantidad], filas[inicio:inicio + cantidad].tolist())),
+    } for inicio, cantidad, texto_clave, total, primera in zip(
+        inicios, cantidades, pares["texto_clave"].to_numpy()[inicios], np.add.reduceat(filas, inicios),
+        np.minimum.reduceat(pares["posicion"].to_numpy(dtype=np.int64), inicios))]
+
+
+class _Particiones:
+    '''Pares por dependencia y partición, en memoria hasta memoria_maxima y volcados a disco después.'''
+
+    def __init__(self, dependencias, particiones, memoria_maxima, directorio):
+        self.particiones = particiones
+        self.memoria_maxima = memoria_maxima
+        self.directorio = Path(directorio)
+        self.memoria = {(indice, particion): [] for indice in range(len(dependencias)) for particion in range(particiones)}
+        self.bytes = dict.fromkeys(self.memoria, 0)
+        self.archivos = {clave: [] for clave in self.memoria}
+        self.volcadas = 0
+
+    def agregar(self, indice, pares):
+        particion = (pares["clave"].to_numpy() % np.uint64(self.particiones)).astype(np.int64)
+        orden = np.argsort(particion, kind="stable")
+        limites = np.cumsum(np.bincount(particion, minlength=self.particiones))[:-1]
+        for numero, posiciones in enumerate(np.split(orden, limites)):
+            if len(posiciones):
+                clave = (indice, numero)
+                self.memoria[clave].append(pares.take(posiciones))
+                self.bytes[clave] += len(posiciones) * _BYTES_PAR
+        while sum(self.bytes.values()) > self.memoria_maxima:
+            self._volcar(max(self.bytes, key=self.bytes.get))
+
+    def _volcar(self, clave):
+        ruta = self.directorio / f"dependencia-{clave[0]}-particion-{clave[1]}-{len(self.archivos[clave])}.pkl"
+        _reducir(pd.concat(self.memoria[clave], ignore_index=True)).to_pickle(ruta)
+        self.archivos[clave].append(ruta)
+        self.memoria[clave] = []
+        self.bytes[clave] = 0
+        self.volcadas += 1
+
+    def leer(self, indice, particion):
+        clave = (indice, particion)
+        partes = [pd.read_pickle(ruta) for ruta in self.archivos[clave]] + self.memoria[clave]
+        self.memoria[clave] = []
+        return pd.concat(partes, ignore_index=True) if partes else None
+
+
+@dataclass
+class ResultadoDependencias:
+    '''Violaciones de cada dependencia (una fila por clave con más de un valor dependiente).'''
+    filas: int
+    segundos: float
+    violaciones: dict = field(default_factory=dict)
+    particiones_volcadas: int = 0
+
+    def cumple(self, dependencia):
+        return self.violaciones[str(Dependencia.desde_texto(dependencia))].empty
+
+    @property
+    def filas_por_segundo(self):
+        return self.filas / self.segundos if self.segundos else math.inf
+
+    def resumen(self):
+        return {dependencia: len(violaciones) for dependencia, violaciones in self.violaciones.items()}
+
+
+def verificar_dependencias(bloques, dependencias=DEPENDENCIAS_VENTAS, particiones=PARTICIONES,
+                           memoria_maxima=MEMORIA_MAXIMA, dir_temporal=None):
+    '''
+    Verifica las dependencias sobre una secuencia de bloques (DataFrames) o un DataFrame completo.
+
+    Las filas de las violaciones (primera_fila) son posiciones en la secuencia completa, empezando en 0.
+    '''
+    if particiones < 1:
+        raise ValueError("La cantidad de particiones debe ser mayor que 0")
+    dependencias = [Dependencia.desde_texto(dependencia) for dependencia in dependencias]
+    if isinstance(bloques, pd.DataFrame):
+        bloques = [bloques]
+    inicio_tiempo = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=dir_temporal) as directorio:
+        partes = _Particiones(dependencias, particiones, memoria_maxima, directorio)
+        filas = 0
+        for bloque in bloques:
+            if not len(bloque):
+                continue
+            # Cada columna se codifica una sola vez por bloque aunque aparezca en varias dependencias
+            columnas = {columna: _columna_canonica(bloque[columna]) for dependencia in dependencias
+                        for columna in dependencia.columnas}
+            for indice, dependencia in enumerate(dependencias):
+                partes.agregar(indice, _pares(columnas, dependencia, filas))
+            filas += len(bloque)
+        violaciones = {}
+        for indice, dependencia in enumerate(dependencias):
+            encontradas = []
+            for particion in range(particiones):
+                pares = partes.leer(indice, particion)
+                if pares is not None:
+                    encontradas.extend(_violaciones(pares))
+            tabla = pd.DataFrame(encontradas, columns=["clave", "valores_distintos", "filas", "primera_fila", "valores"])
+            violaciones[str(dependencia)] = tabla.sort_values(["valores_distintos", "filas", "primera_fila"],
+                                                              ascending=[False, False, True], ignore_index=True)
+    return ResultadoDependencias(filas=filas, segundos=time.perf_counter() - inicio_tiempo, violaciones=violaciones,
+                                 particiones_volcadas=partes.volcadas)
+
+
+def leer_archivo_por_bloques(ruta, columnas, tamano_bloque=TAMANO_BLOQUE):
+    '''Bloques de un archivo de ventas .xlsx, .csv o .parquet (como los que escribe generador_ventas.py).'''
+    ruta = Path(ruta)
+    sufijo = ruta.suffix.lower()
+    if sufijo == ".csv":
+        yield from pd.read_csv(ruta, usecols=columnas, chunksize=tamano_bloque)
+    elif sufijo == ".parquet":
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano_bloque, columns=columnas):
+            yield lote.to_pandas()
+    else:
+        yield from leer_por_bloques(ruta, tamano_bloque=tamano_bloque, columnas=columnas)
+
+
+def verificar_dependencias_archivo(ruta, dependencias=DEPENDENCIAS_VENTAS, tamano_bloque=TAMANO_BLOQUE,
+                                   particiones=PARTICIONES, memoria_maxima=MEMORIA_MAXIMA, dir_temporal=None):
+    '''Verifica las dependencias leyendo del archivo solo las columnas que intervienen, por bloques.'''
+    dependencias = [Dependencia.desde_texto(dependencia) for dependencia in dependencias]
+    columnas = list(dict.fromkeys(columna for dependencia in dependencias for columna in dependencia.columnas))
+    return verificar_dependencias(leer_archivo_por_bloques(ruta, columnas, tamano_bloque), dependencias,
+                                  particiones=particiones, memoria_maxima=memoria_maxima, dir_temporal=dir_temporal)
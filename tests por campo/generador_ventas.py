@@ -0,0 +1,311 @@
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from clasificador_fechas import DD_MM_YYYY, ISO, NULO as FECHA_NULA, clasificar_fechas
+from coercion import NO_CONVERTIBLE, NUMERO, TEXTO_MONEDA, TEXTO_NUMERICO, convertir_columna
+from dataset_ventas import COLUMNAS_VENTAS, cargar_ventas, ruta_ventas
+
+'''
+Generador de datos sintéticos de ventas con los mismos defectos que el archivo original.
+
+Para pruebas de carga hacen falta archivos más grandes que ventas1.xlsx, pero repetir sus filas no
+reproduce lo que importa: valores con mojibake (ComputaciÃ³n), precios con '$' o negativos,
+total_venta como texto, fechas YYYY-MM-DD mezcladas con DD/MM/YYYY, celdas vacías y la distribución
+de repeticiones de id_producto. PerfilVentas aprende esas distribuciones de un archivo y generar_ventas
+produce bloques de filas nuevas con operaciones vectorizadas:
+
+perfil = PerfilVentas.aprender(cargar_ventas("ventas1.xlsx"))
+for bloque in generar_ventas(perfil, 10_000_000, semilla=7):
+    ...
+escribir_ventas(perfil, 1_000_000, "ventas_1m.csv", semilla=7)     # .csv, .xlsx o .parquet
+
+Con la misma semilla y el mismo tamaño de bloque se generan siempre los mismos datos.
+
+python generador_ventas.py 1000000 ventas_1m.csv --semilla 7
+'''
+
+TAMANO_BLOQUE = 100_000
+# Filas de datos que admite una hoja de Excel (sin contar el encabezado)
+MAX_FILAS_XLSX = 1_048_575
+
+
+class _Categorica:
+    '''Distribución empírica de los valores (incluido el vacío) de una o varias columnas.'''
+
+    def __init__(self, valores, cantidades):
+        self.valores = valores
+        self.acumulada = np.cumsum(cantidades) / np.sum(cantidades)
+
+    @classmethod
+    def aprender(cls, serie):
+        codigos, distintos = pd.factorize(serie, use_na_sentinel=True)
+        cantidades = np.bincount(codigos + 1, minlength=len(distintos) + 1)
+        valores = np.empty(len(distintos) + 1, dtype=object)
+        valores[0] = np.nan
+        valores[1:] = np.asarray(distintos, dtype=object)
+        return cls(valores, cantidades)
+
+    def posiciones(self, rng, cantidad):
+        return np.minimum(np.searchsorted(self.acumulada, rng.random(cantidad), side="right"), len(self.acumulada) - 1)
+
+    def muestrear(self, rng, cantidad):
+        return self.valores.take(self.posiciones(rng, cantidad))
+
+
+class _ModeloConjunto:
+    '''Varias columnas que se muestrean juntas para conservar su relación (nombre_producto y categoria).'''
+
+    def __init__(self, columnas, filas):
+        self.columnas = columnas
+        self.filas = filas
+
+    @classmethod
+    def aprender(cls, data, columnas):
+        claves = pd.MultiIndex.from_frame(data[columnas].astype(object).where(data[columnas].notna(), None))
+        codigos, _ = pd.factorize(claves)
+        primeras = pd.Series(np.arange(len(codigos))).groupby(codigos).first().to_numpy()
+        filas = data[columnas].iloc[primeras].reset_index(drop=True)
+        modelo = cls(columnas, {columna: filas[columna].to_numpy(dtype=object) for columna in columnas})
+        modelo.distribucion = _Categorica(np.arange(len(primeras)), np.bincount(codigos, minlength=len(primeras)))
+        return modelo
+
+    def generar(self, rng, cantidad):
+        posiciones = self.distribucion.valores.take(self.distribucion.posiciones(rng, cantidad)).astype(np.int64)
+        return {columna: self.filas[columna].take(posiciones) for columna in self.columnas}
+
+
+class _ModeloNumericoTexto:
+    '''Columna numérica con celdas de texto, números con '$', textos no numéricos y vacíos (precio, total_venta).'''
+
+    def __init__(self, formas, numeros, literales):
+        self.formas = formas
+        self.numeros = numeros
+        self.literales = literales
+
+    @classmethod
+    def aprender(cls, serie):
+        numerica = convertir_columna(serie)
+        estado = numerica.estado.astype(np.int8).copy()
+        textos = serie.where(numerica.mascara(NO_CONVERTIBLE)).astype(object)
+        moneda = textos.str.fullmatch(r'\$\d+(\.\d+)?', na=False).to_numpy(dtype=bool)
+        # Los textos con '$' delante de un número ('$150.51') se generan como forma aparte
+        estado[moneda] = TEXTO_MONEDA
+        numeros = numerica.valores[numerica.validos]
+        numeros = np.concatenate([numeros, pd.to_numeric(textos[moneda].str[1:]).to_numpy(dtype=float)])
+        literales = textos[numerica.mascara(NO_CONVERTIBLE) & ~moneda]
+        return cls(_Categorica.aprender(pd.Series(estado)), numeros,
+                   _Categorica.aprender(literales) if len(literales) else None)
+
+    def generar(self, rng, cantidad, numeros=None):
+        '''Genera la columna; numeros (NaN donde no se indica) reemplaza a los valores sorteados.'''
+        formas = self.formas.muestrear(rng, cantidad).astype(np.int8)
+        sorteados = self.numeros.take(rng.integers(0, len(self.numeros), cantidad)) * rng.uniform(0.99, 1.01, cantidad)
+        if numeros is not None:
+            sorteados = np.where(np.isnan(numeros), sorteados, numeros)
+        sorteados = np.round(sorteados, 2)
+        valores = np.full(cantidad, np.nan, dtype=object)
+        for forma, convertir in ((NUMERO, lambda x: x.astype(object)),
+                                 (TEXTO_NUMERICO, lambda x: pd.Series(x).astype(str).to_numpy(dtype=object)),
+                                 (TEXTO_MONEDA, lambda x: np.char.add("$", np.char.mod("%.2f", np.abs(x))).astype(object))):
+            mascara = formas == forma
+            if mascara.any():
+                valores[mascara] = convertir(sorteados[mascara])
+        mascara = formas == NO_CONVERTIBLE
+        if mascara.any() and self.literales is not None:
+            valores[mascara] = self.literales.muestrear(rng, int(mascara.sum()))
+        return valores, np.where(np.isin(formas, (NUMERO, TEXTO_NUMERICO, TEXTO_MONEDA)), sorteados, np.nan)
+
+
+class _ModeloFechas:
+    '''Fechas en los formatos YYYY-MM-DD y DD/MM/YYYY dentro del rango del archivo, más textos y vacíos.'''
+
+    def __init__(self, formatos, desde, dias, literales):
+        self.formatos = formatos
+        self.desde = desde
+        self.dias = dias
+        self.literales = literales
+
+    @classmethod
+    def aprender(cls, serie):
+        clasificacion = clasificar_fechas(serie)
+        fechas = clasificacion.serie_fechas().dropna()
+        desde = np.datetime64(fechas.min(), "D") if len(fechas) else np.datetime64("2024-01-01")
+        dias = int((np.datetime64(fechas.max(), "D") - desde).astype(int)) + 1 if len(fechas) else 365
+        otros = ~clasificacion.mascara(ISO, DD_MM_YYYY, FECHA_NULA)
+        literales = serie[otros]
+        return cls(_Categorica.aprender(pd.Series(clasificacion.formato)), desde, dias,
+                   _Categorica.aprender(literales) if len(literales) else None)
+
+    def generar(self, rng, cantidad):
+        formatos = self.formatos.muestrear(rng, cantidad).astype(np.int8)
+        iso = np.datetime_as_string(self.desde + rng.integers(0, self.dias, cantidad), unit="D").astype(object)
+        valores = np.full(cantidad, np.nan, dtype=object)
+        valores[formatos == ISO] = iso[formatos == ISO]
+        mascara = formatos == DD_MM_YYYY
+        if mascara.any():
+            partes = pd.Series(iso[mascara])
+            valores[mascara] = (partes.str[8:10] + "/" + partes.str[5:7] + "/" + partes.str[0:4]).to_numpy(dtype=object)
+        mascara = ~np.isin(formatos, (ISO, DD_MM_YYYY, FECHA_NULA))
+        if mascara.any() and self.literales is not None:
+            valores[mascara] = self.literales.muestrear(rng, int(mascara.sum()))
+        return valores
+
+
+class _ModeloRepeticiones:
+    '''Identificadores con la misma distribución de repeticiones (cuántos aparecen 1, 2, ... veces).'''
+
+    def __init__(self, repeticiones, minimo, maximo, distintos):
+        self.repeticiones = repeticiones
+        self.minimo = minimo
+        self.maximo = maximo
+        self.distintos = distintos
+
+    @classmethod
+    def aprender(cls, serie):
+        conteos = serie.value_counts()
+        histograma = conteos.value_counts().sort_index()
+        return cls(_Categorica(histograma.index.to_numpy(dtype=np.int64), histograma.to_numpy()),
+                   int(serie.min()), int(serie.max()), len(conteos))
+
+    def generar(self, rng, cantidad):
+        '''Todos los identificadores del archivo (las repeticiones pueden quedar en distintos bloques).'''
+        media = float(np.dot(self.repeticiones.valores, np.diff(self.repeticiones.acumulada, prepend=0)))
+        repeticiones = self.repeticiones.muestrear(rng, int(cantidad / media * 1.1) + 10).astype(np.int64)
+        while repeticiones.sum() < cantidad:
+            repeticiones = np.concatenate([repeticiones, self.repeticiones.muestrear(rng, len(repeticiones)).astype(np.int64)])
+        ultimo = int(np.searchsorted(np.cumsum(repeticiones), cantidad))
+        repeticiones = repeticiones[:ultimo + 1]
+        repeticiones[-1] -= int(repeticiones.sum()) - cantidad
+        # El rango de identificadores crece en la misma proporción que la cantidad de identificadores distintos
+        amplitud = max(self.maximo - self.minimo + 1, 1)
+        amplitud = max(int(amplitud * len(repeticiones) / max(self.distintos, 1)), len(repeticiones))
+        identificadores = self.minimo + rng.choice(amplitud, size=len(repeticiones), replace=False)
+        return rng.permutation(np.repeat(identificadores.astype(np.int64), repeticiones))
+
+
+@dataclass
+class PerfilVentas:
+    '''Distribuciones aprendidas de un archivo de ventas.'''
+    identificadores: _ModeloRepeticiones
+    producto: _ModeloConjunto
+    categoricas: dict
+    precio: _ModeloNumericoTexto
+    cantidad: _Categorica
+    total: _ModeloNumericoTexto
+    total_consistente: float
+    fechas: _ModeloFechas
+
+    @classmethod
+    def aprender(cls, data):
+        precio = convertir_columna(data['precio'])
+        total = convertir_columna(data['total_venta'])
+        esperado = precio.valores * data['cantidad_vendida'].to_numpy(dtype=float)
+        ambos = ~np.isnan(esperado) & ~np.isnan(total.valores)
+        consistentes = np.isclose(esperado[ambos], total.valores[ambos], atol=0.01)
+        return cls(
+            identificadores=_ModeloRepeticiones.aprender(data['id_producto']),
+            producto=_ModeloConjunto.aprender(data, ['nombre_producto', 'categoria']),
+            categoricas={columna: _Categorica.aprender(data[columna]) for columna in ['nombre_cliente', 'region', 'metodo_pago']},
+            precio=_ModeloNumericoTexto.aprender(data['precio']),
+            cantidad=_Categorica.aprender(data['cantidad_vendida']),
+            total=_ModeloNumericoTexto.aprender(data['total_venta']),
+            total_consistente=float(consistentes.mean()) if ambos.any() else 0.0,
+            fechas=_ModeloFechas.aprender(data['fecha_venta']),
+        )
+
+    def _bloque(self, rng, identificadores, inicio):
+        cantidad = len(identificadores)
+        columnas = {'fecha_venta': self.fechas.generar(rng, cantidad), 'id_producto': identificadores}
+        columnas.update(self.producto.generar(rng, cantidad))
+        precio, numeros_precio = self.precio.generar(rng, cantidad)
+        cantidad_vendida = self.cantidad.muestrear(rng, cantidad)
+        if not pd.isna(cantidad_vendida).any():
+            cantidad_vendida = cantidad_vendida.astype(np.int64)
+        # Una parte de los totales es precio × cantidad, como en el archivo; el resto se sortea
+        consistente = rng.random(cantidad) < self.total_consistente
+        esperado = np.where(consistente, numeros_precio * pd.to_numeric(cantidad_vendida), np.nan)
+        columnas.update(precio=precio, cantidad_vendida=cantidad_vendida, total_venta=self.total.generar(rng, cantidad, esperado)[0])
+        for columna, distribucion in self.categoricas.items():
+            columnas[columna] = distribucion.muestrear(rng, cantidad)
+        return pd.DataFrame({columna: columnas[columna] for columna in COLUMNAS_VENTAS},
+                            index=pd.RangeIndex(inicio, inicio + cantidad), copy=False)
+
+
+def generar_ventas(perfil, filas, semilla=0, tamano_bloque=TAMANO_BLOQUE):
+    '''Genera DataFrames de a lo sumo tamano_bloque filas con el esquema de ventas (COLUMNAS_VENTAS).'''
+    if tamano_bloque <= 0:
+        raise ValueError("tamano_bloque debe ser mayor que 0")
+    semillas = np.random.SeedSequence(semilla)
+    rng = np.random.default_rng(semillas.spawn(1)[0])
+    identificadores = perfil.identificadores.generar(rng, filas)
+    for inicio, semilla_bloque in zip(range(0, filas, tamano_bloque), semillas.spawn(-(-filas // tamano_bloque))):
+        yield perfil._bloque(np.random.default_rng(semilla_bloque), identificadores[inicio:inicio + tamano_bloque], inicio)
+
+
+def generar_dataframe(perfil, filas, semilla=0, tamano_bloque=TAMANO_BLOQUE):
+    '''Los bloques de generar_ventas unidos en un solo DataFrame.'''
+    return pd.concat(generar_ventas(perfil, filas, semilla, tamano_bloque), copy=False)
+
+
+def _celda(valor):
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+def escribir_ventas(perfil, filas, ruta, semilla=0, tamano_bloque=TAMANO_BLOQUE):
+    '''Escribe filas generadas en ruta (.csv, .xlsx o .parquet) bloque a bloque.'''
+    ruta = Path(ruta)
+    bloques = generar_ventas(perfil, filas, semilla, tamano_bloque)
+    formato = ruta.suffix.lower()
+    if formato == ".csv":
+        for numero, bloque in enumerate(bloques):
+            bloque.to_csv(ruta, mode="w" if numero == 0 else "a", header=numero == 0, index=False)
+    elif formato == ".xlsx":
+        if filas > MAX_FILAS_XLSX:
+            raise ValueError(f"Una hoja de Excel admite a lo sumo {MAX_FILAS_XLSX} filas de datos")
+        import openpyxl
+        libro = openpyxl.Workbook(write_only=True)
+        hoja = libro.create_sheet()
+        hoja.append(COLUMNAS_VENTAS)
+        for bloque in bloques:
+            for fila in bloque.itertuples(index=False, name=None):
+                hoja.append([_celda(valor) for valor in fila])
+        libro.save(ruta)
+    elif formato == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        escritor = None
+        try:
+            for bloque in bloques:
+                # Parquet no admite columnas con tipos mezclados: precio y las demás columnas de texto se guardan como texto
+                bloque = bloque.astype({columna: "string" for columna in bloque.columns if bloque[columna].dtype == object})
+                tabla = pa.Table.from_pandas(bloque, preserve_index=False)
+                escritor = escritor or pq.ParquetWriter(ruta, tabla.schema)
+                escritor.write_table(tabla)
+        finally:
+            if escritor is not None:
+                escritor.close()
+    else:
+        raise ValueError(f"Formato no soportado: '{ruta.suffix}' (use .csv, .xlsx o .parquet)")
+    return ruta
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera datos de ventas sintéticos con los defectos del archivo original.")
+    parser.add_argument("filas", type=int)
+    parser.add_argument("salida", help="Archivo a escribir (.csv, .xlsx o .parquet).")
+    parser.add_argument("--ventas", default=None, help="Archivo de ventas del que se aprenden las distribuciones.")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE)
+    opciones = parser.parse_args(argumentos)
+    perfil = PerfilVentas.aprender(cargar_ventas(opciones.ventas or ruta_ventas()))
+    escribir_ventas(perfil, opciones.filas, opciones.salida, opciones.semilla, opciones.tamano_bloque)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from cache_datos import en_cache
+
+'''
+Índice de duplicados de una columna clave (id_producto).
+
+Las validaciones de id_producto recorren la columna una vez por caso: value_counts() y otra vez
+value_counts() para cada cantidad de repeticiones, duplicated(keep=False) y un groupby para comparar
+los nombres de los duplicados. IndiceDuplicados recorre la columna una sola vez con una tabla hash
+(pd.factorize) y responde todas esas consultas:
+
+indice = indice_duplicados(data, 'id_producto')
+indice.claves_distintas              # data['id_producto'].nunique()
+indice.histograma()                  # data['id_producto'].value_counts().value_counts()
+indice.duplicado(keep=False)         # data['id_producto'].duplicated(keep=False)
+indice.posiciones(1234)              # posiciones de los registros con id_producto 1234
+indice.inconsistentes(data['nombre_producto'])   # claves repetidas con más de un nombre
+
+Cuando llegan registros nuevos, indice.agregar(nuevos['id_producto']) busca solo esas claves en la
+tabla y actualiza conteos, histograma y primeras / últimas apariciones sin recorrer otra vez los
+registros anteriores. Los vacíos se registran como una clave más para duplicado(), igual que en
+pandas, pero no cuentan en claves_distintas ni en el histograma.
+'''
+
+
+class IndiceDuplicados:
+    '''Clave -> posiciones de sus registros, con conteos por clave e histograma de repeticiones.'''
+
+    def __init__(self, serie=None, nombre=None):
+        self.nombre = nombre if nombre is not None or serie is None else serie.name
+        self._claves = pd.Index([])
+        self._codigos = np.empty(0, dtype=np.int64)
+        self._conteos = np.empty(0, dtype=np.int64)
+        self._primeras = np.empty(0, dtype=np.int64)
+        self._ultimas = np.empty(0, dtype=np.int64)
+        self._histograma = {}
+        self._codigo_vacio = -1
+        self._posiciones = None
+        if serie is not None:
+            self.agregar(serie)
+
+    def __len__(self):
+        return len(self._codigos)
+
+    def _codificar(self, valores):
+        '''Códigos de los valores, dando códigos nuevos a las claves que todavía no están en la tabla.'''
+        # Los vacíos (None, NaN, NaT) se separan antes de buscar en la tabla: según el tipo del bloque
+        # llegan en distinta representación y no se encontrarían entre sí
+        vacios = np.asarray(pd.isna(valores), dtype=bool)
+        codigos = np.full(len(valores), -1, dtype=np.int64)
+        llenos = valores[~vacios]
+        if len(llenos):
+            codigos_llenos = self._claves.get_indexer(llenos) if len(self._claves) else np.full(len(llenos), -1, dtype=np.int64)
+            faltan = codigos_llenos < 0
+            if faltan.any():
+                nuevos_codigos, nuevas = pd.factorize(llenos[faltan])
+                codigos_llenos[faltan] = nuevos_codigos + len(self._claves)
+                self._agregar_claves(pd.Index(nuevas))
+            codigos[~vacios] = codigos_llenos
+        if vacios.any():
+            if self._codigo_vacio < 0:
+                self._codigo_vacio = len(self._claves)
+                self._agregar_claves(pd.Index([np.nan]))
+            codigos[vacios] = self._codigo_vacio
+        return codigos
+
+    def _agregar_claves(self, nuevas):
+        self._claves = self._claves.append(nuevas) if len(self._claves) else nuevas
+
+    def agregar(self, serie):
+        '''Agrega registros al final del índice (las posiciones continúan después de los existentes).'''
+        valores = pd.Index(np.asarray(serie))
+        inicio = len(self._codigos)
+        codigos = self._codificar(valores)
+        posiciones = np.arange(inicio, inicio + len(codigos), dtype=np.int64)
+        nuevas_claves = len(self._claves) - len(self._conteos)
+        self._conteos = np.concatenate([self._conteos, np.zeros(nuevas_claves, dtype=np.int64)])
+        self._primeras = np.concatenate([self._primeras, np.full(nuevas_claves, np.iinfo(np.int64).max)])
+        self._ultimas = np.concatenate([self._ultimas, np.full(nuevas_claves, -1, dtype=np.int64)])
+        # Histograma: se descuentan las claves tocadas con su conteo anterior y se suman con el nuevo
+        tocadas, agregados = np.unique(codigos, return_counts=True)
+        anteriores = self._conteos[tocadas]
+        self._conteos[tocadas] += agregados
+        no_vacias = tocadas != self._codigo_vacio
+        for conteo, cambio in ((anteriores[no_vacias], -1), (self._conteos[tocadas][no_vacias], 1)):
+            repeticiones, claves = np.unique(conteo[conteo > 0], return_counts=True)
+            for repeticion, cantidad in zip(repeticiones.tolist(), claves.tolist()):
+                self._histograma[repeticion] = self._histograma.get(repeticion, 0) + cambio * cantidad
+        self._histograma = {repeticion: cantidad for repeticion, cantidad in self._histograma.items() if cantidad}
+        np.minimum.at(self._primeras, codigos, posiciones)
+        np.maximum.at(self._ultimas, codigos, posiciones)
+        self._codigos = np.concatenate([self._codigos, codigos])
+        self._posiciones = None
+        return self
+
+    @property
+    def claves_distintas(self):
+        return len(self._claves) - (self._codigo_vacio >= 0)
+
+    def conteos(self):
+        '''Cantidad de registros por clave (sin los vacíos), como value_counts() sin ordenar.'''
+        conteos = pd.Series(self._conteos, index=self._claves, name=self.nombre)
+        return conteos[np.arange(len(conteos)) != self._codigo_vacio] if self._codigo_vacio >= 0 else conteos
+
+    def histograma(self):
+        '''Cantidad de claves por número de repeticiones, como value_counts().value_counts().'''
+        return pd.Series(self._histograma, dtype=np.int64, name="claves").sort_index()
+
+    def repeticiones(self, clave):
+        '''Cantidad de registros con la clave (0 si no existe).'''
+        codigo = self._claves.get_indexer([clave])[0]
+        return int(self._conteos[codigo]) if codigo >= 0 else 0
+
+    def duplicado(self, keep="first"):
+        '''Máscara equivalente a serie.duplicated(keep=keep) sobre todos los registros agregados.'''
+        if keep is False:
+            return self._conteos[self._codigos] > 1
+        referencia = self._primeras if keep == "first" else self._ultimas
+        return referencia[self._codigos] != np.arange(len(self._codigos))
+
+    def _agrupar(self):
+        if self._posiciones is None:
+            orden = np.argsort(self._codigos, kind="stable")
+            inicios = np.concatenate([[0], np.cumsum(self._conteos)])
+            self._posiciones = (orden, inicios)
+        return self._posiciones
+
+    def posiciones(self, clave):
+        '''Posiciones (de 0 a len - 1) de los registros con la clave, en orden.'''
+        codigo = self._claves.get_indexer([clave])[0]
+        if codigo < 0:
+            return np.empty(0, dtype=np.int64)
+        orden, inicios = self._agrupar()
+        return orden[inicios[codigo]:inicios[codigo + 1]]
+
+    def inconsistentes(self, otra):
+        '''
+        Claves repetidas cuyos registros tienen más de un valor distinto en la otra columna (alineada
+        con los registros del índice), con la cantidad de valores distintos de cada una. Igual que
+        groupby(clave)[otra].nunique().gt(1) sobre los registros duplicados.
+        '''
+        otros, _ = pd.factorize(pd.Series(np.asarray(otra, dtype=object)))
+        # Como groupby(...).nunique(), los vacíos de la otra columna no cuentan como un valor
+        repetidos = (self._conteos[self._codigos] > 1) & (otros >= 0)
+        if self._codigo_vacio >= 0:
+            repetidos &= self._codigos != self._codigo_vacio
+        base = int(otros.max(initial=0)) + 1
+        pares = np.unique(self._codigos[repetidos] * base + otros[repetidos])
+        distintos = np.bincount(pares // base, minlength=len(self._claves))
+        codigos = np.flatnonzero(distintos > 1)
+        return pd.Series(distintos[codigos], index=self._claves[codigos], name=self.nombre)
+
+
+def indice_duplicados(data, nombre):
+    '''Devuelve el índice de duplicados de la columna, construyéndolo solo la primera vez para cada DataFrame.'''
+    return en_cache(data, ("duplicados", nombre), lambda: IndiceDuplicados(data[nombre]))
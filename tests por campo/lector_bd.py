@@ -0,0 +1,82 @@
+import datetime
+import decimal
+
+import pandas as pd
+
+from columna_diccionario import codificar_columnas
+from lector_streaming import TAMANO_BLOQUE, _normalizar_celda, _tipar
+from reglas_sql import DialectoSQLite
+
+'''
+Lectura por bloques de la tabla de ventas directamente desde la base de datos.
+
+Para validar products.ventas con los casos de prueba de cada campo había que exportar la tabla a xlsx.
+leer_tabla_por_bloques recorre la tabla con un cursor del lado del servidor (sin buffer en MySQL) y
+entrega DataFrames de tamano_bloque filas con las columnas ya tipadas, igual que leer_por_bloques con
+el archivo; solo se tiene en memoria un bloque de filas a la vez:
+
+with pool.conexion() as conexion:
+    for bloque in leer_tabla_por_bloques(conexion, "ventas", dialecto=pool.dialecto):
+        resumen.actualizar(bloque['precio'])
+
+cargar_ventas_bd arma con esos bloques el DataFrame completo que usan las fixtures (opción --ventas-bd).
+Esa carga no tiene memoria acotada: la tabla completa queda en memoria, como el archivo con
+cargar_ventas. La memoria acotada a un bloque vale solo para quien recorre leer_tabla_por_bloques.
+'''
+
+
+def _valor_celda(valor):
+    '''Convierte los tipos propios del conector a los que entrega la lectura del archivo.'''
+    if isinstance(valor, decimal.Decimal):
+        return float(valor)
+    if isinstance(valor, datetime.date) and not isinstance(valor, datetime.datetime):
+        return datetime.datetime(valor.year, valor.month, valor.day)
+    if isinstance(valor, (bytes, bytearray)):
+        return bytes(valor).decode("utf-8")
+    return _normalizar_celda(valor)
+
+
+def leer_tabla_por_bloques(conexion, tabla="ventas", tamano_bloque=TAMANO_BLOQUE, columnas=None, dialecto=None):
+    '''
+    Recorre la tabla y genera DataFrames de a lo sumo tamano_bloque filas.
+
+    Como en leer_por_bloques, el índice de cada bloque continúa la numeración de los anteriores.
+    '''
+    if tamano_bloque <= 0:
+        raise ValueError("tamano_bloque debe ser mayor que 0")
+    dialecto = dialecto or DialectoSQLite()
+    seleccion = ", ".join(dialecto.citar(columna) for columna in columnas) if columnas else "*"
+    cursor = dialecto.cursor_streaming(conexion)
+    try:
+        cursor.execute(f"SELECT {seleccion} FROM {dialecto.citar(tabla)}")
+        nombres = [descripcion[0] for descripcion in cursor.description]
+        inicio = 0
+        while True:
+            filas = cursor.fetchmany(tamano_bloque)
+            if not filas:
+                break
+            indice = pd.RangeIndex(inicio, inicio + len(filas))
+            valores = zip(*filas)
+            yield pd.DataFrame({nombre: _tipar([_valor_celda(valor) for valor in columna])
+                                for nombre, columna in zip(nombres, valores)}, index=indice, copy=False)
+            inicio += len(filas)
+    finally:
+        dialecto.descartar_pendientes(conexion)
+        cursor.close()
+
+
+def cargar_ventas_bd(pool, tabla="ventas", tamano_bloque=TAMANO_BLOQUE):
+    '''
+    Carga la tabla completa como DataFrame, con las columnas de texto codificadas como en cargar_ventas.
+
+    La lectura es por bloques, pero todos los bloques se guardan y se unen al final: durante la unión
+    la memoria llega a unas dos veces el tamaño de la tabla.
+    '''
+    with pool.conexion() as conexion:
+        bloques = list(leer_tabla_por_bloques(conexion, tabla, tamano_bloque=tamano_bloque, dialecto=pool.dialecto))
+    if not bloques:
+        raise ValueError(f"La tabla '{tabla}' no tiene registros")
+    data = pd.concat(bloques, copy=False)
+    del bloques
+    codificar_columnas(data)
+    return data
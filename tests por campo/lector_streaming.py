@@ -0,0 +1,160 @@
+import datetime
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from coercion import convertir_columna
+
+'''
+Lectura por bloques de archivos de ventas grandes.
+
+pd.read_excel construye la hoja completa en memoria antes de poder validar nada. leer_por_bloques
+recorre la hoja con el modo de solo lectura de openpyxl y entrega DataFrames de tamano_bloque filas
+con las columnas ya tipadas, de modo que cualquier validación por columna se puede aplicar bloque a
+bloque con memoria acotada:
+
+for bloque in leer_por_bloques("ventas1.xlsx", tamano_bloque=10_000):
+    resumen.actualizar(bloque['precio'])
+'''
+
+TAMANO_BLOQUE = 50_000
+
+# Textos que pd.read_excel interpreta como celda vacía
+VALORES_VACIOS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+
+def _normalizar_celda(valor):
+    '''Ajusta el valor de la celda igual que pd.read_excel (enteros sin decimales, textos vacíos a None).'''
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if isinstance(valor, str) and valor in VALORES_VACIOS:
+        return None
+    return valor
+
+
+def _tipar(valores):
+    '''Convierte la lista de valores de una columna en el arreglo tipado que usaría pandas.'''
+    tipos = {type(valor) for valor in valores if valor is not None}
+    hay_vacios = any(valor is None for valor in valores)
+    if tipos and tipos <= {int} and not hay_vacios:
+        return np.array(valores, dtype=np.int64)
+    if tipos and tipos <= {int, float}:
+        return np.array([np.nan if valor is None else valor for valor in valores], dtype=np.float64)
+    if tipos and tipos <= {bool} and not hay_vacios:
+        return np.array(valores, dtype=bool)
+    if tipos and tipos <= {datetime.datetime}:
+        return pd.to_datetime(pd.Series(valores, dtype=object)).to_numpy()
+    if not tipos:
+        return np.full(len(valores), np.nan)
+    arreglo = np.empty(len(valores), dtype=object)
+    arreglo[:] = [np.nan if valor is None else valor for valor in valores]
+    return arreglo
+
+
+def _nombres_columnas(encabezado):
+    '''Nombres de columnas como los asigna pandas, incluidas las columnas sin encabezado.'''
+    return [f"Unnamed: {posicion}" if nombre is None else str(nombre) for posicion, nombre in enumerate(encabezado)]
+
+
+def leer_por_bloques(ruta, tamano_bloque=TAMANO_BLOQUE, columnas=None, hoja=None):
+    '''
+    Recorre la hoja de ventas y genera DataFrames de a lo sumo tamano_bloque filas.
+
+    El índice de cada bloque continúa la numeración de las filas anteriores, así que las posiciones
+    reportadas por una validación corresponden a la fila del archivo completo.
+    '''
+    if tamano_bloque <= 0:
+        raise ValueError("tamano_bloque debe ser mayor que 0")
+    libro = openpyxl.load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja_ventas = libro[hoja] if hoja else libro.worksheets[0]
+        filas = hoja_ventas.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        nombres = _nombres_columnas(encabezado)
+        seleccion = [nombres.index(nombre) for nombre in columnas] if columnas else list(range(len(nombres)))
+        ancho = len(nombres)
+        inicio = 0
+        pendientes = [[] for _ in seleccion]
+        for fila in filas:
+            # En modo de solo lectura las filas pueden venir recortadas al final
+            if len(fila) < ancho:
+                fila = tuple(fila) + (None,) * (ancho - len(fila))
+            for destino, posicion in zip(pendientes, seleccion):
+                destino.append(_normalizar_celda(fila[posicion]))
+            if len(pendientes[0]) == tamano_bloque:
+                yield _bloque(nombres, seleccion, pendientes, inicio)
+                inicio += tamano_bloque
+                pendientes = [[] for _ in seleccion]
+        if pendientes and pendientes[0]:
+            yield _bloque(nombres, seleccion, pendientes, inicio)
+    finally:
+        libro.close()
+
+
+def _bloque(nombres, seleccion, pendientes, inicio):
+    indice = pd.RangeIndex(inicio, inicio + len(pendientes[0]))
+    return pd.DataFrame({nombres[posicion]: _tipar(valores) for posicion, valores in zip(seleccion, pendientes)},
+                        index=indice, copy=False)
+
+
+def _menor(a, b):
+    return b if math.isnan(a) else a if math.isnan(b) else min(a, b)
+
+
+def _mayor(a, b):
+    return b if math.isnan(a) else a if math.isnan(b) else max(a, b)
+
+
+@dataclass
+class ResumenColumna:
+    '''Conteos, nulos, extremos y prefijos de una columna acumulados bloque a bloque.'''
+    prefijos: tuple = ()
+    filas: int = 0
+    nulos: int = 0
+    textos: int = 0
+    minimo: float = math.nan
+    maximo: float = math.nan
+    conteo_prefijos: dict = field(default_factory=dict)
+
+    def actualizar(self, serie):
+        '''Acumula los valores de un bloque de la columna.'''
+        self.filas += len(serie)
+        self.nulos += int(serie.isna().sum())
+        if serie.dtype == object:
+            self.textos += int(serie.map(lambda valor: isinstance(valor, str)).sum())
+        numeros = convertir_columna(serie).serie()
+        if numeros.notna().any():
+            self.minimo = _menor(self.minimo, float(numeros.min()))
+            self.maximo = _mayor(self.maximo, float(numeros.max()))
+        if self.prefijos:
+            textos = serie.astype(str)
+            for prefijo in self.prefijos:
+                self.conteo_prefijos[prefijo] = self.conteo_prefijos.get(prefijo, 0) + int(textos.str.startswith(prefijo).sum())
+        return self
+
+    def combinar(self, otro):
+        '''Une el resumen de otra porción de la misma columna (por ejemplo, de otro proceso).'''
+        self.filas += otro.filas
+        self.nulos += otro.nulos
+        self.textos += otro.textos
+        self.minimo = _menor(self.minimo, otro.minimo)
+        self.maximo = _mayor(self.maximo, otro.maximo)
+        for prefijo, cantidad in otro.conteo_prefijos.items():
+            self.conteo_prefijos[prefijo] = self.conteo_prefijos.get(prefijo, 0) + cantidad
+        return self
+
+
+def resumir_columna(bloques, columna, prefijos=()):
+    '''Recorre los bloques una vez y devuelve el ResumenColumna de la columna indicada.'''
+    resumen = ResumenColumna(prefijos=tuple(prefijos))
+    for bloque in bloques:
+        resumen.actualizar(bloque[columna])
+    return resumen
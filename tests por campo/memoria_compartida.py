@@ -0,0 +1,187 @@
+import logging
+import multiprocessing
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from snapshot_columnar import _desetiquetar, _etiquetar, _tipo_codigos
+
+logger = logging.getLogger(__name__)
+
+'''
+Datos de ventas en memoria compartida para ejecuciones en paralelo (pytest -n con pytest-xdist).
+
+El proceso principal carga los datos una vez y copia las columnas tipadas a un único segmento de
+multiprocessing.shared_memory:
+
+- columnas numéricas y fechas: el arreglo tal cual.
+- columnas de texto o de tipos mezclados: códigos enteros (-1 para vacíos); los valores distintos
+  viajan en la descripción del segmento, que es un dict serializable.
+
+Cada worker recibe la descripción (config.workerinput) y se adjunta al segmento: las columnas
+numéricas y los códigos se usan sin copiar, y solo los valores de las columnas de texto se
+reconstruyen en cada proceso. El proceso principal elimina el segmento al terminar la sesión.
+
+compartidos = DatosCompartidos.publicar(data)      # proceso principal
+data = DatosCompartidos.adjuntar(compartidos.descripcion).a_dataframe()   # cada worker
+compartidos.liberar()                                # proceso principal, al final
+'''
+
+# Alineación de cada columna dentro del segmento
+ALINEACION = 64
+
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+# Segmentos publicados por este proceso
+_publicados = set()
+
+
+def _abrir_segmento(nombre):
+    '''Se adjunta a un segmento existente sin que este proceso quede a cargo de eliminarlo.'''
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Antes de Python 3.13 no existe track: al adjuntarse el segmento queda registrado en el
+        # resource_tracker, que lo eliminaría al terminar el worker, así que se quita ese registro.
+        # Si el tracker es el del proceso que publicó (el mismo proceso, o un hijo de multiprocessing
+        # que lo hereda), el registro es el del propietario y se conserva
+        segmento = shared_memory.SharedMemory(name=nombre)
+        if os.name == "posix" and nombre not in _publicados and multiprocessing.parent_process() is None:
+            resource_tracker.unregister(segmento._name, "shared_memory")
+        return segmento
+
+
+class _Vista:
+    '''
+    Arreglo sobre el segmento que mantiene vivo el SharedMemory: los arreglos de las columnas se crean
+    desde esta vista (np.asarray usa __array_interface__ y guarda la vista como base), así que el
+    segmento no se cierra ni se recolecta mientras exista alguna columna que lo use.
+    '''
+
+    def __init__(self, arreglo, segmento):
+        # El arreglo va primero: al liberar la vista se suelta antes que el segmento
+        self.arreglo = arreglo
+        self.segmento = segmento
+        self.__array_interface__ = arreglo.__array_interface__
+
+
+class DatosCompartidos:
+    '''Columnas de un DataFrame guardadas en un segmento de memoria compartida.'''
+
+    def __init__(self, segmento, descripcion, propietario):
+        self.segmento = segmento
+        self.descripcion = descripcion
+        self.propietario = propietario
+        self._diccionarios = {}
+
+    @classmethod
+    def publicar(cls, data):
+        '''Copia las columnas del DataFrame a un segmento nuevo; el proceso que publica es el propietario.'''
+        arreglos = []
+        columnas = []
+        posicion = 0
+        for nombre in data.columns:
+            serie = data[nombre]
+            if serie.dtype.kind in "biufmM":
+                arreglo = np.ascontiguousarray(serie.to_numpy())
+                columna = {"nombre": nombre, "tipo": "numerico", "dtype": str(serie.dtype)}
+                if serie.dtype.kind in "mM":
+                    arreglo = arreglo.view("int64")
+            else:
+                codigos, unicos = pd.factorize(serie.map(_etiquetar), use_na_sentinel=True)
+                arreglo = codigos.astype(_tipo_codigos(len(unicos)))
+                columna = {"nombre": nombre, "tipo": "diccionario", "valores": list(unicos)}
+            posicion = _alinear(posicion)
+            columna.update(posicion=posicion, dtype_arreglo=arreglo.dtype.str, filas=len(arreglo))
+            arreglos.append(arreglo)
+            columnas.append(columna)
+            posicion += arreglo.nbytes
+
+        segmento = shared_memory.SharedMemory(create=True, size=max(posicion, 1))
+        _publicados.add(segmento.name)
+        for arreglo, columna in zip(arreglos, columnas):
+            destino = np.frombuffer(segmento.buf, dtype=arreglo.dtype, count=len(arreglo), offset=columna["posicion"])
+            destino[:] = arreglo
+            del destino
+        descripcion = {"segmento": segmento.name, "filas": len(data), "columnas": columnas}
+        logger.info(f"Datos publicados en memoria compartida '{segmento.name}' ({segmento.size} bytes)")
+        return cls(segmento, descripcion, propietario=True)
+
+    @classmethod
+    def adjuntar(cls, descripcion):
+        '''Se adjunta al segmento publicado por otro proceso.'''
+        return cls(_abrir_segmento(descripcion["segmento"]), descripcion, propietario=False)
+
+    def _columna(self, nombre):
+        for columna in self.descripcion["columnas"]:
+            if columna["nombre"] == nombre:
+                return columna
+        raise KeyError(nombre)
+
+    @property
+    def columnas(self):
+        return [columna["nombre"] for columna in self.descripcion["columnas"]]
+
+    def es_diccionario(self, nombre):
+        '''Indica si la columna está guardada como códigos más valores distintos.'''
+        return self._columna(nombre)["tipo"] == "diccionario"
+
+    def arreglo(self, nombre):
+        '''Arreglo de la columna dentro del segmento: los valores si es numérica o los códigos si es de diccionario.'''
+        columna = self._columna(nombre)
+        # np.frombuffer mantiene tomado el buffer del segmento mientras exista el arreglo, de modo que
+        # cerrar el segmento con columnas en uso falla con BufferError en lugar de dejarlas inválidas
+        arreglo = np.frombuffer(self.segmento.buf, dtype=np.dtype(columna["dtype_arreglo"]), count=columna["filas"],
+                                offset=columna["posicion"])
+        # Ningún proceso debe modificar los datos compartidos
+        arreglo.flags.writeable = False
+        return np.asarray(_Vista(arreglo, self.segmento))
+
+    def diccionario(self, nombre):
+        '''Valores distintos de una columna de diccionario, en el orden de sus códigos.'''
+        if nombre not in self._diccionarios:
+            claves = self._columna(nombre)["valores"]
+            valores = np.empty(len(claves) + 1, dtype=object)
+            valores[:-1] = [_desetiquetar(clave) for clave in claves]
+            # La última posición corresponde al código -1 (celda vacía)
+            valores[-1] = np.nan
+            self._diccionarios[nombre] = valores
+        return self._diccionarios[nombre][:-1]
+
+    def columna(self, nombre):
+        arreglo = self.arreglo(nombre)
+        if not self.es_diccionario(nombre):
+            dtype = np.dtype(self._columna(nombre)["dtype"])
+            if dtype.kind in "mM":
+                arreglo = arreglo.view(dtype)
+            return pd.Series(arreglo, name=nombre, copy=False)
+        self.diccionario(nombre)
+        return pd.Series(self._diccionarios[nombre].take(arreglo), name=nombre, copy=False)
+
+    def a_dataframe(self):
+        '''DataFrame sobre el segmento (las columnas numéricas sin copiar).'''
+        return pd.DataFrame({nombre: self.columna(nombre) for nombre in self.columnas}, copy=False)
+
+    def cerrar(self):
+        '''Cierra el acceso al segmento en este proceso.'''
+        try:
+            self.segmento.close()
+        except BufferError:
+            # Todavía hay columnas usando el segmento: cada columna conserva el SharedMemory (ver _Vista)
+            # y el segmento se cierra cuando deja de existir la última
+            logger.debug(f"El segmento '{self.segmento.name}' sigue en uso en este proceso")
+
+    def liberar(self):
+        '''Cierra el segmento y, si este proceso lo publicó, lo elimina.'''
+        self.cerrar()
+        if self.propietario:
+            try:
+                self.segmento.unlink()
+            except FileNotFoundError:
+                pass
+            logger.info(f"Memoria compartida '{self.segmento.name}' liberada")
@@ -0,0 +1,114 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+'''
+Búsqueda de varios textos a la vez en una columna (autómata de Aho-Corasick).
+
+Con str.contains cada patrón ('Ã³', 'Centro', 'PayPal', ...) recorre la columna completa. BuscadorMultipatron
+reúne todos los patrones en un solo autómata y recorre cada texto una sola vez, marcando todos los
+patrones que aparecen en él. Además, cada valor distinto de la columna se recorre una sola vez y el
+resultado se reparte a las filas que tienen ese valor:
+
+coincidencias = buscar_patrones(data['region'], ['Ã³', 'Ã©', 'Centro', 'Norte'])
+coincidencias['Centro'].sum(), coincidencias.alguno(['Ã³', 'Ã©']).sum()
+
+Agregar un patrón no agrega otra pasada por la columna. Las celdas que no son texto (vacíos,
+números) no coinciden con ningún patrón, igual que str.contains(..., na=False).
+'''
+
+
+class BuscadorMultipatron:
+    '''Autómata que encuentra, en una sola lectura del texto, todos los patrones registrados.'''
+
+    def __init__(self, patrones):
+        self.patrones = list(dict.fromkeys(patrones))
+        if not self.patrones or any(not isinstance(patron, str) or not patron for patron in self.patrones):
+            raise ValueError("Los patrones deben ser textos no vacíos")
+        # Estado 0 = raíz; salidas[estado] es un entero con un bit por patrón encontrado en ese estado
+        self._transiciones = [{}]
+        self._fallos = [0]
+        self._salidas = [0]
+        for posicion, patron in enumerate(self.patrones):
+            estado = 0
+            for caracter in patron:
+                siguiente = self._transiciones[estado].get(caracter)
+                if siguiente is None:
+                    siguiente = len(self._transiciones)
+                    self._transiciones[estado][caracter] = siguiente
+                    self._transiciones.append({})
+                    self._fallos.append(0)
+                    self._salidas.append(0)
+                estado = siguiente
+            self._salidas[estado] |= 1 << posicion
+        self._enlazar_fallos()
+
+    def _enlazar_fallos(self):
+        '''Calcula el estado de respaldo de cada nodo recorriendo el árbol por niveles.'''
+        pendientes = deque(self._transiciones[0].values())
+        while pendientes:
+            estado = pendientes.popleft()
+            for caracter, siguiente in self._transiciones[estado].items():
+                respaldo = self._fallos[estado]
+                while respaldo and caracter not in self._transiciones[respaldo]:
+                    respaldo = self._fallos[respaldo]
+                destino = self._transiciones[respaldo].get(caracter, 0)
+                self._fallos[siguiente] = destino if destino != siguiente else 0
+                self._salidas[siguiente] |= self._salidas[self._fallos[siguiente]]
+                pendientes.append(siguiente)
+
+    def buscar(self, texto):
+        '''Devuelve un entero con un bit encendido por cada patrón que aparece en el texto.'''
+        transiciones, fallos, salidas = self._transiciones, self._fallos, self._salidas
+        estado = 0
+        encontrados = 0
+        for caracter in texto:
+            while estado and caracter not in transiciones[estado]:
+                estado = fallos[estado]
+            estado = transiciones[estado].get(caracter, 0)
+            encontrados |= salidas[estado]
+        return encontrados
+
+    def coincidencias(self, serie):
+        '''Recorre cada valor distinto de la serie una vez y devuelve las máscaras de todos los patrones.'''
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        bits_unicos = [self.buscar(valor) if isinstance(valor, str) else 0 for valor in unicos]
+        mascaras = {}
+        for posicion, patron in enumerate(self.patrones):
+            bit = 1 << posicion
+            # La posición adicional al final corresponde al código -1 (celda vacía)
+            por_valor = np.fromiter((bool(bits & bit) for bits in bits_unicos), dtype=bool, count=len(bits_unicos))
+            mascaras[patron] = np.append(por_valor, False).take(codigos)
+        return Coincidencias(serie.name, mascaras)
+
+
+class Coincidencias:
+    '''Máscaras por patrón (True en las filas cuyo texto contiene el patrón).'''
+
+    def __init__(self, columna, mascaras):
+        self.columna = columna
+        self.mascaras = mascaras
+
+    def __getitem__(self, patron):
+        return self.mascaras[patron]
+
+    def __contains__(self, patron):
+        return patron in self.mascaras
+
+    def alguno(self, patrones):
+        '''Filas que contienen al menos uno de los patrones (como str.contains('|'.join(patrones))).'''
+        patrones = list(patrones)
+        resultado = self.mascaras[patrones[0]].copy()
+        for patron in patrones[1:]:
+            resultado |= self.mascaras[patron]
+        return resultado
+
+    def conteos(self):
+        '''Cantidad de filas que contienen cada patrón.'''
+        return {patron: int(mascara.sum()) for patron, mascara in self.mascaras.items()}
+
+
+def buscar_patrones(serie, patrones):
+    '''Busca todos los patrones en la serie con una sola pasada por valor distinto.'''
+    return BuscadorMultipatron(patrones).coincidencias(serie)
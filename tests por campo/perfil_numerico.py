@@ -0,0 +1,109 @@
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from coercion import NO_CONVERTIBLE, NULO, TEXTO_MONEDA, TEXTO_NUMERICO, convertir_columna
+
+'''
+Perfil de una columna numérica (precio, cantidad_vendida, total_venta) calculado en una sola pasada.
+
+La columna se convierte a número una sola vez (ver coercion.py) y todas las métricas que usan los
+casos de prueba (máximo, mínimo, positivos, negativos, nulos, textos, rangos y prefijos) se obtienen
+con operaciones vectorizadas sobre esa conversión:
+
+perfil = perfilar_columna(data['precio'], rangos=[(100, 200)], prefijos=['$', '-'], contiene=['-'])
+perfil.maximo, perfil.positivos, perfil.en_rango(100, 200), perfil.prefijos['$']
+
+Los perfiles de distintas porciones de la misma columna se pueden unir con combinar().
+'''
+
+
+def _menor(a, b):
+    return b if _vacio(a) else a if _vacio(b) else min(a, b)
+
+
+def _mayor(a, b):
+    return b if _vacio(a) else a if _vacio(b) else max(a, b)
+
+
+def _vacio(valor):
+    return valor is None or (isinstance(valor, float) and math.isnan(valor))
+
+
+def _escalar(valor):
+    '''Convierte un escalar de numpy al tipo de Python equivalente (NaN si no hay valores).'''
+    if pd.isna(valor):
+        return math.nan
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+@dataclass
+class PerfilNumerico:
+    '''Métricas de una columna numérica.'''
+    columna: str
+    filas: int = 0
+    nulos: int = 0
+    numericos: int = 0
+    textos: int = 0
+    textos_no_numericos: int = 0
+    no_numericos: int = 0
+    positivos: int = 0
+    negativos: int = 0
+    minimo: float = math.nan
+    maximo: float = math.nan
+    rangos: dict = field(default_factory=dict)
+    prefijos: dict = field(default_factory=dict)
+    contiene: dict = field(default_factory=dict)
+
+    def en_rango(self, minimo, maximo):
+        '''Cantidad de registros entre minimo y maximo (ambos incluidos).'''
+        return self.rangos[(minimo, maximo)]
+
+    def combinar(self, otro):
+        '''Une el perfil de otra porción de la misma columna.'''
+        for nombre in ("filas", "nulos", "numericos", "textos", "textos_no_numericos", "no_numericos",
+                       "positivos", "negativos"):
+            setattr(self, nombre, getattr(self, nombre) + getattr(otro, nombre))
+        self.minimo = _menor(self.minimo, otro.minimo)
+        self.maximo = _mayor(self.maximo, otro.maximo)
+        for propio, ajeno in ((self.rangos, otro.rangos), (self.prefijos, otro.prefijos), (self.contiene, otro.contiene)):
+            for clave, cantidad in ajeno.items():
+                propio[clave] = propio.get(clave, 0) + cantidad
+        return self
+
+
+def perfilar_columna(serie, rangos=(), prefijos=(), contiene=(), numerica=None):
+    '''
+    Calcula el PerfilNumerico de la serie.
+
+    numerica es la conversión ya calculada de la columna (ver coercion.columna_numerica); si no se
+    indica, la serie se convierte aquí una sola vez.
+    '''
+    if numerica is None:
+        numerica = convertir_columna(serie)
+    valores = numerica.valores
+    perfil = PerfilNumerico(columna=serie.name, filas=len(serie))
+    perfil.nulos = numerica.cantidad(NULO)
+    perfil.numericos = int(numerica.validos.sum())
+    perfil.positivos = int((valores > 0).sum())
+    perfil.negativos = int((valores < 0).sum())
+    if perfil.numericos:
+        perfil.minimo = _escalar(np.nanmin(valores))
+        perfil.maximo = _escalar(np.nanmax(valores))
+    for minimo, maximo in rangos:
+        perfil.rangos[(minimo, maximo)] = int(numerica.entre(minimo, maximo).sum())
+
+    perfil.textos = int(numerica.es_texto.sum())
+    perfil.no_numericos = numerica.cantidad(TEXTO_NUMERICO, TEXTO_MONEDA, NO_CONVERTIBLE)
+    if perfil.textos:
+        perfil.textos_no_numericos = int((~serie[numerica.es_texto].str.isnumeric().astype(bool)).sum())
+
+    if prefijos or contiene:
+        textos = serie.astype(str)
+        for prefijo in prefijos:
+            perfil.prefijos[prefijo] = int(textos.str.startswith(prefijo).sum())
+        for fragmento in contiene:
+            perfil.contiene[fragmento] = int(textos.str.contains(fragmento, regex=False).sum())
+    return perfil
@@ -0,0 +1,182 @@
+import csv
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from dataset_ventas import COLUMNAS_VENTAS
+
+'''
+Medición del costo de cada caso de prueba.
+
+Los reportes HTML de cada campo solo muestran si un caso pasó o falló. Con --medir, MedidorPruebas
+registra para cada caso el tiempo de reloj y el tiempo de CPU de cada fase por separado (y, con
+--medir-memoria, el pico de memoria de Python medido con tracemalloc):
+
+- setup: preparación de las fixtures (la carga de los datos aparece en el primer caso que la usa).
+- call: el cuerpo del caso.
+- teardown: cierre de las fixtures.
+
+Cada medición se etiqueta con el módulo y la columna (test_precio.py -> precio; en los archivos de
+reglas, la columna de la regla). Al terminar la sesión se escribe el resumen en JSON o CSV (según la
+extensión de --medir-salida) y se muestra la tabla de los --medir-top casos más lentos:
+
+pytest --medir --medir-salida=mediciones.json --medir-top=15
+pytest --medir --medir-memoria
+
+tracemalloc registra cada asignación de memoria y hace varias veces más lentos los casos, así que los
+tiempos medidos con --medir-memoria incluyen ese costo: para comparar tiempos conviene una ejecución
+sin --medir-memoria, como en benchmark_validaciones.medir.
+
+Con pytest-xdist cada worker mide sus casos y las mediciones viajan al proceso principal dentro de los
+reportes, que es el que escribe el resumen.
+'''
+
+FASES = ("setup", "call", "teardown")
+TOP = 10
+
+# Mediciones de las fases del caso que se está ejecutando
+_mediciones = pytest.StashKey()
+
+
+def columna_de(item):
+    '''Columna de ventas a la que corresponde el caso, o None si no se puede determinar.'''
+    regla = getattr(item, "regla", None)
+    if regla is not None:
+        return regla.columna
+    nombre = item.path.stem
+    if nombre.startswith("test_"):
+        nombre = nombre[len("test_"):]
+    return nombre if nombre in COLUMNAS_VENTAS else None
+
+
+class MedidorPruebas:
+    '''Plugin de pytest que mide cada fase de cada caso.'''
+
+    def __init__(self, salida=None, top=TOP, memoria=False):
+        self.salida = Path(salida) if salida else None
+        self.top = top
+        self.memoria = memoria
+        self.pruebas = {}
+        self._iniciado_tracemalloc = False
+
+    # Proceso que ejecuta los casos (el único proceso sin xdist, o cada worker)
+
+    def pytest_sessionstart(self, session):
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciado_tracemalloc = True
+
+    def _medir(self, item, fase):
+        if self.memoria:
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        yield
+        medicion = {"segundos": time.perf_counter() - inicio, "cpu_segundos": time.process_time() - inicio_cpu}
+        if self.memoria:
+            medicion["memoria_pico_mb"] = max(tracemalloc.get_traced_memory()[1] - memoria_inicial, 0) / 2**20
+        item.stash.setdefault(_mediciones, {})[fase] = medicion
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._medir(item, "setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._medir(item, "call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._medir(item, "teardown")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        resultado = yield
+        medicion = item.stash.get(_mediciones, {}).get(call.when)
+        if medicion is not None:
+            reporte = resultado.get_result()
+            # Atributo simple del reporte: pytest-xdist lo serializa junto con el resto del reporte
+            reporte.medicion = dict(medicion, modulo=item.path.name, columna=columna_de(item))
+
+    # Proceso que reúne los reportes (el único proceso sin xdist, o el principal)
+
+    def pytest_runtest_logreport(self, report):
+        medicion = getattr(report, "medicion", None)
+        if not medicion:
+            return
+        prueba = self.pruebas.setdefault(report.nodeid, {
+            "prueba": report.nodeid, "modulo": medicion["modulo"], "columna": medicion["columna"], "resultado": None,
+        })
+        prueba[report.when] = {clave: valor for clave, valor in medicion.items() if clave not in ("modulo", "columna")}
+        # Un error en setup o teardown define el resultado aunque el cuerpo haya pasado
+        if report.outcome != "passed" and prueba["resultado"] in (None, "passed"):
+            prueba["resultado"] = report.outcome
+        elif report.when == "call" and prueba["resultado"] is None:
+            prueba["resultado"] = "passed"
+
+    def _total(self, prueba, clave="segundos"):
+        return sum(prueba.get(fase, {}).get(clave, 0.0) for fase in FASES)
+
+    def resumen_por_columna(self):
+        '''
+        Totales por columna (los casos sin columna quedan en "otros").
+
+        memoria_pico_mb solo aparece si se midió la memoria de algún caso de la columna (--medir-memoria).
+        '''
+        columnas = {}
+        for prueba in self.pruebas.values():
+            total = columnas.setdefault(prueba["columna"] or "otros", {"pruebas": 0, "segundos": 0.0, "setup_segundos": 0.0,
+                                                                      "call_segundos": 0.0})
+            total["pruebas"] += 1
+            total["segundos"] += self._total(prueba)
+            total["setup_segundos"] += prueba.get("setup", {}).get("segundos", 0.0)
+            total["call_segundos"] += prueba.get("call", {}).get("segundos", 0.0)
+            picos = [prueba[fase]["memoria_pico_mb"] for fase in FASES if "memoria_pico_mb" in prueba.get(fase, {})]
+            if picos:
+                total["memoria_pico_mb"] = max(total.get("memoria_pico_mb", 0.0), *picos)
+        return columnas
+
+    def mas_lentas(self, cantidad=None):
+        return sorted(self.pruebas.values(), key=self._total, reverse=True)[:cantidad or self.top]
+
+    def escribir(self, salida):
+        salida = Path(salida)
+        if salida.suffix.lower() == ".csv":
+            with open(salida, "w", newline="", encoding="utf-8") as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(["prueba", "modulo", "columna", "resultado", "fase", "segundos", "cpu_segundos", "memoria_pico_mb"])
+                for prueba in self.pruebas.values():
+                    for fase in FASES:
+                        if fase in prueba:
+                            medicion = prueba[fase]
+                            escritor.writerow([prueba["prueba"], prueba["modulo"], prueba["columna"] or "", prueba["resultado"], fase,
+                                               f"{medicion['segundos']:.6f}", f"{medicion['cpu_segundos']:.6f}",
+                                               f"{medicion['memoria_pico_mb']:.3f}" if "memoria_pico_mb" in medicion else ""])
+        else:
+            contenido = {"pruebas": list(self.pruebas.values()), "por_columna": self.resumen_por_columna()}
+            salida.write_text(json.dumps(contenido, ensure_ascii=False, indent=2), encoding="utf-8")
+        return salida
+
+    def pytest_sessionfinish(self, session):
+        if self._iniciado_tracemalloc:
+            tracemalloc.stop()
+        # En pytest-xdist los workers no escriben: el proceso principal recibe todas las mediciones
+        if self.salida is not None and self.pruebas and not hasattr(session.config, "workerinput"):
+            self.escribir(self.salida)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.pruebas:
+            return
+        terminalreporter.write_sep("=", f"{min(self.top, len(self.pruebas))} casos más lentos")
+        terminalreporter.write_line(f"{'total s':>9} {'setup s':>9} {'call s':>9} {'pico MB':>9}  {'columna':<16} prueba")
+        for prueba in self.mas_lentas():
+            picos = [prueba[fase]["memoria_pico_mb"] for fase in FASES if "memoria_pico_mb" in prueba.get(fase, {})]
+            pico = f"{max(picos):9.2f}" if picos else f"{'-':>9}"
+            terminalreporter.write_line(
+                f"{self._total(prueba):9.3f} {prueba.get('setup', {}).get('segundos', 0.0):9.3f} "
+                f"{prueba.get('call', {}).get('segundos', 0.0):9.3f} {pico}  {prueba['columna'] or '-':<16} {prueba['prueba']}")
+        if self.salida is not None:
+            terminalreporter.write_line(f"Mediciones guardadas en {self.salida}")
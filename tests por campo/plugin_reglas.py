@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+from reglas import cargar_reglas, evaluar_reglas
+
+'''
+Recolección de archivos de reglas (reglas_*.json) como casos de prueba de pytest.
+
+Cada regla del archivo aparece como un caso propio (reglas_ventas.json::precio_positivos), pero
+todas las reglas del archivo se evalúan juntas la primera vez que se ejecuta una de ellas, con una
+sola pasada por columna (ver reglas.evaluar_reglas):
+
+pytest reglas_ventas.json -v --log-cli-level=INFO
+pytest reglas_ventas.json -k precio
+'''
+
+logger = logging.getLogger(__name__)
+
+
+class ReglaFallida(AssertionError):
+    '''El resultado de la regla no coincide con el esperado.'''
+
+
+class ArchivoReglas(pytest.File):
+    '''Archivo de reglas; cargar_datos(config) devuelve el DataFrame sobre el que se evalúan.'''
+
+    def __init__(self, *, cargar_datos, **kwargs):
+        super().__init__(**kwargs)
+        self.cargar_datos = cargar_datos
+        self.reglas = []
+        self._resultados = None
+
+    def collect(self):
+        self.reglas = cargar_reglas(self.path)
+        for regla in self.reglas:
+            yield ItemRegla.from_parent(self, name=regla.id, regla=regla)
+
+    def resultados(self):
+        '''Evalúa todas las reglas del archivo una sola vez y guarda los resultados.'''
+        if self._resultados is None:
+            self._resultados = evaluar_reglas(self.cargar_datos(self.config), self.reglas)
+        return self._resultados
+
+
+class ItemRegla(pytest.Item):
+    '''Caso de prueba de una regla.'''
+
+    def __init__(self, *, regla, **kwargs):
+        super().__init__(**kwargs)
+        self.regla = regla
+
+    def runtest(self):
+        resultado = self.parent.resultados()[self.regla.id]
+        if resultado.error is not None:
+            raise resultado.error
+        logger.info(f"{self.regla.descripcion or self.regla.id}: {resultado.resultado}")
+        if not resultado.correcto:
+            raise ReglaFallida(resultado)
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, ReglaFallida):
+            resultado = excinfo.value.args[0]
+            return (f"Regla '{self.regla.id}' ({self.regla.columna}, {self.regla.predicado}): "
+                    f"Se esperaba {self.regla.esperado}, pero se encontró {resultado.resultado}.")
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"regla {self.regla.id}"
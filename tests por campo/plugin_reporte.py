@@ -0,0 +1,173 @@
+import argparse
+import datetime
+import html
+import json
+from pathlib import Path
+
+import pytest
+
+from plugin_mediciones import columna_de
+
+'''
+Reporte único de una ejecución con todas las columnas, escrito a medida que terminan los casos.
+
+Cada campo tenía su propio reporte HTML autocontenido (report_campo_precio.html, report_region.html,
+...), generado con una ejecución de pytest por archivo. Con --reporte una sola ejecución valida todas
+las columnas y escribe un archivo JSONL, que es la fuente del reporte:
+
+{"tipo": "sesion", "inicio": "..."}
+{"tipo": "caso", "prueba": "test_precio.py::test_max_value_in_price", "modulo": "test_precio.py",
+ "columna": "precio", "resultado": "passed", "segundos": 0.001, "mensaje": null}
+...
+{"tipo": "fin", "fin": "...", "totales": {"passed": 380, "failed": 81, ...}}
+
+Cada línea se escribe y se vacía al disco cuando termina el caso, de modo que el reporte no crece en
+memoria y una ejecución interrumpida conserva los casos ya terminados. Al final se genera un resumen
+HTML liviano (por columna y la lista de fallas) leyendo el JSONL línea por línea:
+
+pytest --reporte=reporte_ventas.jsonl          # también escribe reporte_ventas.html
+python plugin_reporte.py reporte_ventas.jsonl reporte_ventas.html
+'''
+
+# Longitud máxima del mensaje de error guardado por caso
+LONGITUD_MENSAJE = 500
+
+
+def _mensaje(reporte):
+    '''Primera línea útil del error del caso (sin el traceback completo).'''
+    if reporte.passed or reporte.longrepr is None:
+        return None
+    if reporte.skipped and isinstance(reporte.longrepr, tuple):
+        return str(reporte.longrepr[2])[:LONGITUD_MENSAJE]
+    crash = getattr(reporte.longrepr, "reprcrash", None)
+    mensaje = crash.message if crash is not None else str(reporte.longrepr)
+    return mensaje[:LONGITUD_MENSAJE]
+
+
+class ReporteIncremental:
+    '''Plugin de pytest que escribe una línea JSON por caso terminado.'''
+
+    def __init__(self, ruta, ruta_html=None):
+        self.ruta = Path(ruta)
+        self.ruta_html = Path(ruta_html) if ruta_html else self.ruta.with_suffix(".html")
+        self.totales = {}
+        self._pendientes = {}
+        self._archivo = None
+
+    def _escribir(self, registro):
+        self._archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._archivo.flush()
+
+    def pytest_sessionstart(self, session):
+        # En pytest-xdist solo el proceso principal escribe el reporte
+        if hasattr(session.config, "workerinput"):
+            return
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._archivo = open(self.ruta, "w", encoding="utf-8")
+        self._escribir({"tipo": "sesion", "inicio": datetime.datetime.now().isoformat(timespec="seconds")})
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        resultado = yield
+        resultado.get_result().columna = columna_de(item)
+
+    def pytest_collectreport(self, report):
+        if self._archivo is not None and report.failed:
+            self._escribir({"tipo": "error_recoleccion", "modulo": report.nodeid, "mensaje": _mensaje(report)})
+            self.totales["error"] = self.totales.get("error", 0) + 1
+
+    def pytest_runtest_logreport(self, report):
+        if self._archivo is None:
+            return
+        caso = self._pendientes.setdefault(report.nodeid, {
+            "tipo": "caso", "prueba": report.nodeid, "modulo": report.nodeid.split("::")[0],
+            "columna": getattr(report, "columna", None), "resultado": None, "segundos": 0.0, "mensaje": None,
+        })
+        caso["segundos"] += report.duration
+        if report.when == "call" or not report.passed:
+            # Un error en setup o teardown (fuera de un skip) se informa como error del caso
+            resultado = report.outcome if report.when == "call" or report.skipped else "error"
+            if caso["resultado"] in (None, "passed"):
+                caso["resultado"] = resultado
+                caso["mensaje"] = _mensaje(report)
+        if report.when == "teardown":
+            del self._pendientes[report.nodeid]
+            caso["resultado"] = caso["resultado"] or "passed"
+            caso["segundos"] = round(caso["segundos"], 6)
+            self.totales[caso["resultado"]] = self.totales.get(caso["resultado"], 0) + 1
+            self._escribir(caso)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self._archivo is None:
+            return
+        self._escribir({"tipo": "fin", "fin": datetime.datetime.now().isoformat(timespec="seconds"),
+                        "totales": self.totales, "estado_salida": int(exitstatus)})
+        self._archivo.close()
+        self._archivo = None
+        renderizar_html(self.ruta, self.ruta_html)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.totales:
+            terminalreporter.write_line(f"Reporte: {self.ruta} ({self.ruta_html})")
+
+
+def leer_reporte(ruta):
+    '''Recorre los registros del reporte JSONL sin cargarlo completo.'''
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def resumir_reporte(ruta):
+    '''Totales por columna y resultado, y datos de la sesión.'''
+    columnas = {}
+    sesion = {}
+    for registro in leer_reporte(ruta):
+        if registro["tipo"] == "caso":
+            totales = columnas.setdefault(registro["columna"] or "otros", {})
+            totales[registro["resultado"]] = totales.get(registro["resultado"], 0) + 1
+            totales["segundos"] = totales.get("segundos", 0.0) + registro["segundos"]
+        elif registro["tipo"] in ("sesion", "fin"):
+            sesion.update({clave: valor for clave, valor in registro.items() if clave != "tipo"})
+    return columnas, sesion
+
+
+def renderizar_html(ruta, destino):
+    '''Escribe el resumen HTML del reporte: una tabla por columna y la lista de fallas.'''
+    columnas, sesion = resumir_reporte(ruta)
+    resultados = ["passed", "failed", "error", "skipped"]
+    with open(destino, "w", encoding="utf-8") as salida:
+        salida.write("<!DOCTYPE html>\n<html lang=\"es\"><head><meta charset=\"utf-8\"><title>Reporte de ventas</title>\n"
+                     "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+                     "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left}.failed,.error{color:#b00}"
+                     ".passed{color:#070}</style></head><body>\n")
+        salida.write(f"<h1>Reporte de ventas</h1>\n<p>Inicio: {html.escape(str(sesion.get('inicio', '-')))} &middot; "
+                     f"Fin: {html.escape(str(sesion.get('fin', '-')))}</p>\n")
+        salida.write("<table><tr><th>Columna</th>" + "".join(f"<th>{r}</th>" for r in resultados) + "<th>segundos</th></tr>\n")
+        for columna, totales in sorted(columnas.items()):
+            salida.write(f"<tr><td>{html.escape(columna)}</td>"
+                         + "".join(f"<td class=\"{r}\">{totales.get(r, 0)}</td>" for r in resultados)
+                         + f"<td>{totales.get('segundos', 0.0):.3f}</td></tr>\n")
+        salida.write("</table>\n<h2>Fallas</h2>\n<table><tr><th>Columna</th><th>Caso</th><th>Mensaje</th></tr>\n")
+        for registro in leer_reporte(ruta):
+            if registro["tipo"] == "caso" and registro["resultado"] in ("failed", "error"):
+                salida.write(f"<tr class=\"{registro['resultado']}\"><td>{html.escape(registro['columna'] or 'otros')}</td>"
+                             f"<td>{html.escape(registro['prueba'])}</td><td>{html.escape(registro['mensaje'] or '')}</td></tr>\n")
+            elif registro["tipo"] == "error_recoleccion":
+                salida.write(f"<tr class=\"error\"><td>-</td><td>{html.escape(registro['modulo'])}</td>"
+                             f"<td>{html.escape(registro['mensaje'] or '')}</td></tr>\n")
+        salida.write("</table>\n</body></html>\n")
+    return Path(destino)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera el resumen HTML de un reporte JSONL.")
+    parser.add_argument("reporte")
+    parser.add_argument("html", nargs="?", default=None)
+    opciones = parser.parse_args(argumentos)
+    renderizar_html(opciones.reporte, opciones.html or Path(opciones.reporte).with_suffix(".html"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from coercion import NULO, columna_numerica
+
+'''
+Reglas declarativas de validación por columna.
+
+Un archivo de reglas (reglas_*.json) describe, para cada caso, la columna, el predicado y el valor
+esperado:
+
+{"id": "precio_positivos", "columna": "precio", "predicado": "positivos", "esperado": 5368}
+{"id": "region_centro", "columna": "region", "predicado": "contiene", "argumentos": ["Centro"], "esperado": 1172}
+
+evaluar_reglas agrupa las reglas por columna y recorre cada columna una sola vez: la conversión a
+número se comparte (ver coercion.py) y los predicados de texto se evalúan sobre los valores distintos
+de la columna, sumando cuántas veces aparece cada uno.
+'''
+
+
+@dataclass(frozen=True)
+class Regla:
+    '''Caso de validación: predicado aplicado a una columna y resultado esperado.'''
+    id: str
+    columna: str
+    predicado: str
+    esperado: object
+    argumentos: tuple = ()
+    descripcion: str = ""
+
+    @classmethod
+    def desde_dict(cls, datos):
+        faltantes = {"id", "columna", "predicado", "esperado"} - set(datos)
+        if faltantes:
+            raise ValueError(f"Regla incompleta {datos.get('id', datos)}: faltan {sorted(faltantes)}")
+        if datos["predicado"] not in PREDICADOS:
+            raise ValueError(f"Regla {datos['id']}: predicado desconocido '{datos['predicado']}'")
+        argumentos = tuple(tuple(a) if isinstance(a, list) else a for a in datos.get("argumentos", ()))
+        return cls(id=datos["id"], columna=datos["columna"], predicado=datos["predicado"], esperado=datos["esperado"],
+                   argumentos=argumentos, descripcion=datos.get("descripcion", ""))
+
+    def cumple(self, resultado):
+        '''Compara el resultado con el esperado (los decimales con tolerancia de redondeo).'''
+        if isinstance(self.esperado, float) or isinstance(resultado, float):
+            return resultado is not None and math.isclose(resultado, self.esperado, rel_tol=1e-9, abs_tol=1e-9)
+        return resultado == self.esperado
+
+
+def cargar_reglas(ruta):
+    '''Lee un archivo de reglas y devuelve la lista de Regla.'''
+    with open(ruta, encoding="utf-8") as entrada:
+        contenido = json.load(entrada)
+    reglas = [Regla.desde_dict(datos) for datos in contenido["reglas"]]
+    repetidos = {regla.id for regla in reglas if sum(otra.id == regla.id for otra in reglas) > 1}
+    if repetidos:
+        raise ValueError(f"{Path(ruta).name}: identificadores de regla repetidos {sorted(repetidos)}")
+    return reglas
+
+
+class _Columna:
+    '''Datos intermedios de una columna, calculados una sola vez y compartidos por todas sus reglas.'''
+
+    def __init__(self, data, nombre):
+        self.data = data
+        self.nombre = nombre
+        self.serie = data[nombre]
+        self._conteos = None
+
+    @property
+    def numerica(self):
+        return columna_numerica(self.data, self.nombre)
+
+    @property
+    def conteos(self):
+        '''Cantidad de registros por valor distinto (incluye los vacíos).'''
+        if self._conteos is None:
+            self._conteos = self.serie.value_counts(dropna=False)
+        return self._conteos
+
+    def contar_textos(self, condicion):
+        '''Suma los registros cuyos valores de texto cumplen la condición, evaluándola una vez por valor distinto.'''
+        conteos = self.conteos
+        cumple = np.fromiter((isinstance(valor, str) and bool(condicion(valor)) for valor in conteos.index),
+                             dtype=bool, count=len(conteos))
+        return int(conteos.to_numpy()[cumple].sum())
+
+
+def _extremo(valores, funcion):
+    if np.isnan(valores).all():
+        return None
+    resultado = funcion(valores)
+    return resultado.item() if hasattr(resultado, "item") else resultado
+
+
+def _contiene(columna, fragmento, mayusculas=True):
+    if mayusculas:
+        return columna.contar_textos(lambda valor: fragmento in valor)
+    fragmento = fragmento.lower()
+    return columna.contar_textos(lambda valor: fragmento in valor.lower())
+
+
+PREDICADOS = {
+    # Numéricos, sobre la conversión compartida de la columna
+    "maximo": lambda c: _extremo(c.numerica.valores, np.nanmax),
+    "minimo": lambda c: _extremo(c.numerica.valores, np.nanmin),
+    "positivos": lambda c: int((c.numerica.valores > 0).sum()),
+    "negativos": lambda c: int((c.numerica.valores < 0).sum()),
+    "entre": lambda c, minimo, maximo: int(c.numerica.entre(minimo, maximo).sum()),
+    # Generales
+    "filas": lambda c: len(c.serie),
+    "nulos": lambda c: c.numerica.cantidad(NULO),
+    "textos": lambda c: c.contar_textos(lambda valor: True),
+    "unicos": lambda c: int(c.conteos.index.notna().sum()),
+    "duplicados": lambda c: int(c.conteos[c.conteos > 1].sum()),
+    "repeticiones": lambda c, veces: int((c.conteos[c.conteos.index.notna()] == veces).sum()),
+    "fuera_de": lambda c, valores: int(c.conteos[~c.conteos.index.isin(list(valores))].sum()),
+    # De texto, evaluados una vez por valor distinto
+    "igual": lambda c, valor: c.contar_textos(lambda texto: texto == valor),
+    "igual_sin_espacios": lambda c, valor: c.contar_textos(lambda texto: texto.strip() == valor),
+    "contiene": _contiene,
+    "contiene_alguno": lambda c, fragmentos: c.contar_textos(lambda texto: any(f in texto for f in fragmentos)),
+    "empieza_con": lambda c, prefijo: c.contar_textos(lambda texto: texto.startswith(prefijo)),
+    "coincide": lambda c, patron: c.contar_textos(re.compile(patron).fullmatch),
+    "numericos_como_texto": lambda c: c.contar_textos(str.isnumeric),
+}
+
+
+@dataclass
+class ResultadoRegla:
+    regla: Regla
+    resultado: object = None
+    error: Exception = None
+
+    @property
+    def correcto(self):
+        return self.error is None and self.regla.cumple(self.resultado)
+
+
+@dataclass
+class ResultadosReglas:
+    '''Resultados de evaluar un conjunto de reglas, indexados por id de regla.'''
+    por_id: dict = field(default_factory=dict)
+
+    def __getitem__(self, id_regla):
+        return self.por_id[id_regla]
+
+    def __iter__(self):
+        return iter(self.por_id.values())
+
+    @property
+    def fallidas(self):
+        return [resultado for resultado in self if not resultado.correcto]
+
+
+def evaluar_reglas(data, reglas):
+    '''Evalúa todas las reglas, agrupadas por columna para recorrer cada columna una sola vez.'''
+    por_columna = {}
+    for regla in reglas:
+        por_columna.setdefault(regla.columna, []).append(regla)
+    resultados = ResultadosReglas()
+    for nombre, reglas_columna in por_columna.items():
+        columna = _Columna(data, nombre) if nombre in data.columns else None
+        for regla in reglas_columna:
+            if columna is None:
+                resultados.por_id[regla.id] = ResultadoRegla(regla, error=KeyError(f"No existe la columna '{nombre}'"))
+                continue
+            try:
+                resultado = PREDICADOS[regla.predicado](columna, *regla.argumentos)
+                resultados.por_id[regla.id] = ResultadoRegla(regla, resultado=resultado)
+            except Exception as error:
+                resultados.por_id[regla.id] = ResultadoRegla(regla, error=error)
+    # Mantener el orden del archivo de reglas
+    resultados.por_id = {regla.id: resultados.por_id[regla.id] for regla in reglas}
+    return resultados
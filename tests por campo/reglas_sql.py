@@ -0,0 +1,235 @@
+import re
+
+from reglas import ResultadoRegla, ResultadosReglas
+
+'''
+Evaluación de las reglas declarativas (ver reglas.py) directamente en la base de datos.
+
+Consultar un COUNT(*) por regla, como contar_fechas_validas en connect_test_bd.py, recorre la tabla
+una vez por regla. compilar_reglas convierte todas las reglas en una sola consulta de agregados, de
+modo que la base de datos calcula todos los resultados recorriendo la tabla una sola vez:
+
+SELECT SUM(CASE WHEN `precio` ... > 0 THEN 1 ELSE 0 END) AS r0,
+       SUM(CASE WHEN `region` IS NULL THEN 1 ELSE 0 END) AS r1, ...
+FROM `ventas`
+
+resultados = evaluar_reglas_sql(conexion, cargar_reglas("reglas_ventas.json"), tabla="ventas",
+                                dialecto=DialectoMySQL())
+
+Las reglas que necesitan agrupar (duplicados, repeticiones) o distinguir el tipo de la celda (textos)
+no se pueden expresar en esa consulta; quedan en el resultado con un error ReglaNoCompilable.
+'''
+
+# Texto que pd.to_numeric acepta como número (sin separadores de miles ni símbolos)
+PATRON_NUMERO = r'^ *[-+]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][-+]?[0-9]+)? *$'
+
+
+class ReglaNoCompilable(ValueError):
+    '''La regla no se puede expresar como un agregado de una sola consulta.'''
+
+
+class DialectoSQL:
+    '''Diferencias de sintaxis entre motores; los valores siempre van como parámetros de la consulta.'''
+    marcador = "?"
+
+    def citar(self, nombre):
+        return '"' + nombre.replace('"', '""') + '"'
+
+    def regexp(self, expresion, marcador):
+        return f"{expresion} REGEXP {marcador}"
+
+    def texto(self, expresion):
+        '''Expresión como texto, distinguiendo mayúsculas y minúsculas en las comparaciones.'''
+        return f"CAST({expresion} AS TEXT)"
+
+    def contiene(self, expresion, marcador):
+        return f"INSTR({self.texto(expresion)}, {marcador}) > 0"
+
+    def empieza_con(self, expresion, marcador, longitud):
+        return f"SUBSTR({self.texto(expresion)}, 1, {longitud}) = {marcador}"
+
+    def numero(self, expresion):
+        '''Valor numérico de la celda, NULL si el texto no representa un número (como pd.to_numeric con coerce).'''
+        return f"CASE WHEN {self.regexp(self.texto(expresion), self.marcador)} THEN CAST({expresion} AS REAL) END"
+
+    def cursor_streaming(self, conexion):
+        '''Cursor que trae las filas del servidor a medida que se piden (sqlite3 ya funciona así).'''
+        return conexion.cursor()
+
+    def descartar_pendientes(self, conexion):
+        '''Descarta las filas que quedaron sin leer de una consulta interrumpida.'''
+
+
+class DialectoSQLite(DialectoSQL):
+    '''SQLite; REGEXP debe registrarse en la conexión con registrar_regexp.'''
+
+
+class DialectoMySQL(DialectoSQL):
+    '''MySQL / MariaDB (mysql.connector).'''
+    marcador = "%s"
+
+    def citar(self, nombre):
+        return "`" + nombre.replace("`", "``") + "`"
+
+    def texto(self, expresion):
+        # BINARY evita que la intercalación de la columna ignore mayúsculas y tildes
+        return f"BINARY {expresion}"
+
+    def contiene(self, expresion, marcador):
+        return f"INSTR({self.texto(expresion)}, BINARY {marcador}) > 0"
+
+    def empieza_con(self, expresion, marcador, longitud):
+        # LEFT cuenta caracteres sobre la columna original; la comparación se hace en binario
+        return f"BINARY LEFT({expresion}, {longitud}) = BINARY {marcador}"
+
+    def numero(self, expresion):
+        return f"CASE WHEN {expresion} REGEXP {self.marcador} THEN CAST({expresion} AS DOUBLE) END"
+
+    def cursor_streaming(self, conexion):
+        # Sin buffer, mysql.connector no descarga el resultado completo al ejecutar la consulta
+        return conexion.cursor(buffered=False)
+
+    def descartar_pendientes(self, conexion):
+        # Con un resultado sin leer, la conexión no acepta otra consulta
+        if conexion.unread_result:
+            conexion.consume_results()
+
+
+def registrar_regexp(conexion):
+    '''Registra en una conexión sqlite3 la función REGEXP que usa la consulta compilada.'''
+    patrones = {}
+
+    def regexp(patron, valor):
+        if valor is None:
+            return None
+        if patron not in patrones:
+            patrones[patron] = re.compile(patron)
+        return patrones[patron].search(str(valor)) is not None
+
+    conexion.create_function("REGEXP", 2, regexp, deterministic=True)
+    return conexion
+
+
+class _Compilador:
+    '''Arma la lista de agregados y sus parámetros, en el orden en que aparecen en la consulta.'''
+
+    def __init__(self, dialecto):
+        self.dialecto = dialecto
+        self.parametros = []
+
+    def valor(self, valor):
+        self.parametros.append(valor)
+        return self.dialecto.marcador
+
+    def numero(self, columna):
+        expresion = self.dialecto.numero(columna)
+        self.parametros.append(PATRON_NUMERO)
+        return expresion
+
+    def contar(self, condicion):
+        return f"SUM(CASE WHEN {condicion} THEN 1 ELSE 0 END)"
+
+    def agregado(self, regla):
+        d = self.dialecto
+        columna = d.citar(regla.columna)
+        argumentos = regla.argumentos
+        predicado = regla.predicado
+        if predicado == "filas":
+            return "COUNT(*)"
+        if predicado == "nulos":
+            return self.contar(f"{columna} IS NULL")
+        if predicado == "unicos":
+            return f"COUNT(DISTINCT {columna})"
+        if predicado == "maximo":
+            return f"MAX({self.numero(columna)})"
+        if predicado == "minimo":
+            return f"MIN({self.numero(columna)})"
+        if predicado == "positivos":
+            return self.contar(f"{self.numero(columna)} > 0")
+        if predicado == "negativos":
+            return self.contar(f"{self.numero(columna)} < 0")
+        if predicado == "entre":
+            numero = self.numero(columna)
+            return self.contar(f"{numero} BETWEEN {self.valor(argumentos[0])} AND {self.valor(argumentos[1])}")
+        if predicado == "fuera_de":
+            marcadores = ", ".join(self.valor(valor) for valor in argumentos[0])
+            return self.contar(f"({columna} IS NULL OR {columna} NOT IN ({marcadores}))")
+        if predicado == "igual":
+            return self.contar(f"{d.texto(columna)} = {self.valor(argumentos[0])}")
+        if predicado == "igual_sin_espacios":
+            return self.contar(f"TRIM({d.texto(columna)}) = {self.valor(argumentos[0])}")
+        if predicado == "contiene":
+            fragmento, mayusculas = (tuple(argumentos) + (True,))[:2]
+            if mayusculas:
+                return self.contar(d.contiene(columna, self.valor(fragmento)))
+            return self.contar(f"INSTR(LOWER({columna}), {self.valor(fragmento.lower())}) > 0")
+        if predicado == "contiene_alguno":
+            condiciones = " OR ".join(d.contiene(columna, self.valor(fragmento)) for fragmento in argumentos[0])
+            return self.contar(f"({condiciones})")
+        if predicado == "empieza_con":
+            prefijo = argumentos[0]
+            return self.contar(d.empieza_con(columna, self.valor(prefijo), int(len(prefijo))))
+        if predicado == "coincide":
+            return self.contar(d.regexp(d.texto(columna), self.valor(f"^(?:{argumentos[0]})$")))
+        if predicado == "numericos_como_texto":
+            return self.contar(d.regexp(d.texto(columna), self.valor(r'^[0-9]+$')))
+        raise ReglaNoCompilable(f"Regla {regla.id}: el predicado '{predicado}' no se puede evaluar en una sola consulta")
+
+
+def compilar_reglas(reglas, tabla="ventas", dialecto=None):
+    '''
+    Compila las reglas en una sola consulta SELECT de agregados.
+
+    Devuelve (consulta, parametros, compiladas, no_compilables), donde compiladas son las reglas en el
+    orden de las columnas del resultado y no_compilables asocia cada regla restante con su error.
+    '''
+    dialecto = dialecto or DialectoSQLite()
+    compilador = _Compilador(dialecto)
+    agregados = []
+    compiladas = []
+    no_compilables = {}
+    for regla in reglas:
+        cantidad_parametros = len(compilador.parametros)
+        try:
+            agregado = compilador.agregado(regla)
+        except ReglaNoCompilable as error:
+            del compilador.parametros[cantidad_parametros:]
+            no_compilables[regla.id] = error
+            continue
+        agregados.append(f"{agregado} AS r{len(compiladas)}")
+        compiladas.append(regla)
+    if not agregados:
+        return None, [], compiladas, no_compilables
+    consulta = "SELECT " + ",\n       ".join(agregados) + f"\nFROM {dialecto.citar(tabla)}"
+    return consulta, compilador.parametros, compiladas, no_compilables
+
+
+def _normalizar(valor):
+    '''Convierte los resultados del conector (Decimal, float entero) al tipo que usan las reglas.'''
+    if valor is None:
+        return None
+    if isinstance(valor, float):
+        return valor
+    try:
+        entero = int(valor)
+    except (TypeError, ValueError):
+        return valor
+    return entero if entero == valor else float(valor)
+
+
+def evaluar_reglas_sql(conexion, reglas, tabla="ventas", dialecto=None):
+    '''Evalúa las reglas con una sola consulta sobre la tabla y devuelve ResultadosReglas.'''
+    consulta, parametros, compiladas, no_compilables = compilar_reglas(reglas, tabla=tabla, dialecto=dialecto)
+    fila = ()
+    if consulta is not None:
+        cursor = conexion.cursor()
+        try:
+            cursor.execute(consulta, tuple(parametros))
+            fila = cursor.fetchone()
+        finally:
+            cursor.close()
+    por_regla = {regla.id: ResultadoRegla(regla, resultado=_normalizar(valor)) for regla, valor in zip(compiladas, fila)}
+    resultados = ResultadosReglas()
+    for regla in reglas:
+        resultados.por_id[regla.id] = por_regla.get(regla.id) or ResultadoRegla(regla, error=no_compilables[regla.id])
+    return resultados
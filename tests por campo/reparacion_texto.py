@@ -0,0 +1,113 @@
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+from cache_datos import en_cache
+from columna_diccionario import ColumnaDiccionario, codificar_columna, columna_diccionario
+
+'''
+Reparación de textos con doble codificación (UTF-8 leído como latin-1 / cp1252).
+
+Varios valores llegan como 'ComputaciÃ³n', 'FotografÃ­a' o 'Tarjeta de CrÃ©dito': el texto se guardó
+en UTF-8 y se volvió a leer como cp1252. Los casos de prueba cuentan estos defectos buscando 'Ã³' en
+cada registro. reparar_columna revisa cada valor distinto una sola vez (la traducción queda en caché) y
+entrega, sobre los mismos códigos de la columna:
+
+reparada = reparar_columna(data, 'categoria')
+reparada.original        # columna tal como llegó
+reparada.reparada        # 'Computación', 'Fotografía', ...
+reparada.corrupta        # True en los registros que tenían doble codificación
+reparada.sin_acentos     # 'Computacion', 'Fotografia', ... (para comparar sin importar los acentos)
+
+Así los casos que cuentan defectos de codificación y los que validan los valores limpios salen de la
+misma pasada. Un texto se considera corrupto solo si al volver a codificarlo en cp1252 (o latin-1) se
+obtiene UTF-8 válido y distinto; los textos correctos con acentos ('Computación') no cumplen esa
+condición y quedan igual.
+'''
+
+# Vueltas máximas de reparación (textos codificados dos veces o más)
+MAX_VUELTAS = 3
+CACHE_TRADUCCIONES = 2**16
+
+
+def _deshacer(texto):
+    for codificacion in ("cp1252", "latin-1"):
+        try:
+            return texto.encode(codificacion).decode("utf-8")
+        except UnicodeEncodeError:
+            continue
+        except UnicodeDecodeError:
+            return None
+    return None
+
+
+@lru_cache(maxsize=CACHE_TRADUCCIONES)
+def reparar_texto(texto):
+    '''Devuelve el texto sin la doble codificación (o el mismo texto si no la tiene).'''
+    if texto.isascii():
+        return texto
+    for _ in range(MAX_VUELTAS):
+        reparado = _deshacer(texto)
+        if reparado is None or reparado == texto:
+            break
+        texto = reparado
+    return texto
+
+
+@lru_cache(maxsize=CACHE_TRADUCCIONES)
+def quitar_acentos(texto):
+    '''Texto sin tildes ni diéresis ('Fotografía' -> 'Fotografia'); la ñ también pierde la tilde.'''
+    if texto.isascii():
+        return texto
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+
+
+def _traducir(valores, funcion):
+    return np.array([funcion(valor) if isinstance(valor, str) else valor for valor in valores], dtype=object)
+
+
+class ColumnaReparada:
+    '''Columna original, reparada y sin acentos, compartiendo los códigos de la columna diccionario.'''
+
+    def __init__(self, diccionario):
+        self.diccionario = diccionario
+        reparados = _traducir(diccionario.valores, reparar_texto)
+        self.diccionario_reparado = ColumnaDiccionario(diccionario.nombre, diccionario.codigos, reparados, diccionario.indice)
+        self.diccionario_sin_acentos = ColumnaDiccionario(diccionario.nombre, diccionario.codigos,
+                                                          _traducir(reparados, quitar_acentos), diccionario.indice)
+        self.valores_corruptos = np.array([reparado != original for original, reparado in zip(diccionario.valores, reparados)],
+                                          dtype=bool)
+
+    @property
+    def original(self):
+        return self.diccionario.serie()
+
+    @property
+    def reparada(self):
+        return self.diccionario_reparado.serie()
+
+    @property
+    def sin_acentos(self):
+        return self.diccionario_sin_acentos.serie()
+
+    @property
+    def corrupta(self):
+        '''Máscara de los registros con doble codificación (False en los vacíos).'''
+        return self.diccionario._repartir(self.valores_corruptos, False).astype(bool)
+
+    def traducciones(self):
+        '''Valores distintos con doble codificación y su reparación.'''
+        return {original: reparado for original, reparado, corrupto
+                in zip(self.diccionario.valores, self.diccionario_reparado.valores, self.valores_corruptos) if corrupto}
+
+
+def reparar_serie(serie):
+    '''Repara una serie suelta (sin caché por DataFrame).'''
+    return ColumnaReparada(codificar_columna(serie))
+
+
+def reparar_columna(data, nombre):
+    '''Devuelve la columna reparada, calculándola solo la primera vez para cada DataFrame.'''
+    return en_cache(data, ("reparada", nombre), lambda: ColumnaReparada(columna_diccionario(data, nombre)))
@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from conciliacion import NULO_CANONICO, huellas_filas, texto_canonico
+
+logger = logging.getLogger(__name__)
+
+'''
+Revalidación incremental: solo se recalculan las métricas de los bloques de filas que cambiaron.
+
+Cada entrega del archivo de ventas cambia una fracción pequeña de las filas, pero las métricas se
+recalculaban sobre el archivo completo. Una Metrica declara las columnas que usa y cómo calcular su
+estado sobre un bloque de filas; el estado debe poder unirse con combinar() (PerfilNumerico,
+ResumenColumna). revalidar:
+
+1. Calcula la huella de cada fila sobre las columnas de la métrica (ver conciliacion.huellas_filas).
+   A diferencia de la conciliación, la huella incluye el tipo de cada valor: '12.5' y 12.5 dan la
+   misma huella al conciliar, pero no el mismo perfil (uno cuenta como texto y el otro no).
+2. Corta los bloques donde la huella de la fila cumple una condición (cortes por contenido), así que
+   insertar o eliminar filas solo cambia los bloques vecinos y no desplaza todos los siguientes.
+3. Busca el estado de cada bloque por la huella de su contenido en dir_estado; solo los bloques
+   nuevos o modificados se calculan (y se guardan para la próxima ejecución).
+4. Une los estados de todos los bloques en orden.
+
+revalidador = Revalidador(".pytest_cache/d/revalidacion")
+perfil = revalidador.calcular(data, Metrica("perfil_precio", ["precio"], lambda bloque: perfilar_columna(bloque["precio"])))
+
+El nombre y la versión identifican la definición de la métrica: si cambia el cálculo (por ejemplo los
+rangos del perfil) hay que cambiar la versión para no reutilizar estados anteriores.
+'''
+
+# Tamaño medio de los bloques (filas)
+TAMANO_MEDIO = 8192
+# Filas consecutivas que deciden cada corte; con una sola fila, una columna con pocos valores distintos
+# cortaría siempre en los mismos valores
+VENTANA = 16
+
+
+@dataclass(frozen=True)
+class Metrica:
+    '''Cálculo de un estado combinable sobre un bloque de filas.'''
+    nombre: str
+    columnas: tuple
+    calcular: object
+    version: str = "1"
+
+    def __post_init__(self):
+        object.__setattr__(self, "columnas", tuple(self.columnas))
+
+
+@dataclass
+class ResultadoRevalidacion:
+    estado: object
+    bloques: int
+    recalculados: int
+
+    @property
+    def reutilizados(self):
+        return self.bloques - self.recalculados
+
+
+def _huellas_ventana(huellas):
+    '''Combina la huella de cada fila con las de las VENTANA - 1 filas anteriores.'''
+    ventana = huellas.copy()
+    for desplazamiento in range(1, min(VENTANA, len(huellas))):
+        anteriores = huellas[:-desplazamiento]
+        rotadas = (anteriores << np.uint64(desplazamiento)) | (anteriores >> np.uint64(64 - desplazamiento))
+        ventana[desplazamiento:] ^= rotadas
+    # Mezcla final para que los bits bajos dependan de todos los bits de la combinación
+    return (ventana * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+
+
+def cortes_por_contenido(huellas, tamano_medio=TAMANO_MEDIO):
+    '''
+    Posiciones de inicio de cada bloque. Se corta después de cada fila en la que la huella de la
+    ventana de filas que termina en ella es múltiplo de tamano_medio, con bloques de al menos tamano_medio / 4 filas y a lo sumo 4 * tamano_medio filas.
+    '''
+    if tamano_medio < 1:
+        raise ValueError("tamano_medio debe ser mayor que 0")
+    minimo = max(tamano_medio // 4, 1)
+    maximo = 4 * tamano_medio
+    candidatos = np.flatnonzero(_huellas_ventana(huellas) % np.uint64(tamano_medio) == 0) + 1
+    cortes = [0]
+    for candidato in candidatos.tolist() + [len(huellas)]:
+        while candidato - cortes[-1] > maximo:
+            cortes.append(cortes[-1] + maximo)
+        if candidato - cortes[-1] >= minimo and candidato < len(huellas):
+            cortes.append(candidato)
+    return np.array(cortes, dtype=np.int64)
+
+
+def _texto_con_tipo(valor):
+    '''Texto canónico del valor precedido por su tipo, para que un cambio de tipo cambie la huella.'''
+    canonico = texto_canonico(valor)
+    return canonico if canonico == NULO_CANONICO else f"{type(valor).__name__}:{canonico}"
+
+
+def _guardar(ruta, estado):
+    # Archivo temporal propio de cada proceso: con pytest -n varios workers guardan los mismos bloques
+    # a la vez y os.replace deja siempre un estado completo
+    temporal = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporal, "wb") as archivo:
+            pickle.dump(estado, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+    finally:
+        temporal.unlink(missing_ok=True)
+
+
+def _cargar(ruta):
+    '''Estado guardado del bloque, o None si no existe (u otro proceso lo eliminó mientras tanto).'''
+    try:
+        with open(ruta, "rb") as archivo:
+            return pickle.load(archivo)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def revalidar(data, metrica, dir_estado=None, tamano_medio=TAMANO_MEDIO):
+    '''
+    Calcula el estado de la métrica sobre el DataFrame uniendo los estados de sus bloques.
+
+    Sin dir_estado se calculan todos los bloques y no se guarda nada.
+    '''
+    huellas = huellas_filas(data, metrica.columnas, _texto_con_tipo)
+    cortes = cortes_por_contenido(huellas, tamano_medio)
+    limites = zip(cortes.tolist(), cortes[1:].tolist() + [len(data)])
+    directorio = None
+    if dir_estado is not None:
+        directorio = Path(dir_estado) / f"{metrica.nombre}-{metrica.version}"
+        directorio.mkdir(parents=True, exist_ok=True)
+    usados = set()
+    estado = None
+    bloques = recalculados = 0
+    for inicio, fin in limites:
+        if fin <= inicio:
+            continue
+        bloques += 1
+        ruta = None
+        if directorio is not None:
+            clave = hashlib.sha256(huellas[inicio:fin].tobytes()).hexdigest()[:32]
+            ruta = directorio / f"{clave}.pkl"
+            usados.add(ruta.name)
+        estado_bloque = _cargar(ruta) if ruta is not None else None
+        if estado_bloque is None:
+            estado_bloque = metrica.calcular(data.iloc[inicio:fin])
+            recalculados += 1
+            if ruta is not None:
+                _guardar(ruta, estado_bloque)
+        estado = estado_bloque if estado is None else estado.combinar(estado_bloque)
+    if directorio is not None:
+        # Los estados que no se usaron corresponden a bloques que ya no existen en los datos; los
+        # temporales son de otros procesos que están guardando sus bloques
+        for anterior in directorio.iterdir():
+            if anterior.suffix == ".pkl" and anterior.name not in usados:
+                anterior.unlink(missing_ok=True)
+    if estado is None:
+        estado = metrica.calcular(data)
+    logger.info(f"Métrica '{metrica.nombre}': {recalculados} de {bloques} bloques recalculados")
+    return ResultadoRevalidacion(estado=estado, bloques=bloques, recalculados=recalculados)
+
+
+class Revalidador:
+    '''
+    Punto único para calcular métricas en los casos de prueba.
+
+    Con dir_estado, revalida por bloques reutilizando los estados guardados; sin dir_estado calcula la
+    métrica sobre los datos completos, como antes.
+    '''
+
+    def __init__(self, dir_estado=None, tamano_medio=TAMANO_MEDIO):
+        self.dir_estado = dir_estado
+        self.tamano_medio = tamano_medio
+        self.resultados = {}
+
+    def calcular(self, data, metrica):
+        if self.dir_estado is None:
+            return metrica.calcular(data)
+        resultado = revalidar(data, metrica, self.dir_estado, self.tamano_medio)
+        self.resultados[metrica.nombre] = resultado
+        return resultado.estado
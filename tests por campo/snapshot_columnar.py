@@ -0,0 +1,185 @@
+import datetime
+import gzip
+import json
+import logging
+import math
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+'''
+Instantánea columnar del archivo de ventas.
+
+Cada columna se guarda en su propio archivo .npy que se abre con np.load(mmap_mode='r'):
+
+- columnas numéricas (id_producto, cantidad_vendida, ...): el arreglo tal cual, sin copiar al abrir.
+- columnas de texto o de tipos mezclados (precio, categoria, fecha_venta, ...): códigos enteros
+  (int8/int16/int32 según la cantidad de valores distintos, -1 para vacíos) y un diccionario con los
+  valores distintos comprimido con gzip. El diccionario conserva el tipo de cada valor, de modo que
+  '291.7' sigue siendo texto y 4404 sigue siendo entero al reconstruir la columna.
+
+Abrir la instantánea solo lee esquema.json; cada columna se mapea o decodifica cuando se pide, y los
+procesos que abren la misma instantánea comparten las páginas desde la caché del sistema operativo.
+'''
+
+VERSION = 1
+ESQUEMA = "esquema.json"
+
+
+def _etiquetar(valor):
+    '''Convierte un valor de celda en una clave de texto que conserva su tipo.'''
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)) or valor is pd.NaT:
+        return None
+    if isinstance(valor, str):
+        return "s:" + valor
+    if isinstance(valor, (bool, np.bool_)):
+        return "b:" + str(int(valor))
+    if isinstance(valor, (int, np.integer)):
+        return "i:" + str(int(valor))
+    if isinstance(valor, (float, np.floating)):
+        return "f:" + repr(float(valor))
+    if isinstance(valor, datetime.datetime):
+        return "t:" + valor.isoformat()
+    if isinstance(valor, datetime.date):
+        return "d:" + valor.isoformat()
+    if isinstance(valor, datetime.time):
+        return "h:" + valor.isoformat()
+    raise TypeError(f"Tipo de valor no soportado en la instantánea: {type(valor).__name__}")
+
+
+def _desetiquetar(clave):
+    '''Operación inversa de _etiquetar.'''
+    tipo, texto = clave[0], clave[2:]
+    if tipo == "s":
+        return texto
+    if tipo == "b":
+        return bool(int(texto))
+    if tipo == "i":
+        return int(texto)
+    if tipo == "f":
+        return float(texto)
+    if tipo == "t":
+        return pd.Timestamp(texto)
+    if tipo == "d":
+        return datetime.date.fromisoformat(texto)
+    return datetime.time.fromisoformat(texto)
+
+
+def _tipo_codigos(cantidad):
+    '''Entero más pequeño capaz de representar la cantidad de valores distintos (y el -1 de vacíos).'''
+    for dtype in (np.int8, np.int16, np.int32):
+        if cantidad <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def escribir_snapshot(data, destino):
+    '''Guarda el DataFrame como instantánea columnar en el directorio destino.'''
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    columnas = []
+    for posicion, nombre in enumerate(data.columns):
+        serie = data[nombre]
+        archivo = f"col_{posicion:03d}.npy"
+        if serie.dtype.kind in "biufmM":
+            # Las fechas se guardan como int64 para poder mapearlas
+            valores = serie.to_numpy()
+            if serie.dtype.kind in "mM":
+                valores = valores.view("int64")
+            np.save(destino / archivo, valores, allow_pickle=False)
+            columnas.append({"nombre": nombre, "tipo": "numerico", "dtype": str(serie.dtype), "archivo": archivo})
+        else:
+            claves = serie.map(_etiquetar)
+            codigos, unicos = pd.factorize(claves, use_na_sentinel=True)
+            np.save(destino / archivo, codigos.astype(_tipo_codigos(len(unicos))), allow_pickle=False)
+            diccionario = f"col_{posicion:03d}.json.gz"
+            with gzip.open(destino / diccionario, "wt", encoding="utf-8") as salida:
+                json.dump(list(unicos), salida, ensure_ascii=False)
+            columnas.append({"nombre": nombre, "tipo": "diccionario", "archivo": archivo, "diccionario": diccionario})
+    esquema = {"version": VERSION, "filas": len(data), "columnas": columnas}
+    with open(destino / ESQUEMA, "w", encoding="utf-8") as salida:
+        json.dump(esquema, salida, ensure_ascii=False, indent=2)
+    return destino
+
+
+class SnapshotColumnar:
+    '''Instantánea columnar abierta; las columnas se mapean o decodifican al pedirlas.'''
+
+    def __init__(self, origen, mmap=True):
+        self.origen = Path(origen)
+        with open(self.origen / ESQUEMA, encoding="utf-8") as entrada:
+            esquema = json.load(entrada)
+        if esquema.get("version") != VERSION:
+            raise ValueError(f"Versión de instantánea no soportada: {esquema.get('version')}")
+        self.filas = esquema["filas"]
+        self._columnas = {columna["nombre"]: columna for columna in esquema["columnas"]}
+        self._modo = "r" if mmap else None
+        self._diccionarios = {}
+
+    @property
+    def columnas(self):
+        return list(self._columnas)
+
+    def es_diccionario(self, nombre):
+        '''Indica si la columna está guardada como códigos más diccionario.'''
+        return self._columnas[nombre]["tipo"] == "diccionario"
+
+    def arreglo(self, nombre):
+        '''Arreglo guardado para la columna: los valores si es numérica o los códigos si es de diccionario.'''
+        arreglo = np.load(self.origen / self._columnas[nombre]["archivo"], mmap_mode=self._modo, allow_pickle=False)
+        # np.asarray quita la subclase memmap sin copiar: el arreglo sigue apuntando al archivo mapeado
+        return np.asarray(arreglo)
+
+    def diccionario(self, nombre):
+        '''Valores distintos de una columna de diccionario, en el orden de sus códigos.'''
+        if nombre not in self._diccionarios:
+            with gzip.open(self.origen / self._columnas[nombre]["diccionario"], "rt", encoding="utf-8") as entrada:
+                claves = json.load(entrada)
+            valores = np.empty(len(claves) + 1, dtype=object)
+            valores[:-1] = [_desetiquetar(clave) for clave in claves]
+            # La última posición corresponde al código -1 (celda vacía)
+            valores[-1] = np.nan
+            self._diccionarios[nombre] = valores
+        return self._diccionarios[nombre][:-1]
+
+    def columna(self, nombre):
+        '''Reconstruye la columna con sus valores y tipos originales.'''
+        columna = self._columnas[nombre]
+        valores = self.arreglo(nombre)
+        if columna["tipo"] == "numerico":
+            if columna["dtype"].startswith(("datetime64", "timedelta64")):
+                valores = valores.view(columna["dtype"])
+            return pd.Series(valores, name=nombre, copy=False)
+        self.diccionario(nombre)
+        return pd.Series(self._diccionarios[nombre].take(valores), name=nombre, copy=False)
+
+    def a_dataframe(self, columnas=None):
+        '''DataFrame con las columnas indicadas (todas por defecto).'''
+        columnas = columnas or self.columnas
+        return pd.DataFrame({nombre: self.columna(nombre) for nombre in columnas}, copy=False)
+
+
+def leer_snapshot(origen, mmap=True):
+    '''Abre la instantánea columnar guardada en el directorio origen.'''
+    return SnapshotColumnar(origen, mmap=mmap)
+
+
+def publicar_snapshot(data, destino):
+    '''
+    Escribe la instantánea en un directorio temporal y lo renombra al destino, para que otros procesos
+    nunca vean una instantánea a medio escribir. Si otro proceso la publicó antes, se conserva esa.
+    '''
+    destino = Path(destino)
+    temporal = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    escribir_snapshot(data, temporal)
+    try:
+        os.replace(temporal, destino)
+    except OSError:
+        logger.info(f"La instantánea {destino} ya fue publicada por otro proceso")
+        shutil.rmtree(temporal, ignore_errors=True)
+    return destino
@@ -0,0 +1,43 @@
+import json
+import logging
+
+from benchmark_validaciones import ampliar_datos, ejecutar
+from dataset_ventas import COLUMNAS_VENTAS
+
+'''
+para ejecutar los casos
+
+pytest test_benchmark_validaciones.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ETAPAS = ["carga", "carga_xlsx", "coercion", "consistencia", "textos", "fechas", "duplicados", "reglas"]
+
+# Caso de prueba 1: Los datos ampliados conservan el esquema y son reproducibles con la semilla
+def test_scaled_data_keeps_schema(datos_ventas):
+    '''Caso de prueba 1: Validar el esquema y la reproducibilidad de los datos ampliados.'''
+    base = datos_ventas[COLUMNAS_VENTAS]
+    datos = ampliar_datos(base, 20_000, semilla=3)
+    assert len(datos) == 20_000
+    assert list(datos.columns) == COLUMNAS_VENTAS
+    assert (datos.dtypes == base.dtypes).all()
+    assert datos.equals(ampliar_datos(base, 20_000, semilla=3))
+
+# Caso de prueba 2: Cada etapa queda registrada con tiempo y memoria en el archivo de resultados
+def test_benchmark_records_every_stage(datos_ventas, tmp_path):
+    '''Caso de prueba 2: Confirmar que el benchmark mide todas las etapas y guarda el JSON de resultados.'''
+    salida = tmp_path / "resultados.json"
+    ejecutar(datos_ventas[COLUMNAS_VENTAS], filas=[500, 2000], salida=salida, max_filas_xlsx=500)
+    resultados = json.loads(salida.read_text(encoding="utf-8"))
+    mediciones = resultados["mediciones"]
+    logger.info(f"Mediciones: {len(mediciones)}")
+    assert [(m["filas"], m["etapa"]) for m in mediciones] == [(500, etapa) for etapa in ETAPAS] + \
+        [(2000, etapa) for etapa in ETAPAS if etapa != "carga_xlsx"]
+    for medicion in mediciones:
+        assert "error" not in medicion, f"La etapa {medicion['etapa']} falló: {medicion.get('error')}"
+        assert medicion["segundos"] >= 0 and medicion["memoria_pico_mb"] > 0
+    assert {"python", "pandas", "numpy"} <= set(resultados["entorno"])
@@ -1,5 +1,4 @@
 import pytest
-import pandas as pd
 import logging
 import re
 
@@ -24,13 +23,7 @@ pytest test_categoria.py -v --tb=short --log-cli-level=INFO --html=report_campo_
 
 '''
 
-# Cargar datos desde el archivo Excel
-@pytest.fixture
-def load_data():
-    '''Carga los datos desde el archivo ventas1.xlsx'''
-    file_path = "O:/productos/ventas1.xlsx"  # Ruta del archivo
-    data = pd.read_excel(file_path)
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
 
 # Configurar logging para pytest
 logging.basicConfig(level=logging.INFO)
@@ -40,7 +33,7 @@ logger = logging.getLogger(__name__)
 def test_find_special_characters_in_categoria(load_data):
     '''Caso de prueba 1: Identificar registros con caracteres especiales en la columna categoria.'''
     data = load_data
-    special_characters = data['categoria'].apply(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
+    special_characters = data.diccionario('categoria').aplicar(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
     special_count = special_characters.sum()
     logger.info(f"Total de registros con caracteres especiales: {special_count}")
     assert special_count >= 0, "No se encontraron registros con caracteres especiales en la columna 'categoria'"
@@ -49,7 +42,7 @@ def test_find_special_characters_in_categoria(load_data):
 def test_count_special_characters_in_categoria(load_data):
     '''Caso de prueba 2: Contar los registros con caracteres especiales en la columna categoria.'''
     data = load_data
-    special_characters = data['categoria'].apply(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
+    special_characters = data.diccionario('categoria').aplicar(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
     special_count = special_characters.sum()
     logger.info(f"Total de registros con caracteres especiales: {special_count}")
     assert special_count >= 0, "No se encontraron registros con caracteres especiales en la columna 'categoria'"
@@ -58,7 +51,7 @@ def test_count_special_characters_in_categoria(load_data):
 def test_exact_special_characters_count(load_data):
     '''Caso de prueba 3: Validar que hay exactamente 3398 registros con caracteres especiales en 'categoria'.'''
     data = load_data
-    special_characters = data['categoria'].apply(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
+    special_characters = data.diccionario('categoria').aplicar(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
     special_count = special_characters.sum()
     logger.info(f"Registros esperados con caracteres especiales: {special_count}")
     assert special_count == 3398, f"Se encontraron {special_count}, pero se esperaban 3398 registros."
@@ -70,7 +63,7 @@ def test_find_non_special_characters(load_data):
     # Cargar los datos
     data = load_data
     # Filtrar registros sin caracteres especiales
-    non_special_characters = data['categoria'].dropna().str.contains(r'^[a-zA-Z0-9\s]+$', regex=True) 
+    non_special_characters = data.diccionario('categoria').evaluar(lambda valores: valores.str.contains(r'^[a-zA-Z0-9\s]+$', regex=True), na=False) 
     # Registrar resultados
     non_special_characters_count = non_special_characters.sum()
     logger.info(f"Total de registros sin caracteres especiales en 'categoria': {non_special_characters_count}")
@@ -84,7 +77,7 @@ def test_count_non_special_characters(load_data):
     # Cargar los datos
     data = load_data
     # Contar registros sin caracteres especiales
-    non_special_characters_count = data['categoria'].dropna().str.contains(r'^[a-zA-Z0-9\s]+$', regex=True).sum()
+    non_special_characters_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.contains(r'^[a-zA-Z0-9\s]+$', regex=True), na=False).sum()
     # Registrar resultados
     logger.info(f"Total de registros sin caracteres especiales en 'categoria': {non_special_characters_count}") 
     # Validar el resultado
@@ -98,7 +91,7 @@ def test_exact_non_special_characters(load_data, expected_count):
     # Cargar los datos
     data = load_data
     # Contar registros sin caracteres especiales
-    non_special_characters_count = data['categoria'].dropna().str.contains(r'^[a-zA-Z0-9\s]+$', regex=True).sum()  
+    non_special_characters_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.contains(r'^[a-zA-Z0-9\s]+$', regex=True), na=False).sum()  
     # Registrar resultados
     logger.info(f"Total de registros sin caracteres especiales: {non_special_characters_count}") 
     # Verificar que coincida con el número esperado
@@ -109,7 +102,7 @@ def test_exact_non_special_characters(load_data, expected_count):
 def test_find_audio_in_category(load_data):
     '''Caso de prueba 7: Identificar registros en 'categoria' con el valor "Audio".'''
     data = load_data
-    audio_records = data[data['categoria'].str.strip().str.contains('Audio', case=False, na=False)]
+    audio_records = data[data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().str.contains('Audio', case=False, na=False))]
     logger.info(f"Registros con valor 'Audio': {len(audio_records)}")
     assert len(audio_records) >= 0, "No se encontraron registros con el valor 'Audio'."
 
@@ -118,7 +111,7 @@ def test_find_audio_in_category(load_data):
 def test_count_audio_in_category(load_data):
     '''Caso de prueba 8: Contar registros en 'categoria' con el valor "Audio".'''
     data = load_data
-    audio_count = data['categoria'].str.strip().str.contains('Audio', case=False, na=False).sum()
+    audio_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().str.contains('Audio', case=False, na=False)).sum()
     logger.info(f"Cantidad de registros con valor 'Audio': {audio_count}")
     assert audio_count >= 0, "No se encontraron registros con el valor 'Audio'."
 
@@ -128,21 +121,21 @@ def test_count_audio_in_category(load_data):
 def test_validate_audio_count(load_data, expected_count):
     '''Caso de prueba 9: Validar que hay exactamente 655 registros con el valor "Audio".'''
     data = load_data
-    audio_count = data['categoria'].str.strip().str.contains('Audio', case=False, na=False).sum()
+    audio_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().str.contains('Audio', case=False, na=False)).sum()
     logger.info(f"Total de registros con valor 'Audio': {audio_count}")
     assert audio_count == expected_count, (f"Se esperaban {expected_count} registros con el valor 'Audio', pero se encontraron {audio_count}.")
 
 def test_find_office_category(load_data):
     '''Caso de prueba 10: Identificar si existen registros en la columna 'categoria' con el valor 'Oficina'.'''
     data = load_data
-    office_records = data[data['categoria'].str.strip().str.contains('Oficina', case=False, na=False)]
+    office_records = data[data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().str.contains('Oficina', case=False, na=False))]
     logger.info(f"Registros con el valor 'Oficina' en 'categoria': {len(office_records)}")
     assert len(office_records) > 0, "No se encontraron registros con la categoría 'Oficina'."
 
 def test_count_office_category(load_data):
     '''Caso de prueba 11: Contar cuántos registros existen en la columna 'categoria' con el valor 'Oficina'.'''
     data = load_data
-    office_count = data['categoria'].str.strip().str.contains('Oficina', case=False, na=False).sum()
+    office_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().str.contains('Oficina', case=False, na=False)).sum()
     logger.info(f"Total de registros con la categoría 'Oficina': {office_count}")
     assert office_count >= 0, "No se encontraron registros con la categoría 'Oficina'."
 
@@ -150,7 +143,7 @@ def test_count_office_category(load_data):
 def test_validate_office_category_count(load_data, expected_count):
     '''Caso de prueba 12: Validar si la cantidad de registros con la categoría 'Oficina' corresponde a 624.'''
     data = load_data
-    office_count = data['categoria'].str.strip().str.contains('Oficina', case=False, na=False).sum()
+    office_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().str.contains('Oficina', case=False, na=False)).sum()
     logger.info(f"Registros que contienen 'Oficina': {office_count}")
     assert office_count == expected_count, (f"Se esperaban {expected_count} registros con 'Oficina', pero se encontraron {office_count}.")
  
@@ -158,7 +151,7 @@ def test_validate_office_category_count(load_data, expected_count):
 def test_find_categories_starting_with_f(load_data):
     '''Caso de prueba 13: Identificar registros en la columna 'categoria' que comienzan con la letra 'F'.'''
     data = load_data
-    f_records = data['categoria'].str.lower().str.startswith('f', na=False).sum()
+    f_records = data.diccionario('categoria').evaluar(lambda valores: valores.str.lower().str.startswith('f', na=False)).sum()
     logger.info(f"Registros que comienzan con 'F': {f_records.sum()}")
     assert f_records.sum() >= 0, "No se encontraron registros que comiencen con 'F'."
 
@@ -166,7 +159,7 @@ def test_find_categories_starting_with_f(load_data):
 def test_count_categories_starting_with_f(load_data):
     '''Caso de prueba 14: Contar los registros en la columna 'categoria' que comienzan con la letra 'F'.'''
     data = load_data
-    f_count = data['categoria'].str.lower().str.startswith('f', na=False).sum()
+    f_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.lower().str.startswith('f', na=False)).sum()
     logger.info(f"Total de registros que comienzan con 'F': {f_count}")
     assert f_count >= 0, "No se encontraron registros que comiencen con 'F'."
 
@@ -175,7 +168,7 @@ def test_count_categories_starting_with_f(load_data):
 def test_validate_f_starting_count(load_data, expected_count):
     '''Caso de prueba 15: Validar si la cantidad de registros que comienzan con 'F' corresponde a 670.'''
     data = load_data
-    f_count = data['categoria'].str.lower().str.startswith('f', na=False).sum()
+    f_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.lower().str.startswith('f', na=False)).sum()
     logger.info(f"Registros que comienzan con 'F': {f_count}")
     assert f_count == expected_count, (f"Se esperaban {expected_count} registros que comiencen con 'F', pero se encontraron {f_count}.")
 
@@ -183,7 +176,7 @@ def test_validate_f_starting_count(load_data, expected_count):
 def test_find_categories_starting_with_a(load_data):
     '''Caso de prueba 16: Identificar registros en la columna ‘categoria’ comienzan con la letra ‘A’.'''
     data = load_data
-    a_records = data['categoria'].str.lower().str.startswith('a', na=False).sum()
+    a_records = data.diccionario('categoria').evaluar(lambda valores: valores.str.lower().str.startswith('a', na=False)).sum()
     logger.info(f"Registros que comienzan con 'a': {a_records.sum()}")
     assert a_records.sum() > 0, "No se encontraron registros que comiencen con 'a'."
 
@@ -191,7 +184,7 @@ def test_find_categories_starting_with_a(load_data):
 def test_count_categories_starting_with_a(load_data):
     '''Caso de prueba 17: Contar los registros en la columna 'categoria' que comienzan con la letra 'a'.'''
     data = load_data
-    a_count = data['categoria'].str.lower().str.startswith('a', na=False).sum()
+    a_count = data.diccionario('categoria').evaluar(lambda valores: valores.str.lower().str.startswith('a', na=False)).sum()
     logger.info(f"Total de registros que comienzan con 'a': {a_count}")
     assert a_count > 0, "No se encontraron registros que comiencen con 'a'."
 
@@ -200,7 +193,7 @@ def test_count_categories_starting_with_a(load_data):
 def test_validate_a_starting_count(load_data, expected_count):
     '''Caso de prueba 18: Validar si la cantidad de registros que comienzan con 'a' corresponde a 2062.'''
     data = load_data
-    a_count_two = data['categoria'].str.lower().str.startswith('a', na=False).sum()
+    a_count_two = data.diccionario('categoria').evaluar(lambda valores: valores.str.lower().str.startswith('a', na=False)).sum()
     logger.info(f"Registros que comienzan con 'a': {a_count_two}")
     assert a_count_two == expected_count, (f"Se esperaban {expected_count} registros que comiencen con 'a', pero se encontraron {a_count_two}.")
 
@@ -210,7 +203,7 @@ def test_detect_null_or_empty_values_in_category(load_data):
     '''Caso de prueba 19: Validar que existan valores vacíos o nulos en la columna 'categoria'.'''
     data = load_data
     # Contar valores nulos o vacíos
-    null_or_empty_count = data['categoria'].isna().sum() + data['categoria'].str.strip().eq("").sum()
+    null_or_empty_count = data['categoria'].isna().sum() + data.diccionario('categoria').evaluar(lambda valores: valores.str.strip().eq("")).sum()
     logger.info(f"Valores nulos o vacíos encontrados en 'categoria': {null_or_empty_count}")  
     # Verificar que existan valores nulos o vacíos (caso positivo si existen)
     assert null_or_empty_count > 0, "No se encontraron valores nulos o vacíos en 'categoria', se esperaba al menos uno."
@@ -228,7 +221,7 @@ def test_validate_null_category_count(load_data, expected_count):
 def test_find_categories_with_char_ao_two(load_data):
     '''Caso 21: Identificar registros en la columna `categoria` que contienen el carácter `Ã`.'''
     data = load_data
-    contains_char_ao = data['categoria'].apply(lambda x: 'FotografÃ­a' in x if isinstance(x, str) else False)
+    contains_char_ao = data.diccionario('categoria').aplicar(lambda x: 'FotografÃ­a' in x if isinstance(x, str) else False)
     logger.info(f"Registros con el carácter `Ã` en `categoria`: {contains_char_ao.sum()}")
     assert contains_char_ao.sum() > 0, "No se encontraron registros con el carácter `Ã` en `categoria`."
 
@@ -236,7 +229,7 @@ def test_find_categories_with_char_ao_two(load_data):
 def test_count_categories_with_char_ao_two(load_data):
     '''Caso 22: Contar los registros en `categoria` que contienen el carácter `Ã`.'''
     data = load_data
-    count_char_ao = data['categoria'].apply(lambda x: 'FotografÃ­a' in x if isinstance(x, str) else False).sum()
+    count_char_ao = data.diccionario('categoria').aplicar(lambda x: 'FotografÃ­a' in x if isinstance(x, str) else False).sum()
     logger.info(f"Total de registros con el carácter `Ã` en `categoria`: {count_char_ao}")
     assert count_char_ao > 0, "No se encontraron registros con el carácter `Ã` en `categoria`."
 
@@ -245,9 +238,9 @@ def test_validate_category_case_insensitive_ao_count(load_data, expected_count):
     '''Caso adicional: Validar la cantidad de registros con el término `fotografÃ­a` (minúsculas y mayúsculas).'''
     data = load_data   
     # Contar registros que contienen 'fotografÃ­a' en minúsculas
-    count_lowercase = data['categoria'].apply(lambda x: 'fotografÃ­a' in str(x).strip()).sum()
+    count_lowercase = data.diccionario('categoria').aplicar(lambda x: 'fotografÃ­a' in str(x).strip()).sum()
     # Contar registros que contienen 'FotografÃ­a' en mayúsculas
-    count_uppercase = data['categoria'].apply(lambda x: 'FotografÃ­a' in str(x).strip()).sum()
+    count_uppercase = data.diccionario('categoria').aplicar(lambda x: 'FotografÃ­a' in str(x).strip()).sum()
     # Sumar ambos casos
     total_count = count_lowercase + count_uppercase
     
@@ -262,7 +255,7 @@ def test_validate_category_case_insensitive_ao_count(load_data, expected_count):
 def test_find_categories_with_char_ao(load_data):
     '''Caso 23: Identificar registros en la columna `categoria` que contienen el carácter `Ã³`.'''
     data = load_data
-    contains_char_ao = data['categoria'].apply(lambda x: 'Ã³' in x if isinstance(x, str) else False)
+    contains_char_ao = data.diccionario('categoria').aplicar(lambda x: 'Ã³' in x if isinstance(x, str) else False)
     logger.info(f"Registros con el carácter `Ã³` en `categoria`: {contains_char_ao.sum()}")
     assert contains_char_ao.sum() > 0, "No se encontraron registros con el carácter `Ã³` en `categoria`."
 
@@ -270,7 +263,7 @@ def test_find_categories_with_char_ao(load_data):
 def test_count_categories_with_char_ao(load_data):
     '''Caso 24: Contar los registros en `categoria` que contienen el carácter `Ã³`.'''
     data = load_data
-    count_char_ao = data['categoria'].apply(lambda x: 'Ã³' in x if isinstance(x, str) else False).sum()
+    count_char_ao = data.diccionario('categoria').aplicar(lambda x: 'Ã³' in x if isinstance(x, str) else False).sum()
     logger.info(f"Total de registros con el carácter `Ã³` en `categoria`: {count_char_ao}")
     assert count_char_ao > 0, "No se encontraron registros con el carácter `Ã³` en `categoria`."
 
@@ -279,7 +272,7 @@ def test_count_categories_with_char_ao(load_data):
 def test_validate_category_char_ao_count(load_data, expected_count):
     '''Caso 25: Validar si la cantidad de registros en `categoria` con el carácter `Ã³` corresponde a 2728.'''
     data = load_data
-    count_char_ao = data['categoria'].apply(lambda x: 'Ã³' in x if isinstance(x, str) else False).sum()
+    count_char_ao = data.diccionario('categoria').aplicar(lambda x: 'Ã³' in x if isinstance(x, str) else False).sum()
     logger.info(f"Registros con el carácter `Ã³` en `categoria`: {count_char_ao}")
     assert count_char_ao == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {count_char_ao}."
 
@@ -303,7 +296,28 @@ def test_validate_exact_count_failed(load_data, test_case, column, filter_condit
     '''
     data = load_data
     # Filtrar registros según la condición proporcionada
-    count = data[column].dropna().apply(filter_condition).sum()
+    count = data.diccionario(column).aplicar(filter_condition, na=False).sum()
     logger.info(f"{test_case}: Se encontraron {count} registros que cumplen la condición en la columna '{column}'.")  
     # Validar el número de registros
     assert count == expected_count, (f"{test_case}: Se esperaban {expected_count} registros, pero se encontraron {count}.")
+
+# Caso de prueba 26: Validar que los registros con doble codificación en 'categoria' son los 3398 con caracteres especiales
+@pytest.mark.parametrize("expected_count", [3398])
+def test_validate_double_encoded_categories(load_data, expected_count):
+    '''Caso de prueba 26: Validar que los registros con doble codificación en 'categoria' son los 3398 con caracteres especiales.'''
+    data = load_data
+    corrupta = data.reparada('categoria').corrupta
+    contains_char_a = data.diccionario('categoria').aplicar(lambda x: 'Ã' in x, na=False)
+    logger.info(f"Registros con doble codificación en 'categoria': {corrupta.sum()}")
+    assert corrupta.sum() == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {corrupta.sum()}."
+    assert corrupta.equals(contains_char_a), "La máscara de doble codificación no coincide con los registros que contienen `Ã`."
+
+# Caso de prueba 27: Validar los valores limpios de 'categoria' sin importar mayúsculas ni acentos
+def test_validate_clean_category_values(load_data):
+    '''Caso de prueba 27: Validar los valores limpios de 'categoria' después de reparar la codificación y quitar los acentos.'''
+    data = load_data
+    limpias = data.reparada('categoria').diccionario_sin_acentos.evaluar(lambda valores: valores.str.strip().str.lower())
+    conteos = limpias.value_counts().to_dict()
+    logger.info(f"Valores limpios de 'categoria': {conteos}")
+    assert set(conteos) == {'accesorios', 'audio', 'computacion', 'electronica', 'fotografia', 'oficina'}
+    assert conteos['computacion'] == 1376, f"Se esperaban 1376 registros de 'computacion', pero se encontraron {conteos['computacion']}."
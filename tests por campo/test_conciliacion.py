@@ -0,0 +1,84 @@
+import datetime
+import decimal
+import pytest
+import pandas as pd
+import logging
+
+from conciliacion import conciliar, conciliar_archivo_con_tabla, texto_canonico
+from dataset_ventas import COLUMNAS_VENTAS
+
+'''
+para ejecutar los casos
+
+pytest test_conciliacion.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TAMANO_BLOQUE = 1000
+CLAVES = ['id_producto', 'fecha_venta', 'nombre_cliente']
+
+def bloques(data):
+    return (data.iloc[inicio:inicio + TAMANO_BLOQUE] for inicio in range(0, len(data), TAMANO_BLOQUE))
+
+@pytest.fixture
+def ventas_modificadas(datos_ventas):
+    '''Copia de los datos con la fila 10 cambiada, la fila 20 eliminada y una fila nueva al final.'''
+    data = datos_ventas[COLUMNAS_VENTAS].copy()
+    data.loc[10, 'precio'] = '999'
+    nueva = data.iloc[[0]].assign(nombre_cliente='Cliente nuevo')
+    return pd.concat([data.drop(index=20), nueva], ignore_index=True)
+
+# Caso de prueba 1: El archivo y la tabla cargada desde él coinciden
+def test_file_and_table_match(ruta_datos_ventas, pool_ventas):
+    '''Caso de prueba 1: Confirmar que el archivo y la tabla con los mismos datos no tienen diferencias.'''
+    resultado = conciliar_archivo_con_tabla(ruta_datos_ventas, pool_ventas, claves=CLAVES, tamano_bloque=TAMANO_BLOQUE)
+    logger.info(f"Conciliación: {resultado.resumen()}")
+    assert resultado.filas_origen == resultado.filas_destino == 6120
+    assert resultado.coinciden, f"Se encontraron diferencias: {resultado.resumen()}"
+
+# Caso de prueba 2: Se detectan las filas faltantes, sobrantes y cambiadas en la tabla
+def test_table_differences_are_reported(ruta_datos_ventas, pool_ventas):
+    '''Caso de prueba 2: Validar las posiciones de las filas cambiadas, eliminadas y agregadas en la tabla.'''
+    with pool_ventas.conexion() as conexion:
+        conexion.execute("UPDATE ventas SET precio = '999' WHERE rowid = 11")
+        conexion.execute("DELETE FROM ventas WHERE rowid = 21")
+        conexion.execute("INSERT INTO ventas (id_producto, cantidad_vendida) VALUES (1, 1)")
+        conexion.commit()
+    resultado = conciliar_archivo_con_tabla(ruta_datos_ventas, pool_ventas, claves=CLAVES, tamano_bloque=TAMANO_BLOQUE)
+    logger.info(f"Conciliación: {resultado.resumen()}")
+    assert resultado.faltantes.tolist() == [20]
+    assert resultado.sobrantes.tolist() == [6119]
+    assert resultado.cambiadas.tolist() == [[10, 10]]
+
+# Caso de prueba 3: Sin claves, un cambio aparece como una fila faltante y una sobrante
+def test_content_only_reconciliation(datos_ventas, ventas_modificadas):
+    '''Caso de prueba 3: Confirmar la conciliación por contenido cuando no se indican claves.'''
+    resultado = conciliar(bloques(datos_ventas), bloques(ventas_modificadas), COLUMNAS_VENTAS)
+    assert resultado.faltantes.tolist() == [10, 20]
+    assert resultado.sobrantes.tolist() == [10, 6119]
+    assert len(resultado.cambiadas) == 0
+
+# Caso de prueba 4: La cantidad de particiones no cambia el resultado
+@pytest.mark.parametrize("particiones", [1, 7, 64])
+def test_result_independent_of_partitions(datos_ventas, ventas_modificadas, particiones):
+    '''Caso de prueba 4: Validar que el resultado es el mismo con cualquier cantidad de particiones.'''
+    resultado = conciliar(bloques(datos_ventas), bloques(ventas_modificadas), COLUMNAS_VENTAS, claves=CLAVES,
+                          particiones=particiones)
+    logger.info(f"{particiones} particiones: {resultado.filas_por_segundo:.0f} filas por segundo")
+    assert resultado.resumen()["faltantes"] == resultado.resumen()["sobrantes"] == resultado.resumen()["cambiadas"] == 1
+
+# Caso de prueba 5: El mismo valor leído con distintos tipos tiene la misma representación
+@pytest.mark.parametrize("valores", [
+    (12, 12.0, decimal.Decimal('12.00'), '12'),
+    (291.7, decimal.Decimal('291.7'), '291.7'),
+    (datetime.date(2023, 5, 1), datetime.datetime(2023, 5, 1)),
+    (None, float('nan')),
+])
+def test_canonical_text_ignores_reader_types(valores):
+    '''Caso de prueba 5: Confirmar que la huella no depende del tipo con el que cada lado leyó el valor.'''
+    canonicos = {texto_canonico(valor) for valor in valores}
+    assert len(canonicos) == 1, f"Se esperaba una sola representación, pero se encontraron {canonicos}."
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from coercion import convertir_columna
+from consistencia_total import CONSISTENTE, INCONSISTENTE, SIN_DATOS, comparar_total, verificar_total
+
+'''
+para ejecutar los casos
+
+pytest test_consistencia_total.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def ventas():
+    return pd.DataFrame({
+        "precio": ["10.5", 2.0, "0.1", "-3", "7", None, "x"],
+        "cantidad_vendida": [3, 4, 3, 5, 2, 1, 1],
+        "total_venta": ["31.5", "8.02", "0.3", "-15", "15", "1", "1"],
+    }, index=list("abcdefg"))
+
+# Caso de prueba 1: Estado de cada fila con la tolerancia por defecto
+def test_row_states(ventas):
+    '''Caso de prueba 1: Estado de cada fila con la tolerancia por defecto'''
+    resultado = verificar_total(ventas)
+    assert resultado.estado.tolist() == [CONSISTENTE, INCONSISTENTE, CONSISTENTE, CONSISTENTE, INCONSISTENTE, SIN_DATOS, SIN_DATOS]
+    assert list(resultado.indices()) == ["b", "e"]
+    assert list(resultado.indices(SIN_DATOS)) == ["f", "g"]
+    assert resultado.resumen() == {"consistente": 3, "inconsistente": 2, "sin_datos": 2}
+    assert resultado.mayores_diferencias(1).index.tolist() == ["e"]
+    assert resultado.mayores_diferencias(1)["diferencia"].iloc[0] == pytest.approx(1.0)
+
+# Caso de prueba 2: Tolerancia absoluta y relativa configurables
+def test_configurable_tolerance(ventas):
+    '''Caso de prueba 2: Tolerancia absoluta y relativa configurables'''
+    assert verificar_total(ventas, tolerancia=0.05).cantidad(INCONSISTENTE) == 1
+    assert verificar_total(ventas, tolerancia=0.0).cantidad(INCONSISTENTE) == 2
+    assert verificar_total(ventas, tolerancia=0.0, tolerancia_relativa=0.1).cantidad(INCONSISTENTE) == 0
+    with pytest.raises(ValueError):
+        verificar_total(ventas, tolerancia=-1)
+
+# Caso de prueba 3: Un total redondeado al centavo es consistente pese al error de float
+def test_float_rounding_is_consistent():
+    '''Caso de prueba 3: Un total redondeado al centavo es consistente pese al error de float'''
+    precio = np.round(np.random.default_rng(3).uniform(-900, 900, 100_000), 2)
+    cantidad = np.random.default_rng(4).integers(1, 5000, 100_000)
+    total = np.round(precio * cantidad, 2)
+    resultado = comparar_total(*(convertir_columna(pd.Series(columna)) for columna in (precio, cantidad, total)), tolerancia=0.0)
+    assert resultado.cantidad(CONSISTENTE) == len(precio)
@@ -0,0 +1,47 @@
+import os
+import pandas as pd
+import logging
+
+from dataset_ventas import abrir_snapshot_ventas, huella_archivo
+
+'''
+para ejecutar los casos
+
+pytest test_dataset_ventas.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _libro(ruta, valores):
+    pd.DataFrame({'precio': valores}).to_excel(ruta, index=False)
+    return ruta
+
+# Caso de prueba 1: Una instantánea nueva no borra las de otros libros con el mismo prefijo
+def test_other_workbook_snapshots_are_kept(tmp_path):
+    '''Caso de prueba 1: Validar que cargar ventas1.xlsx no elimina la instantánea de ventas1-2024.xlsx.'''
+    cache = tmp_path / "cache"
+    otro = _libro(tmp_path / "ventas1-2024.xlsx", [1.0, 2.0])
+    abrir_snapshot_ventas(otro, cache)
+    ventas = _libro(tmp_path / "ventas1.xlsx", [3.0])
+    abrir_snapshot_ventas(ventas, cache)
+    _libro(ventas, [4.0])
+    abrir_snapshot_ventas(ventas, cache)
+    nombres = {ruta.name for ruta in cache.iterdir()}
+    logger.info(f"Instantáneas en la caché: {nombres}")
+    assert nombres == {f"ventas1-{huella_archivo(ventas)[:16]}", f"ventas1-2024-{huella_archivo(otro)[:16]}"}
+
+# Caso de prueba 2: Se eliminan los temporales de publicaciones interrumpidas, no los de procesos activos
+def test_abandoned_temporary_snapshots_are_removed(tmp_path):
+    '''Caso de prueba 2: Validar que solo se eliminan los temporales cuyo proceso ya no existe.'''
+    cache = tmp_path / "cache"
+    abandonado = cache / "ventas1-0123456789abcdef.999999999.tmp"
+    activo = cache / f"ventas1-0123456789abcdef.{os.getppid()}.tmp"
+    otro_libro = cache / "ventas1-2024-0123456789abcdef.999999999.tmp"
+    for directorio in (abandonado, activo, otro_libro):
+        directorio.mkdir(parents=True)
+    abrir_snapshot_ventas(_libro(tmp_path / "ventas1.xlsx", [1.0]), cache)
+    assert not abandonado.exists()
+    assert activo.exists() and otro_libro.exists()
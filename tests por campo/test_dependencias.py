@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from dependencias import DEPENDENCIAS_VENTAS, Dependencia, verificar_dependencias, verificar_dependencias_archivo
+
+'''
+para ejecutar los casos
+
+pytest test_dependencias.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture(scope="module")
+def dependencias_ventas(datos_ventas):
+    '''Verificación de las dependencias declaradas de ventas, calculada una sola vez por módulo.'''
+    resultado = verificar_dependencias(datos_ventas, DEPENDENCIAS_VENTAS)
+    logger.info(f"Claves con más de un valor: {resultado.resumen()} ({resultado.segundos:.3f} s)")
+    return resultado
+
+def _esperadas(data, determinante, dependiente):
+    distintos = data.groupby(list(determinante))[dependiente].nunique()
+    return distintos[distintos > 1]
+
+# Caso de prueba 1: Interpretar las dependencias declaradas
+def test_parse_dependency():
+    '''Caso de prueba 1: Interpretar las dependencias declaradas'''
+    assert Dependencia.desde_texto("id_producto -> precio") == Dependencia(("id_producto",), "precio")
+    assert str(Dependencia.desde_texto(" nombre_producto ,region->categoria ")) == "nombre_producto, region -> categoria"
+    with pytest.raises(ValueError):
+        Dependencia.desde_texto("id_producto precio")
+
+# Caso de prueba 2: Las violaciones coinciden con groupby(A)[B].nunique() en ventas
+@pytest.mark.parametrize("dependencia", DEPENDENCIAS_VENTAS)
+def test_violations_match_groupby(datos_ventas, dependencias_ventas, dependencia):
+    '''Caso de prueba 2: Las violaciones coinciden con groupby(A)[B].nunique() en ventas'''
+    declarada = Dependencia.desde_texto(dependencia)
+    esperadas = _esperadas(datos_ventas, declarada.determinante, declarada.dependiente)
+    violaciones = dependencias_ventas.violaciones[dependencia]
+    assert len(violaciones) == len(esperadas)
+    assert sorted(violaciones["valores_distintos"]) == sorted(esperadas)
+    filas = datos_ventas[datos_ventas[declarada.dependiente].notna()][declarada.determinante[0]].value_counts()
+    assert violaciones["filas"].sum() == filas[esperadas.index].sum()
+
+# Caso de prueba 3: Validar que nombre_producto -> categoria falla solo por mayúsculas en 13 productos
+def test_nombre_producto_determines_categoria(dependencias_ventas):
+    '''Caso de prueba 3: Validar que nombre_producto -> categoria falla solo por mayúsculas en 13 productos'''
+    violaciones = dependencias_ventas.violaciones["nombre_producto -> categoria"]
+    logger.info(f"Productos con más de una categoría:\n{violaciones[['clave', 'valores']]}")
+    assert not dependencias_ventas.cumple("nombre_producto -> categoria")
+    assert len(violaciones) == 13
+    assert all(len({valor.lower() for valor in valores}) == 1 for valores in violaciones["valores"])
+    mouse = violaciones.set_index("clave").loc["Mouse"]
+    assert mouse["valores"] == {"Accesorios": 701, "accesorios": 11}
+
+# Caso de prueba 4: Volcar particiones a disco da el mismo resultado
+def test_spill_to_disk_same_result(datos_ventas, dependencias_ventas, tmp_path):
+    '''Caso de prueba 4: Volcar particiones a disco da el mismo resultado'''
+    bloques = (datos_ventas.iloc[inicio:inicio + 700] for inicio in range(0, len(datos_ventas), 700))
+    resultado = verificar_dependencias(bloques, DEPENDENCIAS_VENTAS, memoria_maxima=64 * 1024, dir_temporal=tmp_path)
+    logger.info(f"Particiones volcadas a disco: {resultado.particiones_volcadas}")
+    assert resultado.particiones_volcadas > 0
+    assert resultado.filas == len(datos_ventas)
+    for dependencia, violaciones in dependencias_ventas.violaciones.items():
+        assert resultado.violaciones[dependencia].equals(violaciones), dependencia
+    assert list(tmp_path.iterdir()) == []
+
+# Caso de prueba 5: Determinante de varias columnas, vacíos y valores iguales con distinto tipo
+def test_composite_keys_nulls_and_types():
+    '''Caso de prueba 5: Determinante de varias columnas, vacíos y valores iguales con distinto tipo'''
+    primero = pd.DataFrame({"id_producto": [1, 1, 2, 2, np.nan], "region": ["Sur", "Norte", "Sur", "Sur", "Sur"],
+                            "precio": [10, 11, 12, np.nan, 99]})
+    segundo = pd.DataFrame({"id_producto": [1.0, 2.0, 2.0], "region": ["Sur", "Sur", "Este"], "precio": [10.0, 12.0, 5.0]})
+    resultado = verificar_dependencias([primero, segundo], ["id_producto -> precio", "id_producto, region -> precio"])
+    simple = resultado.violaciones["id_producto -> precio"]
+    assert simple.to_dict("records") == [{"clave": "1", "valores_distintos": 2, "filas": 3, "primera_fila": 0,
+                                         "valores": {"10": 2, "11": 1}},
+                                        {"clave": "2", "valores_distintos": 2, "filas": 3, "primera_fila": 2,
+                                         "valores": {"12": 2, "5": 1}}]
+    assert resultado.cumple("id_producto, region -> precio")
+
+# Caso de prueba 6: Verificar un archivo CSV leyendo solo las columnas de las dependencias
+def test_check_csv_file(datos_ventas, dependencias_ventas, tmp_path):
+    '''Caso de prueba 6: Verificar un archivo CSV leyendo solo las columnas de las dependencias'''
+    ruta = tmp_path / "ventas.csv"
+    datos_ventas.to_csv(ruta, index=False)
+    resultado = verificar_dependencias_archivo(ruta, ["nombre_producto -> categoria"], tamano_bloque=1000)
+    assert resultado.filas == len(datos_ventas)
+    assert resultado.violaciones["nombre_producto -> categoria"].equals(
+        dependencias_ventas.violaciones["nombre_producto -> categoria"])
+
+# Caso de prueba 7: Enteros grandes (desde 2**53) en bloques float y object dan la misma clave
+def test_large_integer_keys_across_block_dtypes():
+    '''Caso de prueba 7: Enteros grandes (desde 2**53) en bloques float y object dan la misma clave'''
+    flotante = pd.DataFrame({"k": [1e20, 2.0**53, 3.5], "v": ["a", "b", "c"]})
+    objeto = pd.DataFrame({"k": pd.Series([10**20, 2**53, 3.5], dtype=object), "v": ["a", "b", "c"]})
+    resultado = verificar_dependencias([flotante, objeto], ["k -> v"])
+    assert resultado.cumple("k -> v"), f"Violaciones inesperadas: {resultado.violaciones['k -> v'].to_dict('records')}"
+    resultado = verificar_dependencias([flotante, objeto.assign(v=["a", "x", "c"])], ["k -> v"])
+    assert resultado.violaciones["k -> v"]["clave"].tolist() == [str(2**53)]
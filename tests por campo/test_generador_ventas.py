@@ -0,0 +1,120 @@
+import pytest
+import numpy as np
+import pandas as pd
+import logging
+
+from clasificador_fechas import clasificar_fechas
+from coercion import NO_CONVERTIBLE, convertir_columna
+from dataset_ventas import COLUMNAS_VENTAS
+from generador_ventas import PerfilVentas, escribir_ventas, generar_dataframe, generar_ventas
+
+'''
+para ejecutar los casos
+
+pytest test_generador_ventas.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FILAS = 200_000
+
+@pytest.fixture(scope="module")
+def perfil(datos_ventas):
+    return PerfilVentas.aprender(datos_ventas)
+
+@pytest.fixture(scope="module")
+def generados(perfil):
+    return generar_dataframe(perfil, FILAS, semilla=7, tamano_bloque=50_000)
+
+def proporcion(mascara):
+    return float(np.mean(mascara))
+
+# Caso de prueba 1: Los datos generados tienen el esquema de ventas y son reproducibles
+def test_schema_and_seed(perfil, generados, datos_ventas):
+    '''Caso de prueba 1: Validar columnas, tipos, cantidad de filas y reproducibilidad con la semilla.'''
+    assert len(generados) == FILAS and list(generados.columns) == COLUMNAS_VENTAS
+    assert (generados.dtypes == datos_ventas[COLUMNAS_VENTAS].dtypes).all()
+    assert generados.index.equals(pd.RangeIndex(FILAS))
+    primera = generar_dataframe(perfil, 5000, semilla=3, tamano_bloque=1000)
+    assert primera.equals(generar_dataframe(perfil, 5000, semilla=3, tamano_bloque=1000))
+    assert not primera.equals(generar_dataframe(perfil, 5000, semilla=4, tamano_bloque=1000))
+
+# Caso de prueba 2: La proporción de celdas vacías de cada columna se parece a la del archivo
+@pytest.mark.parametrize("columna", COLUMNAS_VENTAS)
+def test_null_rate(generados, datos_ventas, columna):
+    '''Caso de prueba 2: Comparar la proporción de vacíos de cada columna con la del archivo original.'''
+    esperada = proporcion(datos_ventas[columna].isna())
+    obtenida = proporcion(generados[columna].isna())
+    logger.info(f"Vacíos en '{columna}': archivo {esperada:.4f}, generados {obtenida:.4f}")
+    assert obtenida == pytest.approx(esperada, abs=0.002)
+
+# Caso de prueba 3: Se reproducen los defectos de las columnas de texto y numéricas
+@pytest.mark.parametrize("descripcion, calcular", [
+    ("precio con '$'", lambda data: data['precio'].astype(str).str.startswith('$')),
+    ("precio negativo", lambda data: data['precio'].astype(str).str.startswith('-')),
+    ("categoria con mojibake", lambda data: data['categoria'].str.contains('Ã', na=False)),
+    ("metodo_pago con mojibake", lambda data: data['metodo_pago'].str.contains('Ã', na=False)),
+    ("total_venta como texto", lambda data: data['total_venta'].map(lambda x: isinstance(x, str))),
+    ("total_venta no numérico", lambda data: convertir_columna(data['total_venta']).mascara(NO_CONVERTIBLE)),
+    ("fecha DD/MM/YYYY", lambda data: data['fecha_venta'].str.fullmatch(r'\d{2}/\d{2}/\d{4}', na=False)),
+])
+def test_defect_rates(generados, datos_ventas, descripcion, calcular):
+    '''Caso de prueba 3: Comparar la frecuencia de cada defecto con la del archivo original.'''
+    esperada = proporcion(calcular(datos_ventas))
+    obtenida = proporcion(calcular(generados))
+    logger.info(f"{descripcion}: archivo {esperada:.4f}, generados {obtenida:.4f}")
+    assert obtenida == pytest.approx(esperada, abs=0.005)
+
+# Caso de prueba 4: Las fechas generadas son válidas y están dentro del rango del archivo
+def test_dates_within_source_range(generados, datos_ventas):
+    '''Caso de prueba 4: Confirmar que las fechas reconocidas caen en el rango de fechas del archivo.'''
+    origen = clasificar_fechas(datos_ventas['fecha_venta']).serie_fechas()
+    fechas = clasificar_fechas(generados['fecha_venta']).serie_fechas()
+    assert fechas.notna().mean() > 0.98
+    assert fechas.min() >= origen.min() and fechas.max() <= origen.max()
+
+# Caso de prueba 5: La distribución de repeticiones de id_producto se conserva
+def test_id_repetition_distribution(generados, datos_ventas):
+    '''Caso de prueba 5: Comparar la proporción de identificadores repetidos 1, 2, 3 y 4 veces.'''
+    esperada = datos_ventas['id_producto'].value_counts().value_counts(normalize=True)
+    obtenida = generados['id_producto'].value_counts().value_counts(normalize=True)
+    logger.info(f"Repeticiones: archivo {esperada.round(3).to_dict()}, generados {obtenida.round(3).to_dict()}")
+    for repeticiones in [1, 2, 3, 4]:
+        assert obtenida[repeticiones] == pytest.approx(esperada[repeticiones], abs=0.01)
+
+# Caso de prueba 6: Cada nombre_producto aparece solo con las categorías con las que aparece en el archivo
+def test_product_category_pairs(generados, datos_ventas):
+    '''Caso de prueba 6: Validar que los pares nombre_producto y categoria existen en el archivo original.'''
+    pares = lambda data: set(data[['nombre_producto', 'categoria']].astype(str).itertuples(index=False, name=None))
+    assert pares(generados) <= pares(datos_ventas)
+
+# Caso de prueba 7: La mayoría de los totales son precio × cantidad, como en el archivo
+def test_total_consistency(perfil, generados):
+    '''Caso de prueba 7: Comparar la proporción de totales iguales a precio por cantidad con la del archivo.'''
+    precio = convertir_columna(generados['precio']).valores
+    total = convertir_columna(generados['total_venta']).valores
+    ambos = ~np.isnan(precio) & ~np.isnan(total)
+    consistentes = np.isclose(precio[ambos] * generados['cantidad_vendida'].to_numpy()[ambos], total[ambos], atol=0.01)
+    logger.info(f"Totales consistentes: archivo {perfil.total_consistente:.3f}, generados {consistentes.mean():.3f}")
+    assert consistentes.mean() == pytest.approx(perfil.total_consistente, abs=0.02)
+
+# Caso de prueba 8: Escritura por bloques en CSV y xlsx
+@pytest.mark.parametrize("formato", ["csv", "xlsx"])
+def test_write_file(perfil, tmp_path, formato):
+    '''Caso de prueba 8: Confirmar que el archivo escrito contiene las filas generadas.'''
+    ruta = escribir_ventas(perfil, 2500, tmp_path / f"ventas.{formato}", semilla=1, tamano_bloque=1000)
+    leidos = pd.read_csv(ruta) if formato == "csv" else pd.read_excel(ruta)
+    esperados = pd.concat(generar_ventas(perfil, 2500, semilla=1, tamano_bloque=1000))
+    assert list(leidos.columns) == COLUMNAS_VENTAS and len(leidos) == 2500
+    assert leidos['id_producto'].equals(esperados['id_producto'])
+    assert (leidos['precio'].astype(str) == esperados['precio'].astype(str)).mean() > 0.99
+
+# Caso de prueba 9: Escritura en Parquet (requiere pyarrow)
+def test_write_parquet(perfil, tmp_path):
+    '''Caso de prueba 9: Confirmar que el archivo Parquet contiene las filas generadas.'''
+    pytest.importorskip("pyarrow")
+    ruta = escribir_ventas(perfil, 2500, tmp_path / "ventas.parquet", semilla=1, tamano_bloque=1000)
+    assert len(pd.read_parquet(ruta)) == 2500
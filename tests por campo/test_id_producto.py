@@ -1,8 +1,9 @@
 import logging
-import pandas as pd
 import pytest
 from datetime import datetime
 
+from indice_duplicados import indice_duplicados
+
 '''
 @uthor: José Luis García Quinayás
 date: 21/11/2024
@@ -29,10 +30,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@pytest.fixture
-def load_data():
-    """Carga los datos desde el archivo Excel."""
-    return pd.read_excel("O:/productos/ventas1.xlsx")
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
+
+@pytest.fixture(scope="module")
+def indice_id_producto(datos_ventas):
+    '''Índice de duplicados de 'id_producto' (conteos, histograma de repeticiones y máscaras), construido una sola vez.'''
+    return indice_duplicados(datos_ventas, 'id_producto')
 
 # '''Caso de prueba 1: Identificar qué valores en la columna id_producto son únicos.'''
 def test_unique_values_in_id_producto(load_data):
@@ -43,40 +46,40 @@ def test_unique_values_in_id_producto(load_data):
     assert len(unique_values) > 0  # Asegurarse de que existen valores únicos
 
 # '''Caso de prueba 2: Contar cuántos valores únicos existen en la columna id_producto.'''
-def test_count_unique_values_in_id_producto(load_data):
+def test_count_unique_values_in_id_producto(indice_id_producto):
     """Caso de prueba 2: Contar valores únicos en id_producto."""
     # Contar valores únicos
-    unique_count = load_data['id_producto'].dropna().nunique()
+    unique_count = indice_id_producto.claves_distintas
     print(f"Total unique values: {unique_count}")
     assert unique_count > 0  # Asegurarse de que el conteo es mayor a 0
 
 # '''Caso de prueba 3: Confirmar que el número de valores únicos coincide con un valor específico (n).'''
-def test_specific_count_unique_values(load_data):
+def test_specific_count_unique_values(indice_id_producto):
     """Caso de prueba 3: Validar número específico de valores únicos."""
     n = 1716  # Aquí coloca el número específico esperado
-    unique_count = load_data['id_producto'].dropna().nunique()
+    unique_count = indice_id_producto.claves_distintas
     print(f"Expected: {n}, Found: {unique_count}")
     assert unique_count == n  # Cambia 'n' por el valor que desees comparar
 
 # '''Caso de prueba 4: Identificar qué registros tienen valores duplicados en la columna id_producto.'''
-def test_duplicated_values_in_id_producto(load_data):
+def test_duplicated_values_in_id_producto(load_data, indice_id_producto):
     """Caso de prueba 4: Identificar valores duplicados en id_producto."""
-    duplicated = load_data[load_data['id_producto'].duplicated(keep=False)]
+    duplicated = load_data[indice_id_producto.duplicado(keep=False)]
     print(f"Duplicated records:\n{duplicated}")
     assert not duplicated.empty  # Asegurarse de que existen duplicados
 
 # '''Caso de prueba 5: Contar cuántos valores duplicados existen en la columna id_producto.'''
-def test_count_duplicated_values(load_data):
+def test_count_duplicated_values(indice_id_producto):
     """Caso de prueba 5: Contar valores duplicados en id_producto."""
-    duplicate_count = load_data['id_producto'].duplicated(keep=False).sum()
+    duplicate_count = indice_id_producto.duplicado(keep=False).sum()
     print(f"Duplicate count: {duplicate_count}")
     assert duplicate_count > 0  # Asegurarse de que existen duplicados
 
 # '''Caso de prueba 6: Confirmar que el número de valores duplicados coincide con un valor específico (n).'''
-def test_specific_count_duplicated_values(load_data):
+def test_specific_count_duplicated_values(indice_id_producto):
     """Caso de prueba 6: Validar número específico de duplicados."""
     n = 4404  # Aquí coloca el número específico esperado
-    duplicate_count = load_data['id_producto'].duplicated(keep=False).sum()
+    duplicate_count = indice_id_producto.duplicado(keep=False).sum()
     print(f"Expected: {n}, Found: {duplicate_count}")
     assert duplicate_count == n  # Cambia 'n' por el valor que desees comparar
 
@@ -95,12 +98,12 @@ def test_numeric_values_in_id_producto(load_data):
     assert non_numeric.empty  # Asegurarse de que no hay valores no numéricos
 
 # '''Caso de prueba 9: Asegurar que duplicados estén vinculados al mismo nombre_producto.'''
-def test_duplicates_linked_to_same_name(load_data):
+def test_duplicates_linked_to_same_name(load_data, indice_id_producto):
     """Caso de prueba 9: Validar que duplicados estén asociados al mismo nombre_producto."""
-    duplicates = load_data[load_data['id_producto'].duplicated(keep=False)]
-    mismatch = duplicates.groupby('id_producto')['nombre_producto'].nunique().gt(1)
-    print(f"Duplicates with mismatched names:\n{duplicates[mismatch]}")
-    assert mismatch.sum() == 0  # Asegurarse de que no hay inconsistencias
+    # id_producto repetidos con más de un nombre_producto, y cuántos nombres distintos tiene cada uno
+    mismatch = indice_id_producto.inconsistentes(load_data['nombre_producto'])
+    print(f"Duplicates with mismatched names:\n{mismatch}")
+    assert len(mismatch) == 0  # Asegurarse de que no hay inconsistencias
 
 # '''Caso de prueba 10: Verificar que no existan registros con valores negativos en id_producto.'''
 def test_no_negative_values_in_id_producto(load_data):
@@ -117,11 +120,9 @@ def test_all_positive_values_in_id_producto(load_data):
     assert non_positive.empty  # Asegurarse de que todos sean positivos
 
 # Caso de prueba: Detectar cuántos id_producto tienen una cantidad específica de repeticiones
-def test_detect_repetition_counts(load_data):
+def test_detect_repetition_counts(indice_id_producto):
     '''Caso de prueba: Detectar cuántos id_producto tienen una cantidad específica de repeticiones.'''
-    data = load_data
-    repetition_counts = data['id_producto'].value_counts()
-    repetition_summary = repetition_counts.value_counts()  # Frecuencia de cada cantidad de repeticiones
+    repetition_summary = indice_id_producto.histograma()  # Frecuencia de cada cantidad de repeticiones
     logger.info(f"Resumen de repeticiones detectadas: \n{repetition_summary}")
     assert not repetition_summary.empty, "No se detectaron repeticiones en los id_producto."
 
@@ -136,11 +137,9 @@ def test_detect_repetition_counts(load_data):
     (7, 1)      # 1 id_producto se repite exactamente 7 veces
 ])
 
-def test_validate_repetition_counts(load_data, repetition, expected_count):
+def test_validate_repetition_counts(indice_id_producto, repetition, expected_count):
     '''Caso de prueba: Validar las cantidades detectadas de id_producto para cada repetición.'''
-    data = load_data
-    repetition_counts = data['id_producto'].value_counts()
-    actual_count = repetition_counts.value_counts().get(repetition, 0)  # Cuántos valores tienen la repetición esperada
+    actual_count = indice_id_producto.histograma().get(repetition, 0)  # Cuántos valores tienen la repetición esperada
     logger.info(f"{actual_count} id_producto se repiten exactamente {repetition} veces (esperado: {expected_count}).")
     assert actual_count == expected_count, (
         f"Se esperaban {expected_count} id_producto con {repetition} repeticiones, pero se encontraron {actual_count}."
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from indice_duplicados import IndiceDuplicados, indice_duplicados
+
+'''
+para ejecutar los casos
+
+pytest test_indice_duplicados.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture(scope="module")
+def claves():
+    return pd.Series(np.random.default_rng(7).integers(0, 400, size=2000), name="id_producto")
+
+# Caso de prueba 1: Histograma y conteos iguales a value_counts
+def test_histogram_matches_value_counts(claves):
+    '''Caso de prueba 1: Histograma y conteos iguales a value_counts'''
+    indice = IndiceDuplicados(claves)
+    assert indice.histograma().to_dict() == claves.value_counts().value_counts().to_dict()
+    assert indice.conteos().sort_index().to_dict() == claves.value_counts().sort_index().to_dict()
+    assert indice.claves_distintas == claves.nunique()
+    assert indice.repeticiones(claves[0]) == (claves == claves[0]).sum()
+    assert indice.repeticiones(-1) == 0
+
+# Caso de prueba 2: Máscaras iguales a duplicated para cada keep
+@pytest.mark.parametrize("keep", ["first", "last", False])
+def test_mask_matches_duplicated(claves, keep):
+    '''Caso de prueba 2: Máscaras iguales a duplicated para cada keep'''
+    assert (IndiceDuplicados(claves).duplicado(keep=keep) == claves.duplicated(keep=keep).to_numpy()).all()
+
+# Caso de prueba 3: Posiciones de los registros de cada clave
+def test_positions(claves):
+    '''Caso de prueba 3: Posiciones de los registros de cada clave'''
+    indice = IndiceDuplicados(claves)
+    for clave in claves[:20]:
+        assert indice.posiciones(clave).tolist() == np.flatnonzero(claves.to_numpy() == clave).tolist()
+    assert len(indice.posiciones(-1)) == 0
+
+# Caso de prueba 4: Agregar registros por partes da el mismo índice que construirlo de una vez
+def test_incremental_append(claves):
+    '''Caso de prueba 4: Agregar registros por partes da el mismo índice que construirlo de una vez'''
+    completo = IndiceDuplicados(claves)
+    indice = IndiceDuplicados(claves[:700])
+    primero = indice.posiciones(claves[0]).tolist()
+    indice.agregar(claves[700:1500]).agregar(claves[1500:])
+    assert len(indice) == len(claves)
+    assert indice.histograma().equals(completo.histograma())
+    for keep in ["first", "last", False]:
+        assert (indice.duplicado(keep=keep) == completo.duplicado(keep=keep)).all()
+    assert indice.posiciones(claves[0]).tolist()[:len(primero)] == primero
+    assert indice.posiciones(claves[0]).tolist() == completo.posiciones(claves[0]).tolist()
+
+# Caso de prueba 5: Vacíos y claves de distinto tipo
+def test_nulls_and_mixed_keys():
+    '''Caso de prueba 5: Vacíos y claves de distinto tipo'''
+    serie = pd.Series([1, np.nan, 2, np.nan, 1, "a"])
+    indice = IndiceDuplicados(serie[:2]).agregar(serie[2:])
+    for keep in ["first", "last", False]:
+        assert (indice.duplicado(keep=keep) == serie.duplicated(keep=keep).to_numpy()).all()
+    assert indice.histograma().to_dict() == {1: 2, 2: 1}
+    assert indice.claves_distintas == 3
+
+# Caso de prueba 6: Claves repetidas con más de un valor en otra columna
+def test_inconsistent_keys():
+    '''Caso de prueba 6: Claves repetidas con más de un valor en otra columna'''
+    data = pd.DataFrame({"id_producto": [1, 1, 2, 2, 3, 4, 4, 4],
+                         "nombre_producto": ["Mouse", "Mouse", "Monitor", "Teclado", "Audio", "Laptop", np.nan, "Tablet"]})
+    inconsistentes = indice_duplicados(data, "id_producto").inconsistentes(data["nombre_producto"])
+    esperado = data[data["id_producto"].duplicated(keep=False)].groupby("id_producto")["nombre_producto"].nunique()
+    assert inconsistentes.to_dict() == esperado[esperado > 1].to_dict() == {2: 2, 4: 2}
+    assert indice_duplicados(data, "id_producto") is indice_duplicados(data, "id_producto")
+
+# Caso de prueba 7: Vacíos que llegan como float y como objeto en bloques de distinto tipo
+def test_nulls_across_block_types():
+    '''Caso de prueba 7: Vacíos que llegan como float y como objeto en bloques de distinto tipo'''
+    bloques = [pd.Series([1.0, None]), pd.Series([2, None], dtype=object), pd.Series([3.0, np.nan]),
+               pd.Series([None, 1], dtype=object)]
+    indice = IndiceDuplicados(bloques[0])
+    for bloque in bloques[1:]:
+        indice.agregar(bloque)
+    serie = pd.concat(bloques, ignore_index=True).astype(float)
+    for keep in ["first", "last", False]:
+        assert (indice.duplicado(keep=keep) == serie.duplicated(keep=keep).to_numpy()).all()
+    assert indice.claves_distintas == serie.nunique() == 3
+    assert indice.conteos().sort_index().to_dict() == serie.value_counts().sort_index().to_dict()
+    assert indice.posiciones(np.nan).tolist() == [1, 3, 5, 6]
@@ -0,0 +1,68 @@
+import pytest
+import pandas as pd
+import logging
+
+from dataset_ventas import COLUMNAS_VENTAS
+from lector_bd import cargar_ventas_bd, leer_tabla_por_bloques
+from lector_streaming import resumir_columna
+
+'''
+para ejecutar los casos
+
+pytest test_lectura_bd.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bloques pequeños para que la tabla se recorra en varias partes
+TAMANO_BLOQUE = 1000
+
+# Caso de prueba 1: Los bloques leídos de la tabla tienen las mismas filas y tipos que el archivo
+def test_table_blocks_match_file(pool_ventas, datos_ventas):
+    '''Caso de prueba 1: Confirmar que la lectura por bloques de la tabla entrega los mismos datos que el archivo.'''
+    with pool_ventas.conexion() as conexion:
+        bloques = list(leer_tabla_por_bloques(conexion, "ventas", tamano_bloque=TAMANO_BLOQUE, dialecto=pool_ventas.dialecto))
+    logger.info(f"Bloques leídos: {len(bloques)}")
+    assert len(bloques) == -(-len(datos_ventas) // TAMANO_BLOQUE)
+    assert all(len(bloque) <= TAMANO_BLOQUE for bloque in bloques), "Se encontró un bloque más grande que el tamaño indicado."
+    for columna in COLUMNAS_VENTAS:
+        completa = pd.concat([bloque[columna] for bloque in bloques])
+        assert completa.dtype == datos_ventas[columna].dtype, f"El tipo de la columna '{columna}' no coincide."
+        assert completa.equals(datos_ventas[columna]), f"Los valores de la columna '{columna}' no coinciden."
+
+# Caso de prueba 2: Resumen de la columna 'precio' calculado bloque a bloque desde la tabla
+@pytest.mark.parametrize("metric, expected_value", [
+    ("filas", 6120),
+    ("nulos", 35),
+    ("textos", 6085),
+    ("minimo", -844.33),
+    ("maximo", 849.91),
+])
+def test_table_streaming_summary_of_price(pool_ventas, metric, expected_value):
+    '''Caso de prueba 2: Validar el resumen de precio leyendo solo esa columna de la tabla.'''
+    with pool_ventas.conexion() as conexion:
+        bloques = leer_tabla_por_bloques(conexion, "ventas", tamano_bloque=TAMANO_BLOQUE, columnas=['precio'])
+        resumen = resumir_columna(bloques, 'precio', prefijos=['$'])
+    result = getattr(resumen, metric)
+    logger.info(f"{metric} en 'precio': {result}")
+    assert result == expected_value, f"Se esperaba {expected_value}, pero se encontró {result}."
+
+# Caso de prueba 3: Una lectura interrumpida deja la conexión lista para otra consulta
+def test_interrupted_read_releases_connection(pool_ventas):
+    '''Caso de prueba 3: Confirmar que abandonar la lectura a mitad de la tabla no deja resultados pendientes.'''
+    with pool_ventas.conexion() as conexion:
+        bloques = leer_tabla_por_bloques(conexion, "ventas", tamano_bloque=TAMANO_BLOQUE)
+        primero = next(bloques)
+        bloques.close()
+        assert len(primero) == TAMANO_BLOQUE
+        assert conexion.execute("SELECT COUNT(*) FROM ventas").fetchone() == (6120,)
+
+# Caso de prueba 4: Los datos cargados desde la tabla sirven para las fixtures de los casos de cada campo
+def test_load_from_table_for_fixtures(pool_ventas, datos_ventas):
+    '''Caso de prueba 4: Validar que cargar_ventas_bd arma el mismo DataFrame que la lectura del archivo.'''
+    data = cargar_ventas_bd(pool_ventas, tamano_bloque=TAMANO_BLOQUE)
+    pd.testing.assert_frame_equal(data, datos_ventas[COLUMNAS_VENTAS])
+    assert data.index.equals(pd.RangeIndex(len(datos_ventas)))
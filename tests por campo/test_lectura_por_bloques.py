@@ -0,0 +1,56 @@
+import pytest
+import pandas as pd
+import logging
+
+from lector_streaming import leer_por_bloques, resumir_columna
+
+'''
+para ejecutar los casos
+
+pytest test_lectura_por_bloques.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bloques pequeños para que el archivo de prueba se recorra en varias partes
+TAMANO_BLOQUE = 1000
+
+# Caso de prueba 1: La lectura por bloques entrega las mismas filas y tipos que pd.read_excel
+def test_blocks_match_full_read(ruta_datos_ventas, datos_ventas):
+    '''Caso de prueba 1: Confirmar que la lectura por bloques entrega las mismas filas y tipos que la lectura completa.'''
+    bloques = list(leer_por_bloques(ruta_datos_ventas, tamano_bloque=TAMANO_BLOQUE))
+    logger.info(f"Bloques leídos: {len(bloques)}")
+    assert all(len(bloque) <= TAMANO_BLOQUE for bloque in bloques), "Se encontró un bloque más grande que el tamaño indicado."
+    for columna in ['id_producto', 'precio', 'cantidad_vendida', 'total_venta', 'fecha_venta', 'region']:
+        completa = pd.concat([bloque[columna] for bloque in bloques])
+        assert completa.dtype == datos_ventas[columna].dtype, f"El tipo de la columna '{columna}' no coincide."
+        assert completa.equals(datos_ventas[columna]), f"Los valores de la columna '{columna}' no coinciden."
+
+# Caso de prueba 2: Resumen de la columna 'precio' calculado bloque a bloque
+@pytest.mark.parametrize("metric, expected_value", [
+    ("filas", 6120),
+    ("nulos", 35),
+    ("textos", 6085),
+    ("minimo", -844.33),
+    ("maximo", 849.91),
+])
+def test_streaming_summary_of_price(ruta_datos_ventas, metric, expected_value):
+    '''Caso de prueba 2: Validar el resumen de la columna precio calculado bloque a bloque.'''
+    bloques = leer_por_bloques(ruta_datos_ventas, tamano_bloque=TAMANO_BLOQUE, columnas=['precio'])
+    resumen = resumir_columna(bloques, 'precio')
+    result = getattr(resumen, metric)
+    logger.info(f"{metric} en 'precio': {result}")
+    assert result == expected_value, f"Se esperaba {expected_value}, pero se encontró {result}."
+
+# Caso de prueba 3: Prefijos '$' y '-' de la columna 'precio' contados bloque a bloque
+@pytest.mark.parametrize("prefix, expected_count", [("$", 225), ("-", 492)])
+def test_streaming_prefix_counts_in_price(ruta_datos_ventas, prefix, expected_count):
+    '''Caso de prueba 3: Contar bloque a bloque los registros de precio que empiezan con un prefijo.'''
+    bloques = leer_por_bloques(ruta_datos_ventas, tamano_bloque=TAMANO_BLOQUE, columnas=['precio'])
+    resumen = resumir_columna(bloques, 'precio', prefijos=[prefix])
+    result = resumen.conteo_prefijos[prefix]
+    logger.info(f"Registros que empiezan con {prefix} en 'precio': {result}")
+    assert result == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {result}."
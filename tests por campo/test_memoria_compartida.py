@@ -0,0 +1,58 @@
+import multiprocessing
+import pytest
+import pandas as pd
+import logging
+
+from memoria_compartida import DatosCompartidos
+
+'''
+para ejecutar los casos
+
+pytest test_memoria_compartida.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def compartidos(datos_ventas):
+    '''Publica los datos de la sesión en un segmento de memoria compartida y lo elimina al terminar.'''
+    compartidos = DatosCompartidos.publicar(datos_ventas)
+    yield compartidos
+    compartidos.liberar()
+
+def _resumen_en_otro_proceso(descripcion, cola):
+    '''Se adjunta al segmento desde otro proceso y devuelve algunos valores de control.'''
+    adjuntos = DatosCompartidos.adjuntar(descripcion)
+    data = adjuntos.a_dataframe()
+    cola.put((len(data), int(data['cantidad_vendida'].sum()), int(data['precio'].isna().sum()),
+              int((data['region'] == 'Centro').sum())))
+    adjuntos.liberar()
+
+# Caso de prueba 1: Los datos adjuntados desde el segmento son iguales a los de la sesión
+def test_attached_frame_matches_session_data(compartidos, datos_ventas):
+    '''Caso de prueba 1: Confirmar que el DataFrame reconstruido desde la memoria compartida es igual al original.'''
+    adjuntos = DatosCompartidos.adjuntar(compartidos.descripcion)
+    data = adjuntos.a_dataframe()
+    pd.testing.assert_frame_equal(data, datos_ventas)
+    # Las columnas numéricas se leen directamente del segmento y no se pueden modificar
+    assert not data['cantidad_vendida'].to_numpy().flags.writeable, "La columna compartida se puede modificar."
+    logger.info(f"Segmento '{compartidos.segmento.name}' de {compartidos.segmento.size} bytes")
+    adjuntos.liberar()
+
+# Caso de prueba 2: Otro proceso se adjunta al segmento sin leer el archivo
+def test_other_process_reads_shared_segment(compartidos, datos_ventas):
+    '''Caso de prueba 2: Validar que otro proceso obtiene los mismos valores desde la memoria compartida.'''
+    contexto = multiprocessing.get_context("spawn")
+    cola = contexto.Queue()
+    proceso = contexto.Process(target=_resumen_en_otro_proceso, args=(compartidos.descripcion, cola))
+    proceso.start()
+    result = cola.get(timeout=60)
+    proceso.join(timeout=60)
+    expected = (len(datos_ventas), int(datos_ventas['cantidad_vendida'].sum()), int(datos_ventas['precio'].isna().sum()),
+                int((datos_ventas['region'] == 'Centro').sum()))
+    logger.info(f"Valores leídos por el otro proceso: {result}")
+    assert proceso.exitcode == 0, f"El proceso terminó con código {proceso.exitcode}."
+    assert result == expected, f"Se esperaba {expected}, pero se encontró {result}."
@@ -1,7 +1,8 @@
-import pandas as pd
 import pytest
 import logging
 
+from multipatron import buscar_patrones
+
 '''
 @uthor: José Luis García Quinayás
 date: 03/12/2024
@@ -27,31 +28,31 @@ pytest test_metodo_pago.py -v --tb=short --log-cli-level=INFO --html=report_meto
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def load_data():
-    '''Carga los datos desde el archivo Excel especificado.'''
-    # Cargar el archivo
-    file_path = "O:/productos/ventas1.xlsx"
-    data = pd.read_excel(file_path)
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
 
 special_char = ['Ã³', 'Ã©', 'Ã¡', 'Ã']
 
+# Textos que se buscan en 'metodo_pago'; todos se buscan juntos con una sola pasada por la columna
+patrones_metodo_pago = special_char + ['Efectivo', 'PayPal', 'Tarjeta de CrÃ©dito']
+
+@pytest.fixture(scope="module")
+def coincidencias_metodo_pago(datos_ventas):
+    '''Máscaras de todos los patrones de 'metodo_pago', calculadas una sola vez por módulo.'''
+    return buscar_patrones(datos_ventas['metodo_pago'], patrones_metodo_pago)
+
 # Caso de prueba 1: Identificar registros con caracteres especiales en 'metodo_pago'
-def test_find_special_characters(load_data):
+def test_find_special_characters(coincidencias_metodo_pago):
     '''Caso de prueba 1: Identificar registros con caracteres especiales en la columna "metodo_pago".'''
-    data = load_data
-    special_characters = data['metodo_pago'].str.contains('|'.join(special_char), na=False)
+    special_characters = coincidencias_metodo_pago.alguno(special_char)
     special_count = special_characters.sum()
     logger.info(f"Total de registros con caracteres especiales: {special_count}")
     assert special_count > 0, "No se encontraron registros con caracteres especiales"
 
 # Caso de prueba 2: Verificar que haya exactamente 1577 registros con caracteres especiales
 @pytest.mark.parametrize("expected_count", [1577])
-def test_exact_special_characters_count(load_data, expected_count):
+def test_exact_special_characters_count(coincidencias_metodo_pago, expected_count):
     '''Caso de prueba 2: Verificar que haya exactamente 1577 registros con caracteres especiales en "metodo_pago".'''
-    data = load_data
-    special_count = data['metodo_pago'].str.contains('|'.join(special_char), na=False).sum()
+    special_count = coincidencias_metodo_pago.alguno(special_char).sum()
     if special_count == expected_count:
         logger.info(f"Efectivamente hay {special_count} registros con caracteres especiales en la columna 'metodo_pago'")
     else:
@@ -59,19 +60,17 @@ def test_exact_special_characters_count(load_data, expected_count):
         assert special_count == expected_count, f"Se esperaban {expected_count} registros con caracteres especiales, pero se encontraron {special_count}"
 
 # Caso de prueba 3: Contar registros con el nombre "Efectivo"
-def test_find_efectivo(load_data):
+def test_find_efectivo(coincidencias_metodo_pago):
     '''Caso de prueba 3: Contar registros con el nombre "Efectivo" en la columna "metodo_pago".'''
-    data = load_data
-    efectivo_count = data['metodo_pago'].str.contains("Efectivo", na=False).sum()
+    efectivo_count = coincidencias_metodo_pago["Efectivo"].sum()
     logger.info(f"Total de registros con el nombre 'Efectivo': {efectivo_count}")
     assert efectivo_count > 0, "No se encontraron registros con el nombre 'Efectivo'"
 
 # Caso de prueba 4: Confirmar que hay exactamente 1517 registros con "Efectivo"
 @pytest.mark.parametrize("expected_count", [1517])
-def test_exact_efectivo_count(load_data, expected_count):
+def test_exact_efectivo_count(coincidencias_metodo_pago, expected_count):
     '''Caso de prueba 4: Confirmar que hay exactamente 1517 registros con "Efectivo" en "metodo_pago".'''
-    data = load_data
-    efectivo_count = data['metodo_pago'].str.contains("Efectivo", na=False).sum()
+    efectivo_count = coincidencias_metodo_pago["Efectivo"].sum()
     if efectivo_count == expected_count:
         logger.info(f"Efectivamente hay {efectivo_count} registros con nombre 'Efectivo' en la columna 'metodo_pago'")
     else:
@@ -79,19 +78,17 @@ def test_exact_efectivo_count(load_data, expected_count):
         assert efectivo_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {efectivo_count}"
 
 # Caso de prueba 5: Contar registros con el nombre "PayPal"
-def test_find_pay_pal(load_data):
+def test_find_pay_pal(coincidencias_metodo_pago):
     '''Caso de prueba 5: Contar registros con el nombre "PayPal" en la columna "metodo_pago".'''
-    data = load_data
-    pay_pal_count = data['metodo_pago'].str.contains("PayPal", na=False).sum()
+    pay_pal_count = coincidencias_metodo_pago["PayPal"].sum()
     logger.info(f"Total de registros con el nombre 'PayPal': {pay_pal_count}")
     assert pay_pal_count > 0, "No se encontraron registros con el nombre 'PayPal'"
 
 # Caso de prueba 6: Confirmar que hay exactamente 1523 registros con "PayPal"
 @pytest.mark.parametrize("expected_count", [1523])
-def test_exact_pay_pal_count(load_data, expected_count):
+def test_exact_pay_pal_count(coincidencias_metodo_pago, expected_count):
     '''Caso de prueba 6: Confirmar que hay exactamente 1523 registros con el nombre "PayPal".'''
-    data = load_data
-    pay_pal_count = data['metodo_pago'].str.contains("PayPal", na=False).sum()
+    pay_pal_count = coincidencias_metodo_pago["PayPal"].sum()
     if pay_pal_count == expected_count:
         logger.info(f"Efectivamente hay {pay_pal_count} registros con nombre 'PayPal' en la columna 'metodo_pago'")
     else:
@@ -99,19 +96,17 @@ def test_exact_pay_pal_count(load_data, expected_count):
         assert pay_pal_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {pay_pal_count}"
 
 # Caso de prueba 7: Contar registros con el nombre "Tarjeta de CrÃ©dito"
-def test_find_e(load_data):
+def test_find_e(coincidencias_metodo_pago):
     '''Caso de prueba 7: Contar registros con el nombre "Tarjeta de CrÃ©dito" en la columna "metodo_pago".'''
-    data = load_data
-    e_count = data['metodo_pago'].str.contains("Tarjeta de CrÃ©dito", na=False).sum()
+    e_count = coincidencias_metodo_pago["Tarjeta de CrÃ©dito"].sum()
     logger.info(f"Total de registros con el nombre 'Tarjeta de CrÃ©dito': {e_count}")
     assert e_count > 0, "No se encontraron registros con el nombre 'Tarjeta de CrÃ©dito'"
 
 # Caso de prueba 8: Confirmar que hay exactamente 1577 registros con "Tarjeta de CrÃ©dito"
 @pytest.mark.parametrize("expected_count", [1577])
-def test_exact_e_count(load_data, expected_count):
+def test_exact_e_count(coincidencias_metodo_pago, expected_count):
     '''Caso de prueba 8: Confirmar que hay exactamente 1577 registros con el nombre "Tarjeta de CrÃ©dito".'''
-    data = load_data
-    e_count = data['metodo_pago'].str.contains("Tarjeta de CrÃ©dito", na=False).sum()
+    e_count = coincidencias_metodo_pago["Tarjeta de CrÃ©dito"].sum()
     if e_count == expected_count:
         logger.info(f"Efectivamente hay {e_count} registros con nombre 'Tarjeta de CrÃ©dito' en la columna 'metodo_pago'")
     else:
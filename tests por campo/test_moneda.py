@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from coercion import (AMBIGUO, NO_CONVERTIBLE, NULO, NUMERO, TEXTO_MONEDA, TEXTO_NUMERICO, convertir_columna,
+                      convertir_moneda, interpretar_importe)
+
+'''
+para ejecutar los casos
+
+pytest test_moneda.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Caso de prueba 1: Símbolos, signos y separadores según el formato
+@pytest.mark.parametrize("texto, decimal, valor, estado", [
+    ("$150.51", ".", 150.51, TEXTO_MONEDA),
+    ("$-9.9", ".", -9.9, TEXTO_MONEDA),
+    ("-$9.9", ".", -9.9, TEXTO_MONEDA),
+    ("(15.20)", ".", -15.2, TEXTO_MONEDA),
+    ("15.20-", ".", -15.2, TEXTO_MONEDA),
+    ("USD 1,234.50", ".", 1234.5, TEXTO_MONEDA),
+    ("1.234,56 €", ",", 1234.56, TEXTO_MONEDA),
+    ("1 234,56", ",", 1234.56, TEXTO_MONEDA),
+    ("-13.82", ".", -13.82, TEXTO_NUMERICO),
+    ("7", ",", 7.0, TEXTO_NUMERICO),
+    ("1.234,56", ".", np.nan, NO_CONVERTIBLE),
+    ("1,23,4", ".", np.nan, NO_CONVERTIBLE),
+    ("2024 01 15", ".", np.nan, NO_CONVERTIBLE),
+    ("1'2'3", ".", np.nan, NO_CONVERTIBLE),
+    ("12 34", ",", np.nan, NO_CONVERTIBLE),
+    ("1'234.56", ".", 1234.56, TEXTO_MONEDA),
+    ("0,123", ".", np.nan, NO_CONVERTIBLE),
+    ("$0,123", ".", np.nan, NO_CONVERTIBLE),
+    ("$012,345", ".", np.nan, NO_CONVERTIBLE),
+    ("0,123", ",", 0.123, TEXTO_MONEDA),
+    ("$-(5)", ".", np.nan, NO_CONVERTIBLE),
+    ("$N/A", ".", np.nan, NO_CONVERTIBLE),
+    ("Total inconsistente", ".", np.nan, NO_CONVERTIBLE),
+])
+def test_interpret_amount(texto, decimal, valor, estado):
+    '''Caso de prueba 1: Símbolos, signos y separadores según el formato'''
+    resultado = interpretar_importe(texto, decimal)
+    assert resultado[1] == estado
+    np.testing.assert_equal(resultado[0], valor)
+
+# Caso de prueba 2: Con decimal=None se detecta el formato y se marcan los textos ambiguos
+@pytest.mark.parametrize("texto, valor, estado", [
+    ("1.234,56", 1234.56, TEXTO_MONEDA),
+    ("1,234.56", 1234.56, TEXTO_MONEDA),
+    ("1.234.567", 1234567.0, TEXTO_MONEDA),
+    ("12,5", 12.5, TEXTO_MONEDA),
+    ("0,125", 0.125, TEXTO_MONEDA),
+    ("1,234", np.nan, AMBIGUO),
+])
+def test_detect_decimal_separator(texto, valor, estado):
+    '''Caso de prueba 2: Con decimal=None se detecta el formato y se marcan los textos ambiguos'''
+    resultado = interpretar_importe(texto, None)
+    assert resultado[1] == estado
+    np.testing.assert_equal(resultado[0], valor)
+
+# Caso de prueba 3: La serie se convierte igual que con convertir_columna en los valores que esta ya convierte
+def test_series_matches_plain_conversion():
+    '''Caso de prueba 3: La serie se convierte igual que con convertir_columna en los valores que esta ya convierte'''
+    serie = pd.Series(["10.5", 3, None, "$1,200.00", "$-9.9", "1000", "x", "$150.51", "$150.51"] * 3, name="precio")
+    moneda = convertir_moneda(serie)
+    simple = convertir_columna(serie)
+    np.testing.assert_array_equal(moneda.valores[simple.validos], simple.valores[simple.validos])
+    assert moneda.serie().tolist()[:9] == pytest.approx([10.5, 3, np.nan, 1200.0, -9.9, 1000.0, np.nan, 150.51, 150.51],
+                                                       nan_ok=True)
+    assert moneda.estado.tolist()[:9] == [TEXTO_NUMERICO, NUMERO, NULO, TEXTO_MONEDA, TEXTO_MONEDA, TEXTO_NUMERICO,
+                                          NO_CONVERTIBLE, TEXTO_MONEDA, TEXTO_MONEDA]
+    assert moneda.validos.sum() == 21
+    with pytest.raises(ValueError):
+        convertir_moneda(serie, decimal=";")
+
+# Caso de prueba 4: El resultado no depende del camino (pd.to_numeric o interpretar_importe) que toma el texto
+@pytest.mark.parametrize("decimal", [".", ",", None])
+@pytest.mark.parametrize("texto", ["inf", "1e5", "5.", "$5.", "5", "-7", " 12 "])
+def test_same_grammar_on_every_path(texto, decimal):
+    '''Caso de prueba 4: El resultado no depende del camino (pd.to_numeric o interpretar_importe) que toma el texto'''
+    columna = convertir_moneda(pd.Series([texto, texto]), decimal=decimal)
+    valor, estado = interpretar_importe(texto, decimal)
+    assert columna.estado.tolist() == [estado, estado]
+    np.testing.assert_equal(columna.valores[0], valor)
+    if texto in ("inf", "1e5", "5.", "$5."):
+        assert estado == NO_CONVERTIBLE
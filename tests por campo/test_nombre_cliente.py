@@ -1,7 +1,8 @@
-import pandas as pd
 import pytest
 import logging
 
+from multipatron import buscar_patrones
+
 '''
 @uthor: José Luis García Quinayás
 date: 02/12/2024
@@ -27,31 +28,31 @@ pytest test_nombre_cliente.py -v --tb=short --log-cli-level=INFO --html=report_n
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def load_data():
-    '''Carga los datos desde el archivo Excel especificado.'''
-    # Cargar el archivo
-    file_path = "O:/productos/ventas1.xlsx"
-    data = pd.read_excel(file_path)
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
 
 special_char = ['Ã³', 'Ã©', 'Ã¡', 'Ã']
 
+# Textos que se buscan en 'nombre_cliente'; todos se buscan juntos con una sola pasada por la columna
+patrones_nombre_cliente = special_char + ['Miguel Torres', 'Carlos', 'Ana']
+
+@pytest.fixture(scope="module")
+def coincidencias_nombre_cliente(datos_ventas):
+    '''Máscaras de todos los patrones de 'nombre_cliente', calculadas una sola vez por módulo.'''
+    return buscar_patrones(datos_ventas['nombre_cliente'], patrones_nombre_cliente)
+
 # Caso de prueba 1: Identificar registros con caracteres especiales en 'nombre_cliente'
-def test_find_special_characters(load_data):
+def test_find_special_characters(coincidencias_nombre_cliente):
     '''Caso de prueba 1: Identificar registros con caracteres especiales en la columna "nombre_cliente".'''
-    data = load_data
-    special_characters = data['nombre_cliente'].str.contains('|'.join(special_char), na=False)
+    special_characters = coincidencias_nombre_cliente.alguno(special_char)
     special_count = special_characters.sum()
     logger.info(f"Total de registros con caracteres especiales: {special_count}")
     assert special_count > 0, "No se encontraron registros con caracteres especiales"
 
 # Caso de prueba 2: Verificar que haya exactamente 5316 registros con caracteres especiales
 @pytest.mark.parametrize("expected_count", [5316])
-def test_exact_special_characters_count(load_data, expected_count):
+def test_exact_special_characters_count(coincidencias_nombre_cliente, expected_count):
     '''Caso de prueba 2: Verificar que haya exactamente 5316 registros con caracteres especiales en "nombre_cliente".'''
-    data = load_data
-    special_count = data['nombre_cliente'].str.contains('|'.join(special_char), na=False).sum()
+    special_count = coincidencias_nombre_cliente.alguno(special_char).sum()
     if special_count == expected_count:
         logger.info(f"Efectivamente hay {special_count} registros con caracteres especiales en la columna 'nombre_cliente'")
     else:
@@ -59,19 +60,17 @@ def test_exact_special_characters_count(load_data, expected_count):
         assert special_count == expected_count, f"Se esperaban {expected_count} registros con caracteres especiales, pero se encontraron {special_count}"
 
 # Caso de prueba 3: Contar registros con el nombre "Miguel Torres"
-def test_find_miguel_torres(load_data):
+def test_find_miguel_torres(coincidencias_nombre_cliente):
     '''Caso de prueba 3: Contar registros con el nombre "Miguel Torres" en la columna "nombre_cliente".'''
-    data = load_data
-    miguel_count = data['nombre_cliente'].str.contains("Miguel Torres", na=False).sum()
+    miguel_count = coincidencias_nombre_cliente["Miguel Torres"].sum()
     logger.info(f"Total de registros con el nombre 'Miguel Torres': {miguel_count}")
     assert miguel_count > 0, "No se encontraron registros con el nombre 'Miguel Torres'"
 
 # Caso de prueba 4: Confirmar que hay exactamente 761 registros con "Miguel Torres"
 @pytest.mark.parametrize("expected_count", [761])
-def test_exact_miguel_torres_count(load_data, expected_count):
+def test_exact_miguel_torres_count(coincidencias_nombre_cliente, expected_count):
     '''Caso de prueba 4: Confirmar que hay exactamente 761 registros con "Miguel Torres" en "nombre_cliente".'''
-    data = load_data
-    miguel_count = data['nombre_cliente'].str.contains("Miguel Torres", na=False).sum()
+    miguel_count = coincidencias_nombre_cliente["Miguel Torres"].sum()
     if miguel_count == expected_count:
         logger.info(f"Efectivamente hay {miguel_count} registros con nombre 'Miguel Torres' en la columna 'nombre_cliente'")
     else:
@@ -79,19 +78,17 @@ def test_exact_miguel_torres_count(load_data, expected_count):
         assert miguel_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {miguel_count}"
 
 # Caso de prueba 5: Contar registros con el nombre "Carlos"
-def test_find_carlos(load_data):
+def test_find_carlos(coincidencias_nombre_cliente):
     '''Caso de prueba 5: Contar registros con el nombre "Carlos" en la columna "nombre_cliente".'''
-    data = load_data
-    carlos_count = data['nombre_cliente'].str.contains("Carlos", na=False).sum()
+    carlos_count = coincidencias_nombre_cliente["Carlos"].sum()
     logger.info(f"Total de registros con el nombre 'Carlos': {carlos_count}")
     assert carlos_count > 0, "No se encontraron registros con el nombre 'Carlos'"
 
 # Caso de prueba 6: Confirmar que hay exactamente 747 registros con "Carlos"
 @pytest.mark.parametrize("expected_count", [747])
-def test_exact_carlos_count(load_data, expected_count):
+def test_exact_carlos_count(coincidencias_nombre_cliente, expected_count):
     '''Caso de prueba 6: Confirmar que hay exactamente 747 registros con el nombre "Carlos".'''
-    data = load_data
-    carlos_count = data['nombre_cliente'].str.contains("Carlos", na=False).sum()
+    carlos_count = coincidencias_nombre_cliente["Carlos"].sum()
     if carlos_count == expected_count:
         logger.info(f"Efectivamente hay {carlos_count} registros con nombre 'Carlos' en la columna 'nombre_cliente'")
     else:
@@ -99,19 +96,17 @@ def test_exact_carlos_count(load_data, expected_count):
         assert carlos_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {carlos_count}"
 
 # Caso de prueba 7: Contar registros con el nombre "Ana"
-def test_find_ana(load_data):
+def test_find_ana(coincidencias_nombre_cliente):
     '''Caso de prueba 7: Contar registros con el nombre "Ana" en la columna "nombre_cliente".'''
-    data = load_data
-    ana_count = data['nombre_cliente'].str.contains("Ana", na=False).sum()
+    ana_count = coincidencias_nombre_cliente["Ana"].sum()
     logger.info(f"Total de registros con el nombre 'Ana': {ana_count}")
     assert ana_count > 0, "No se encontraron registros con el nombre 'Ana'"
 
 # Caso de prueba 8: Confirmar que hay exactamente 742 registros con "Ana"
 @pytest.mark.parametrize("expected_count", [742])
-def test_exact_ana_count(load_data, expected_count):
+def test_exact_ana_count(coincidencias_nombre_cliente, expected_count):
     '''Caso de prueba 8: Confirmar que hay exactamente 742 registros con el nombre "Ana".'''
-    data = load_data
-    ana_count = data['nombre_cliente'].str.contains("Ana", na=False).sum()
+    ana_count = coincidencias_nombre_cliente["Ana"].sum()
     if ana_count == expected_count:
         logger.info(f"Efectivamente hay {ana_count} registros con nombre 'Ana' en la columna 'nombre_cliente'")
     else:
@@ -159,19 +154,17 @@ def test_exact_empty_names_count(load_data, expected_count):
         assert empty_names_count == expected_count, f"Se esperaban {expected_count} registros vacíos, pero se encontraron {empty_names_count}"
 
 # Caso de prueba 13: Contar registros con el carácter especial "Ã³"
-def test_find_special_character_ao(load_data):
+def test_find_special_character_ao(coincidencias_nombre_cliente):
     '''Caso de prueba 13: Contar registros con el carácter especial "Ã³" en la columna "nombre_cliente".'''
-    data = load_data
-    ao_count = data['nombre_cliente'].str.contains("Ã³", na=False).sum()
+    ao_count = coincidencias_nombre_cliente["Ã³"].sum()
     logger.info(f"Total de registros con el carácter especial 'Ã³': {ao_count}")
     assert ao_count > 0, "No se encontraron registros con el carácter especial 'Ã³'"
 
 # Caso de prueba 14: Confirmar que hay exactamente 1544 registros con "Ã³"
 @pytest.mark.parametrize("expected_count", [1544])
-def test_exact_special_character_ao_count(load_data, expected_count):
+def test_exact_special_character_ao_count(coincidencias_nombre_cliente, expected_count):
     '''Caso de prueba 14: Confirmar que hay exactamente 1544 registros con el carácter especial "Ã³".'''
-    data = load_data
-    ao_count = data['nombre_cliente'].str.contains("Ã³", na=False).sum()
+    ao_count = coincidencias_nombre_cliente["Ã³"].sum()
     if ao_count == expected_count:
         logger.info(f"Efectivamente hay {ao_count} registros que contienen el caracter especial Ã³ en la columna 'nombre_cliente'")
     else:
@@ -179,19 +172,17 @@ def test_exact_special_character_ao_count(load_data, expected_count):
         assert ao_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {ao_count}"
 
 # Caso de prueba 15: Contar registros con el carácter especial "Ã©"
-def test_find_special_character_ae(load_data):
+def test_find_special_character_ae(coincidencias_nombre_cliente):
     '''Caso de prueba 15: Contar registros con el carácter especial "Ã©" en la columna "nombre_cliente".'''
-    data = load_data
-    ae_count = data['nombre_cliente'].str.contains("Ã©", na=False).sum()
+    ae_count = coincidencias_nombre_cliente["Ã©"].sum()
     logger.info(f"Total de registros con el carácter especial 'Ã©': {ae_count}")
     assert ae_count > 0, "No se encontraron registros con el carácter especial 'Ã©'"
 
 # Caso de prueba 16: Confirmar que hay exactamente 743 registros con "Ã©"
 @pytest.mark.parametrize("expected_count", [743])
-def test_exact_special_character_ae_count(load_data, expected_count):
+def test_exact_special_character_ae_count(coincidencias_nombre_cliente, expected_count):
     '''Caso de prueba 16: Confirmar que hay exactamente 743 registros con el carácter especial "Ã©".'''
-    data = load_data
-    ae_count = data['nombre_cliente'].str.contains("Ã©", na=False).sum()
+    ae_count = coincidencias_nombre_cliente["Ã©"].sum()
     if ae_count == expected_count:
         logger.info(f"Efectivamente hay {ae_count} registros que contienen el caracter especial Ã© en la columna 'nombre_cliente'")
     else:
@@ -218,6 +209,22 @@ def test_exact_numeric_names_count(load_data, expected_count):
         logger.error(f"Error: Se esperaba el valor {expected_count}, pero se encontró {numeric_count}.")
         assert numeric_count == expected_count, f"Se esperaban {expected_count} registros numéricos, pero se encontraron {numeric_count}"
 
+# Caso de prueba 19: Los registros con doble codificación son los que tienen caracteres especiales
+def test_double_encoded_names_match_special_characters(load_data, coincidencias_nombre_cliente):
+    '''Caso de prueba 19: Los registros con doble codificación en "nombre_cliente" son los que tienen caracteres especiales.'''
+    corrupta = load_data.reparada('nombre_cliente').corrupta
+    logger.info(f"Registros con doble codificación en 'nombre_cliente': {corrupta.sum()}")
+    assert (corrupta.to_numpy() == coincidencias_nombre_cliente.alguno(special_char)).all(), "La máscara de doble codificación no coincide con los caracteres especiales"
+
+# Caso de prueba 20: Los nombres reparados no conservan caracteres especiales
+def test_repaired_names_without_special_characters(load_data):
+    '''Caso de prueba 20: Los nombres reparados de "nombre_cliente" no conservan caracteres especiales y recuperan los acentos.'''
+    reparada = load_data.reparada('nombre_cliente')
+    restantes = reparada.diccionario_reparado.evaluar(lambda valores: valores.str.contains('|'.join(special_char), na=False)).sum()
+    logger.info(f"Traducciones de 'nombre_cliente': {reparada.traducciones()}")
+    assert restantes == 0, f"Quedaron {restantes} registros con caracteres especiales después de reparar"
+    assert reparada.traducciones()['MarÃ\xada LÃ³pez'] == 'María López'
+
 @pytest.mark.parametrize(
     "test_name, validation_function, expected_value",
     [
@@ -1,4 +1,3 @@
-import pandas as pd
 import pytest
 import re
 import logging
@@ -28,18 +27,13 @@ pytest test_nombre_producto.py -v --tb=short --log-cli-level=INFO --html=report_
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-@pytest.fixture
-def load_data():
-    '''Carga los datos desde el archivo especificado.'''
-    file_path = "O:/productos/ventas1.xlsx"
-    data = pd.read_excel(file_path)
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
 
 # Caso de prueba 1: Identificar registros con caracteres especiales en nombre_producto
 def test_find_special_characters(load_data):
     '''Caso de prueba 1: Identificar si hay registros con caracteres especiales en la columna nombre_producto.'''
     data = load_data
-    special_chars = data['nombre_producto'].apply(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
+    special_chars = data.diccionario('nombre_producto').aplicar(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
     logger.info(f"Registros con caracteres especiales encontrados: {special_chars.sum()}")
     assert special_chars.any(), "No se encontraron caracteres especiales en nombre_producto."
 
@@ -47,7 +41,7 @@ def test_find_special_characters(load_data):
 def test_count_special_characters(load_data):
     '''Caso de prueba 2: Contar los registros con caracteres especiales en la columna nombre_producto.'''
     data = load_data
-    special_chars = data['nombre_producto'].apply(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
+    special_chars = data.diccionario('nombre_producto').aplicar(lambda x: bool(re.search(r'[^A-Za-z0-9\s]', str(x))))
     logger.info(f"Total de registros con caracteres especiales: {special_chars.sum()}")
     assert special_chars.sum() >= 0, "Error en el conteo de caracteres especiales."
 
@@ -58,7 +52,7 @@ def test_validate_special_count(load_data, expected_count):
     data = load_data
     # Identificar caracteres especiales usando una expresión regular
     special_pattern = re.compile(r'[^a-zA-Z0-9\s]')  # Caracteres especiales: no alfanuméricos y no espacios
-    special_count = data['nombre_producto'].apply(lambda x: bool(special_pattern.search(x)) if isinstance(x, str) else False).sum()
+    special_count = data.diccionario('nombre_producto').aplicar(lambda x: bool(special_pattern.search(x)) if isinstance(x, str) else False).sum()
     
     # Log de resultados
     logger.info(f"Registros con caracteres especiales: {special_count} (esperados: {expected_count})")
@@ -70,7 +64,7 @@ def test_validate_special_count(load_data, expected_count):
 def test_find_teclado(load_data):
     '''Caso de prueba 4: Identificar registros en la columna nombre_producto con el valor "Teclado".'''
     data = load_data
-    teclado_records = data['nombre_producto'].str.contains('Teclado', na=False)
+    teclado_records = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Teclado', na=False))
     logger.info(f"Registros con 'Teclado' encontrados: {teclado_records.sum()}")
     assert teclado_records.any(), "No se encontraron registros con el valor 'Teclado'."
 
@@ -78,7 +72,7 @@ def test_find_teclado(load_data):
 def test_count_teclado(load_data):
     '''Caso de prueba 5: Contar cuántos registros tienen el valor "Teclado".'''
     data = load_data
-    teclado_count = data['nombre_producto'].str.contains('Teclado', na=False).sum()
+    teclado_count = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Teclado', na=False)).sum()
     logger.info(f"Total de registros con el valor 'Teclado': {teclado_count}")
     assert teclado_count >= 0, "Error en el conteo de 'Teclado'."
 
@@ -87,7 +81,7 @@ def test_count_teclado(load_data):
 def test_validate_teclado_count(load_data, expected_count):
     '''Caso de prueba 6: Validar si la cantidad de registros con el nombre "Teclado" corresponde a un valor específico (n).'''
     data = load_data
-    teclado_count = data['nombre_producto'].str.contains('Teclado', na=False).sum()
+    teclado_count = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Teclado', na=False)).sum()
     logger.info(f"Registros con 'Teclado': {teclado_count} (esperados: {expected_count})")
     assert teclado_count == expected_count, f"Se esperaban {expected_count} 'Teclado', pero se encontraron {teclado_count}."
 
@@ -95,7 +89,7 @@ def test_validate_teclado_count(load_data, expected_count):
 def test_find_mouse(load_data):
     '''Caso de prueba 7: Identificar registros en la columna nombre_producto con el valor "Mouse".'''
     data = load_data
-    mouse_records = data['nombre_producto'].str.contains('Mouse', na=False)
+    mouse_records = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Mouse', na=False))
     logger.info(f"Registros con 'Mouse' encontrados: {mouse_records.sum()}")
     assert mouse_records.any(), "No se encontraron registros con el valor 'Mouse'."
 
@@ -103,7 +97,7 @@ def test_find_mouse(load_data):
 def test_count_mouse(load_data):
     '''Caso de prueba 8: Contar cuántos registros tienen el valor "Mouse".'''
     data = load_data
-    mouse_count = data['nombre_producto'].str.contains('Mouse', na=False).sum()
+    mouse_count = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Mouse', na=False)).sum()
     logger.info(f"Total de registros con el valor 'Mouse': {mouse_count}")
     assert mouse_count >= 0, "Error en el conteo de 'Mouse'."
 
@@ -112,7 +106,7 @@ def test_count_mouse(load_data):
 def test_validate_mouse_count(load_data, expected_count):
     '''Caso de prueba 9: Validar si la cantidad de registros con el nombre "Mouse" corresponde a un valor específico (n).'''
     data = load_data
-    mouse_count = data['nombre_producto'].str.contains('Mouse', na=False).sum()
+    mouse_count = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Mouse', na=False)).sum()
     logger.info(f"Registros con 'Mouse': {mouse_count} (esperados: {expected_count})")
     assert mouse_count == expected_count, f"Se esperaban {expected_count} 'Mouse', pero se encontraron {mouse_count}."
 
@@ -120,7 +114,7 @@ def test_validate_mouse_count(load_data, expected_count):
 def test_find_auriculares(load_data):
     """Caso de prueba 10: Identificar registros con el valor 'Auriculares' en la columna nombre_producto."""
     data = load_data
-    auriculares_records = data['nombre_producto'].str.contains('Auriculares', na=False)
+    auriculares_records = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Auriculares', na=False))
     logger.info(f"Registros con 'Auriculares' encontrados: {auriculares_records.sum()}")
     assert auriculares_records.any(), "No se encontraron registros con el valor 'Auriculares'."
 
@@ -128,7 +122,7 @@ def test_find_auriculares(load_data):
 def test_count_auriculares(load_data):
     """Caso de prueba 11: Contar registros con el valor 'Auriculares'."""
     data = load_data
-    auriculares_count = data['nombre_producto'].str.contains('Auriculares', na=False).sum()
+    auriculares_count = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Auriculares', na=False)).sum()
     logger.info(f"Total de registros con el valor 'Auriculares': {auriculares_count}")
     assert auriculares_count >= 0, "Error en el conteo de 'Auriculares'."
 
@@ -137,7 +131,7 @@ def test_count_auriculares(load_data):
 def test_validate_auriculares_count(load_data, expected_count):
     '''Caso de prueba 12: Validar si la cantidad de registros con el nombre "Auriculares" corresponde a un valor específico (n).'''
     data = load_data
-    auriculares_count = data['nombre_producto'].str.contains('Auriculares', na=False).sum()
+    auriculares_count = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Auriculares', na=False)).sum()
     logger.info(f"Registros con 'Auriculares': {auriculares_count} (esperados: {expected_count})")
     assert auriculares_count == expected_count, f"Se esperaban {expected_count} 'Auriculares', pero se encontraron {auriculares_count}."
 
@@ -145,7 +139,7 @@ def test_validate_auriculares_count(load_data, expected_count):
 def test_count_starts_with_a(load_data):
     """Caso de prueba 13: Contar registros en nombre_producto que comienzan con 'A'."""
     data = load_data
-    starts_with_a = data['nombre_producto'].str.startswith('A', na=False)
+    starts_with_a = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('A', na=False))
     logger.info(f"Registros que comienzan con 'A': {starts_with_a.sum()}")
     assert starts_with_a.sum() >= 0, "Error al contar registros que comienzan con 'A'."
 
@@ -154,7 +148,7 @@ def test_count_starts_with_a(load_data):
 def test_validate_starts_with_a_count(load_data, expected_count):
     """Caso de prueba 14: Validar número específico de registros que comienzan con 'A'."""
     data = load_data
-    starts_with_a = data['nombre_producto'].str.startswith('A', na=False).sum()
+    starts_with_a = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('A', na=False)).sum()
     logger.info(f"Registros que comienzan con 'A': {starts_with_a} (esperados: {expected_count})")
     assert starts_with_a == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {starts_with_a}."
 
@@ -162,7 +156,7 @@ def test_validate_starts_with_a_count(load_data, expected_count):
 def test_count_starts_with_e(load_data):
     """Caso de prueba 15: Contar registros en nombre_producto que comienzan con 'E'."""
     data = load_data
-    starts_with_e = data['nombre_producto'].str.startswith('e', na=False)
+    starts_with_e = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('e', na=False))
     logger.info(f"Registros que comienzan con 'E': {starts_with_e.sum()}")
     assert starts_with_e.sum() >= 0, "Error al contar registros que comienzan con 'E'."
 
@@ -171,7 +165,7 @@ def test_count_starts_with_e(load_data):
 def test_validate_starts_with_e_count(load_data, expected_count):
     """Caso de prueba 16: Validar número específico de registros que comienzan con 'E'."""
     data = load_data
-    starts_with_e = data['nombre_producto'].str.startswith('e', na=False).sum()
+    starts_with_e = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('e', na=False)).sum()
     logger.info(f"Registros que comienzan con 'E': {starts_with_e} (esperados: {expected_count})")
     assert starts_with_e == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {starts_with_e}."
 
@@ -179,7 +173,7 @@ def test_validate_starts_with_e_count(load_data, expected_count):
 def test_count_starts_with_t_mayus(load_data):
     """Caso de prueba 17: Contar registros en nombre_producto que comienzan con 'T'."""
     data = load_data
-    starts_with_t_mayus = data['nombre_producto'].str.startswith('T', na=False)
+    starts_with_t_mayus = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('T', na=False))
     logger.info(f"Registros que comienzan con 'T': {starts_with_t_mayus.sum()}")
     assert starts_with_t_mayus.sum() >= 0, "Error al contar registros que comienzan con 'T'."
 
@@ -188,7 +182,7 @@ def test_count_starts_with_t_mayus(load_data):
 def test_validate_starts_with_t_count_mayus(load_data, expected_count):            
     """Caso de prueba 18: Validar número específico de registros que comienzan con 'T'."""
     data = load_data
-    starts_with_t_mayus = data['nombre_producto'].str.startswith('T', na=False).sum()
+    starts_with_t_mayus = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('T', na=False)).sum()
     logger.info(f"Registros que comienzan con 'T': {starts_with_t_mayus} (esperados: {expected_count})")
     assert starts_with_t_mayus == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {starts_with_t_mayus}."
 
@@ -196,7 +190,7 @@ def test_validate_starts_with_t_count_mayus(load_data, expected_count):
 def test_count_starts_with_s(load_data):
     """Caso de prueba 19: Contar registros en nombre_producto que comienzan con 'S'."""
     data = load_data
-    starts_with_s = data['nombre_producto'].str.startswith('s', na=False)
+    starts_with_s = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('s', na=False))
     logger.info(f"Registros que comienzan con 'S': {starts_with_s.sum()}")
     assert starts_with_s.sum() >= 0, "Error al contar registros que comienzan con 'S'."
 
@@ -205,7 +199,7 @@ def test_count_starts_with_s(load_data):
 def test_validate_starts_with_s_count(load_data, expected_count):
     """Caso de prueba 20: Validar número específico de registros que comienzan con 'S'."""
     data = load_data
-    starts_with_s = data['nombre_producto'].str.startswith('s', na=False).sum()
+    starts_with_s = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('s', na=False)).sum()
     logger.info(f"Registros que comienzan con 'S': {starts_with_s} (esperados: {expected_count})")
     assert starts_with_s == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {starts_with_s}."
 
@@ -213,7 +207,7 @@ def test_validate_starts_with_s_count(load_data, expected_count):
 def test_count_starts_with_m(load_data):
     """Caso de prueba 21: Contar registros en nombre_producto que comienzan con 'M'."""
     data = load_data
-    starts_with_m = data['nombre_producto'].str.startswith('M', na=False)
+    starts_with_m = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('M', na=False))
     logger.info(f"Registros que comienzan con 'M': {starts_with_m.sum()}")
     assert starts_with_m.sum() >= 0, "Error al contar registros que comienzan con 'M'."
 
@@ -222,7 +216,7 @@ def test_count_starts_with_m(load_data):
 def test_validate_starts_with_m_count(load_data, expected_count):
     """Caso de prueba 22: Validar número específico de registros que comienzan con 'M'."""
     data = load_data
-    starts_with_m = data['nombre_producto'].str.startswith('M', na=False).sum()
+    starts_with_m = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('M', na=False)).sum()
     logger.info(f"Registros que comienzan con 'M': {starts_with_m} (esperados: {expected_count})")
     assert starts_with_m == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {starts_with_m}."
 
@@ -230,7 +224,7 @@ def test_validate_starts_with_m_count(load_data, expected_count):
 def test_count_starts_with_t_minus(load_data):
     """Caso de prueba: Contar registros en nombre_producto que comienzan con 't'."""
     data = load_data
-    starts_with_t_minus = data['nombre_producto'].str.startswith('t', na=False)
+    starts_with_t_minus = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('t', na=False))
     logger.info(f"Registros que comienzan con 't': {starts_with_t_minus.sum()}")
     assert starts_with_t_minus.sum() >= 0, "Error al contar registros que comienzan con 't'."
 
@@ -239,7 +233,7 @@ def test_count_starts_with_t_minus(load_data):
 def test_validate_starts_with_t_count_minus(load_data, expected_count):
     """Caso de prueba Validar número específico de registros que comienzan con 't'."""
     data = load_data
-    starts_with_t_minus = data['nombre_producto'].str.startswith('t', na=False).sum()
+    starts_with_t_minus = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith('t', na=False)).sum()
     logger.info(f"Registros que comienzan con 't': {starts_with_t_minus} (esperados: {expected_count})")
     assert starts_with_t_minus == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {starts_with_t_minus}."
 
@@ -255,7 +249,7 @@ def test_null_or_empty_nombre_producto(load_data):
 def test_nombre_producto_no_numbers(load_data):
     """Caso de prueba 24: Asegurar que nombre_producto no contenga valores numéricos."""
     data = load_data
-    contains_numbers = data['nombre_producto'].apply(lambda x: bool(re.search(r'\d', str(x))))
+    contains_numbers = data.diccionario('nombre_producto').aplicar(lambda x: bool(re.search(r'\d', str(x))))
     logger.info(f"Registros con números en nombre_producto: {contains_numbers.sum()}")
     assert contains_numbers.sum() == 0, "Se encontraron valores numéricos en nombre_producto."
 
@@ -263,7 +257,7 @@ def test_nombre_producto_no_numbers(load_data):
 def test_count_special_characters_o(load_data):
     """Caso de prueba 25: Contar registros con el carácter especial 'Ã¡'."""
     data = load_data
-    contains_special_char_o = data['nombre_producto'].str.contains('Ã¡', na=False)
+    contains_special_char_o = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Ã¡', na=False))
     logger.info(f"Registros con el carácter especial 'Ã¡': {contains_special_char_o.sum()}")
     assert contains_special_char_o.sum() >= 0, "Error al contar registros con 'Ã¡'."
 
@@ -271,7 +265,7 @@ def test_count_special_characters_o(load_data):
 def test_count_special_characters_dot(load_data):
     """Caso de prueba 26: Contar registros con el carácter especial 'Ã©'."""
     data = load_data
-    contains_special_char_dot = data['nombre_producto'].str.contains('Ã©', na=False)
+    contains_special_char_dot = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains('Ã©', na=False))
     logger.info(f"Registros con el carácter especial 'Ã©': {contains_special_char_dot.sum()}")
     assert contains_special_char_dot.sum() >= 0, "Error al contar registros con 'Ã©'."
 
@@ -313,13 +307,13 @@ def test_filter_nombre_producto(load_data, filter_type, filter_value, expected_c
 
     if filter_type == "word":
         # Filtrar por palabra específica
-        filtered = data['nombre_producto'].str.contains(filter_value, na=False)
+        filtered = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains(filter_value, na=False))
     elif filter_type == "letter":
         # Filtrar por letra inicial
-        filtered = data['nombre_producto'].str.startswith(filter_value, na=False)
+        filtered = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.startswith(filter_value, na=False))
     elif filter_type == "special":
         # Filtrar por carácter especial
-        filtered = data['nombre_producto'].str.contains(filter_value, na=False)
+        filtered = data.diccionario('nombre_producto').evaluar(lambda valores: valores.str.contains(filter_value, na=False))
     else:
         pytest.fail(f"Tipo de filtro desconocido: {filter_type}")
 
@@ -0,0 +1,131 @@
+import csv
+import json
+import subprocess
+import sys
+import textwrap
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+import logging
+
+from plugin_mediciones import MedidorPruebas, _mediciones, columna_de
+
+'''
+para ejecutar los casos
+
+pytest test_plugin_mediciones.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CASOS = '''
+import time
+import pytest
+
+@pytest.fixture
+def datos_pesados():
+    time.sleep(0.05)
+    return bytearray(8 * 2**20)
+
+def test_preparacion_costosa(datos_pesados):
+    assert len(datos_pesados) > 0
+
+def test_cuerpo_costoso():
+    time.sleep(0.05)
+    assert len(bytearray(4 * 2**20)) > 0
+
+def test_falla():
+    assert False
+'''
+
+EJECUTAR = '''
+import sys
+import pytest
+from plugin_mediciones import MedidorPruebas
+sys.exit(pytest.main([sys.argv[1], "-q", "-p", "no:cacheprovider"], plugins=[MedidorPruebas(sys.argv[2], top=2, memoria=True)]))
+'''
+
+@pytest.fixture(scope="module")
+def mediciones(tmp_path_factory):
+    '''Ejecuta una sesión de pytest aparte con el medidor y devuelve las mediciones y la salida de consola.'''
+    directorio = tmp_path_factory.mktemp("sesion")
+    (directorio / "test_casos.py").write_text(textwrap.dedent(CASOS), encoding="utf-8")
+    salida = directorio / "mediciones.json"
+    proceso = subprocess.run([sys.executable, "-c", EJECUTAR, str(directorio / "test_casos.py"), str(salida)],
+                             cwd=Path(__file__).parent, capture_output=True, text=True)
+    logger.info(proceso.stdout)
+    contenido = json.loads(salida.read_text(encoding="utf-8"))
+    return {prueba["prueba"].split("::")[-1]: prueba for prueba in contenido["pruebas"]}, proceso.stdout
+
+# Caso de prueba 1: El costo de las fixtures queda en setup y el del caso en call
+def test_setup_and_body_measured_separately(mediciones):
+    '''Caso de prueba 1: Confirmar que el tiempo y la memoria de la fixture se separan del cuerpo del caso.'''
+    pruebas, _ = mediciones
+    preparacion = pruebas["test_preparacion_costosa"]
+    cuerpo = pruebas["test_cuerpo_costoso"]
+    assert preparacion["setup"]["segundos"] >= 0.05 and preparacion["call"]["segundos"] < 0.05
+    assert preparacion["setup"]["memoria_pico_mb"] >= 8
+    assert cuerpo["call"]["segundos"] >= 0.05 and cuerpo["setup"]["segundos"] < 0.05
+    assert cuerpo["call"]["memoria_pico_mb"] >= 4
+
+# Caso de prueba 2: Cada caso registra su resultado
+def test_outcomes_recorded(mediciones):
+    '''Caso de prueba 2: Validar que se guarda el resultado de cada caso.'''
+    pruebas, _ = mediciones
+    assert {nombre: prueba["resultado"] for nombre, prueba in pruebas.items()} == {
+        "test_preparacion_costosa": "passed", "test_cuerpo_costoso": "passed", "test_falla": "failed"}
+
+# Caso de prueba 3: Al final se muestra la tabla de los casos más lentos
+def test_slowest_table_in_summary(mediciones):
+    '''Caso de prueba 3: Confirmar que el resumen de consola lista los casos más lentos.'''
+    _, consola = mediciones
+    assert "2 casos más lentos" in consola
+    tabla = consola.split("2 casos más lentos")[1].splitlines()[1:]
+    tabla = "\n".join(tabla[:next(i for i, linea in enumerate(tabla) if linea.startswith("="))])
+    assert "test_preparacion_costosa" in tabla and "test_cuerpo_costoso" in tabla and "test_falla" not in tabla
+
+# Caso de prueba 4: La columna se toma del nombre del módulo o de la regla
+@pytest.mark.parametrize("item, esperada", [
+    (SimpleNamespace(path=Path("test_precio.py")), "precio"),
+    (SimpleNamespace(path=Path("test_fecha_venta.py")), "fecha_venta"),
+    (SimpleNamespace(path=Path("test_conciliacion.py")), None),
+    (SimpleNamespace(path=Path("reglas_ventas.json"), regla=SimpleNamespace(columna="region")), "region"),
+])
+def test_column_tag(item, esperada):
+    '''Caso de prueba 4: Validar la columna asignada a cada caso.'''
+    assert columna_de(item) == esperada
+
+# Caso de prueba 5: Resumen en CSV con una fila por fase
+def test_csv_output(tmp_path):
+    '''Caso de prueba 5: Confirmar el formato del resumen en CSV.'''
+    medidor = MedidorPruebas()
+    for fase in ("setup", "call", "teardown"):
+        medidor.pytest_runtest_logreport(SimpleNamespace(
+            nodeid="test_precio.py::test_max", when=fase, outcome="passed",
+            medicion={"segundos": 0.5, "cpu_segundos": 0.25, "memoria_pico_mb": 1.0, "modulo": "test_precio.py", "columna": "precio"}))
+    with open(medidor.escribir(tmp_path / "mediciones.csv"), encoding="utf-8") as archivo:
+        filas = list(csv.DictReader(archivo))
+    assert [fila["fase"] for fila in filas] == ["setup", "call", "teardown"]
+    assert filas[1]["columna"] == "precio" and filas[1]["resultado"] == "passed" and float(filas[1]["segundos"]) == 0.5
+    assert medidor.resumen_por_columna()["precio"]["segundos"] == pytest.approx(1.5)
+    assert medidor.resumen_por_columna()["precio"]["memoria_pico_mb"] == 1.0
+
+# Caso de prueba 6: Sin memoria=True (--medir-memoria) solo se miden tiempos, sin tracemalloc
+def test_memory_tracing_is_opt_in():
+    '''Caso de prueba 6: Confirmar que por defecto el medidor no activa tracemalloc.'''
+    medidor = MedidorPruebas()
+    medidor.pytest_sessionstart(SimpleNamespace())
+    item = SimpleNamespace(stash={})
+    fase = medidor._medir(item, "call")
+    next(fase)
+    assert not tracemalloc.is_tracing()
+    next(fase, None)
+    assert set(item.stash[_mediciones]["call"]) == {"segundos", "cpu_segundos"}
+    medidor.pytest_runtest_logreport(SimpleNamespace(
+        nodeid="test_precio.py::test_max", when="call", outcome="passed",
+        medicion={**item.stash[_mediciones]["call"], "modulo": "test_precio.py", "columna": "precio"}))
+    assert "memoria_pico_mb" not in medidor.resumen_por_columna()["precio"]
@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+import pytest
+import logging
+
+from plugin_reporte import leer_reporte, renderizar_html, resumir_reporte
+
+'''
+para ejecutar los casos
+
+pytest test_plugin_reporte.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CASOS = '''
+import json
+import os
+import pytest
+
+@pytest.fixture
+def rota():
+    raise RuntimeError("fixture rota")
+
+def test_pasa():
+    assert True
+
+def test_ya_escrito():
+    # El caso anterior ya está en el disco mientras la sesión sigue corriendo
+    with open(os.environ["RUTA_REPORTE"], encoding="utf-8") as archivo:
+        pruebas = [json.loads(linea).get("prueba", "") for linea in archivo]
+    assert any(prueba.endswith("::test_pasa") for prueba in pruebas)
+
+def test_falla():
+    assert 1 == 2, "<total> distinto"
+
+def test_error_en_preparacion(rota):
+    pass
+
+@pytest.mark.skip(reason="sin datos")
+def test_omitido():
+    pass
+'''
+
+EJECUTAR = '''
+import sys
+import pytest
+from plugin_reporte import ReporteIncremental
+sys.exit(pytest.main([sys.argv[1], "-q", "-p", "no:cacheprovider"], plugins=[ReporteIncremental(sys.argv[2])]))
+'''
+
+@pytest.fixture(scope="module")
+def reporte(tmp_path_factory):
+    '''Ejecuta una sesión de pytest aparte con el reporte y devuelve la ruta del JSONL.'''
+    directorio = tmp_path_factory.mktemp("sesion")
+    (directorio / "test_casos.py").write_text(textwrap.dedent(CASOS), encoding="utf-8")
+    ruta = directorio / "reporte.jsonl"
+    proceso = subprocess.run([sys.executable, "-c", EJECUTAR, str(directorio / "test_casos.py"), str(ruta)],
+                             cwd=Path(__file__).parent, capture_output=True, text=True,
+                             env={**os.environ, "RUTA_REPORTE": str(ruta)})
+    logger.info(proceso.stdout)
+    return ruta
+
+# Caso de prueba 1: Una línea por caso, entre la línea de inicio y la de fin
+def test_one_line_per_case(reporte):
+    '''
+    Caso de prueba 1: Una línea por caso, entre la línea de inicio y la de fin
+    '''
+    registros = list(leer_reporte(reporte))
+    assert registros[0]["tipo"] == "sesion"
+    assert registros[-1]["tipo"] == "fin"
+    assert [registro["tipo"] for registro in registros[1:-1]] == ["caso"] * 5
+    assert registros[-1]["totales"] == {"passed": 2, "failed": 1, "error": 1, "skipped": 1}
+
+# Caso de prueba 2: Resultado y mensaje de cada caso
+def test_outcomes_and_messages(reporte):
+    '''
+    Caso de prueba 2: Resultado y mensaje de cada caso
+    '''
+    casos = {registro["prueba"].split("::")[-1]: registro for registro in leer_reporte(reporte) if registro["tipo"] == "caso"}
+    assert casos["test_ya_escrito"]["resultado"] == "passed"
+    assert casos["test_falla"]["resultado"] == "failed"
+    assert "<total> distinto" in casos["test_falla"]["mensaje"]
+    assert casos["test_error_en_preparacion"]["resultado"] == "error"
+    assert "fixture rota" in casos["test_error_en_preparacion"]["mensaje"]
+    assert casos["test_omitido"]["resultado"] == "skipped"
+    assert casos["test_omitido"]["mensaje"] == "Skipped: sin datos"
+
+# Caso de prueba 3: El resumen HTML se genera al terminar la sesión con las fallas escapadas
+def test_html_summary(reporte):
+    '''
+    Caso de prueba 3: El resumen HTML se genera al terminar la sesión con las fallas escapadas
+    '''
+    contenido = reporte.with_suffix(".html").read_text(encoding="utf-8")
+    assert "test_falla" in contenido and "test_error_en_preparacion" in contenido
+    assert "&lt;total&gt; distinto" in contenido
+    assert "test_ya_escrito" not in contenido
+
+# Caso de prueba 4: Resumen por columna a partir del JSONL
+def test_summary_by_column(tmp_path):
+    '''
+    Caso de prueba 4: Resumen por columna a partir del JSONL
+    '''
+    ruta = tmp_path / "reporte.jsonl"
+    registros = [{"tipo": "sesion", "inicio": "2024-01-01T00:00:00"}]
+    for columna, resultado in [("precio", "passed"), ("precio", "failed"), ("region", "passed"), (None, "passed")]:
+        registros.append({"tipo": "caso", "prueba": f"test_{columna}.py::caso", "modulo": f"test_{columna}.py",
+                          "columna": columna, "resultado": resultado, "segundos": 0.5, "mensaje": None})
+    ruta.write_text("".join(json.dumps(registro) + "\n" for registro in registros), encoding="utf-8")
+    columnas, sesion = resumir_reporte(ruta)
+    assert columnas == {"precio": {"passed": 1, "failed": 1, "segundos": 1.0},
+                        "region": {"passed": 1, "segundos": 0.5}, "otros": {"passed": 1, "segundos": 0.5}}
+    assert sesion == {"inicio": "2024-01-01T00:00:00"}
+    contenido = renderizar_html(ruta, tmp_path / "reporte.html").read_text(encoding="utf-8")
+    assert "<td>precio</td>" in contenido and "<td>otros</td>" in contenido
@@ -1,7 +1,10 @@
 import pytest
-import pandas as pd
 import logging
 
+from coercion import NO_CONVERTIBLE, TEXTO_MONEDA, columna_moneda, columna_numerica
+from perfil_numerico import perfilar_columna
+from revalidacion import Metrica
+
 '''
 @uthor: José Luis García Quinayás
 date: 30/11/2024
@@ -27,28 +30,28 @@ pytest test_precio.py -v --tb=short --log-cli-level=INFO --html=report_campo_pre
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Función para cargar los datos
-@pytest.fixture
-def load_data():
-    # Cargar los datos desde el archivo Excel
-    data = pd.read_excel("O:/productos/ventas1.xlsx")
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
+
+# Métricas de la columna 'precio': la columna se convierte a número una sola vez para todos los casos
+@pytest.fixture(scope="module")
+def perfil_precio(datos_ventas, revalidacion):
+    '''Calcula en una sola pasada las métricas de la columna precio.'''
+    metrica = Metrica("perfil_precio", ['precio'],
+        lambda bloque: perfilar_columna(bloque['precio'], rangos=[(100, 200)], prefijos=['$', '-'], contiene=['-'],
+                                        numerica=columna_numerica(bloque, 'precio')))
+    return revalidacion.calcular(datos_ventas, metrica)
 
 # Caso 1: Determinar el valor más alto en la columna 'precio'
-def test_max_value_in_price(load_data):
+def test_max_value_in_price(perfil_precio):
     '''Caso de prueba 1: Determinar cuál es el valor más alto registrado en la columna 'precio'.'''
-    data = load_data
-    data['precio'] = pd.to_numeric(data['precio'], errors='coerce')
-    max_value = data['precio'].max()
+    max_value = perfil_precio.maximo
     logger.info(f"El valor más alto en la columna 'precio' es: {max_value}")
     assert max_value > 0, "El valor más alto en 'precio' debe ser positivo."
 
 @pytest.mark.parametrize("expected_count", [849.91])
-def test_exact_value_more_hight(load_data, expected_count):
+def test_exact_value_more_hight(perfil_precio, expected_count):
     '''Caso 2: Asegurarse de que el valor más alto en la columna precio es 849.91'''
-    data = load_data
-    data['precio'] = pd.to_numeric(data['precio'], errors='coerce')
-    max_value = data['precio'].max()
+    max_value = perfil_precio.maximo
     if max_value == expected_count:
         logger.info(f"Efectivamente el valor más alto en la columna 'precio' es: {max_value}")
     else:
@@ -56,20 +59,16 @@ def test_exact_value_more_hight(load_data, expected_count):
         assert max_value == expected_count, (f"Se esperaba el valor {expected_count}, pero se encontró {max_value}.")
 
 # Caso 3: Determinar el valor más bajo en la columna 'precio'
-def test_min_value_in_price(load_data):
+def test_min_value_in_price(perfil_precio):
     '''Caso de prueba 3: Determinar cuál es el valor más bajo registrado en la columna 'precio'.'''
-    data = load_data
-    data['precio'] = pd.to_numeric(data['precio'], errors='coerce')
-    min_value = data['precio'].min()
+    min_value = perfil_precio.minimo
     logger.info(f"El valor más bajo en la columna 'precio' es: {min_value}")
     assert min_value >= 0, "El valor más bajo en 'precio' no debe ser negativo."
 
 @pytest.mark.parametrize("expected_count", [-844.33])
-def test_exact_value_lower(load_data, expected_count):
+def test_exact_value_lower(perfil_precio, expected_count):
     '''Caso 4: Asegurarse de que el valor más bajo en la columna precio es 844.33'''
-    data = load_data
-    data['precio'] = pd.to_numeric(data['precio'], errors='coerce')
-    min_value = data['precio'].min()
+    min_value = perfil_precio.minimo
     if min_value == expected_count:
         logger.info(f"Efectivamente se encontró que el valor más bajo en la columna 'precio' es: {min_value}")
     else:
@@ -77,42 +76,34 @@ def test_exact_value_lower(load_data, expected_count):
         assert min_value == expected_count, (f"Se esperaba el valor {expected_count}, pero se encontró {min_value}.")
 
 # Caso de prueba 5: Contar cuántos registros tienen valores positivos en la columna precio.
-def test_count_positive_values_in_price(load_data):
+def test_count_positive_values_in_price(perfil_precio):
     '''Caso de prueba 5: Contar cuántos registros tienen valores positivos en la columna precio.'''
-    data = load_data
-    positive_values = data['precio'].apply(lambda x: pd.to_numeric(x, errors='coerce') > 0)
-    positive_count = positive_values.sum()
+    positive_count = perfil_precio.positivos
     logger.info(f"Registros con valores positivos: {positive_count}")
     assert positive_count >= 0, "El conteo de valores positivos no es correcto."
 
 # Caso de prueba 6: Asegurarse de que en la columna 'precio' la cantidad de registros positvios son: 5368
 @pytest.mark.parametrize("expected_count", [5368])
-def test_exact_count_positive_values_in_price(load_data, expected_count):
+def test_exact_count_positive_values_in_price(perfil_precio, expected_count):
     '''Caso de prueba 6: Asegurarse de que en la columna 'precio' la cantidad de registros positvios son: 5368'''
-    data = load_data
-    positive_values = data['precio'].apply(lambda x: pd.to_numeric(x, errors='coerce') > 0)
-    positive_count = positive_values.sum()
+    positive_count = perfil_precio.positivos
     if positive_count == expected_count:
         logger.info(f"Efectivamente los registros con valores positivos en la columna precio son : {positive_count}")
     else:
         logger.error(f"Error: Se esperaban {expected_count}, pero se encontraron {positive_count}.")
         assert positive_count == expected_count, (f"Se esperaba que los valores positivos fuesen {expected_count}, pero se encontraron {positive_count}.")
 
-def test_count_negative_values_in_price(load_data):
+def test_count_negative_values_in_price(perfil_precio):
     '''Caso de prueba 7: Contar cuántos registros tienen valores negativos en la columna precio.'''
-    data = load_data
-    negative_values = data['precio'].apply(lambda x: pd.to_numeric(x, errors='coerce') < 0)
-    negative_count = negative_values.sum()
+    negative_count = perfil_precio.negativos
     logger.info(f"Registros con valores negativos: {negative_count}")
     assert negative_count >= 0, "El conteo de valores negativos no es correcto."
 
 #Caso de prueba 8: Asegurarse de que en la columna 'precio' la cantidad de registros negativos son: 492
 @pytest.mark.parametrize("expected_count", [492])
-def test_count_exact_negative_values_in_price(load_data, expected_count):
+def test_count_exact_negative_values_in_price(perfil_precio, expected_count):
     '''Caso de prueba 8: Asegurarse de que en la columna 'precio' la cantidad de registros negativos son: 492'''
-    data = load_data
-    negative_values = data['precio'].apply(lambda x: pd.to_numeric(x, errors='coerce') < 0)
-    negative_count = negative_values.sum()
+    negative_count = perfil_precio.negativos
     if negative_count == expected_count:
         logger.info(f"Efectivamente los registros con valores positivos en la columna precio son: {negative_count}")
     else:
@@ -120,18 +111,16 @@ def test_count_exact_negative_values_in_price(load_data, expected_count):
         assert negative_count == expected_count, (f"Se esperaba que los valores positivos fuesen {expected_count}, pero se encontraron {negative_count}.")
 
 # Caso 9: Confirmar que no existan valores nulos o vacíos en 'precio'
-def test_no_null_or_empty_values_in_price(load_data):
+def test_no_null_or_empty_values_in_price(perfil_precio):
     '''Caso de prueba 9: Contar cuántos registros vacíos hay en la columna precio.'''
-    data = load_data
-    null_or_empty_count = data['precio'].isna().sum()
+    null_or_empty_count = perfil_precio.nulos
     logger.info(f"Valores nulos o vacíos en 'precio': {null_or_empty_count}")
     assert null_or_empty_count == 0, "Se encontraron valores nulos o vacíos en 'precio'."
 
 @pytest.mark.parametrize("expected_count", [35])
-def test_count_exact_or_empty_values_null_in_price(load_data, expected_count):
+def test_count_exact_or_empty_values_null_in_price(perfil_precio, expected_count):
     '''Caso de prueba 10: Asegurarse de que en la columna 'precio' la cantidad de registros vacíos son: 35'''
-    data = load_data
-    null_or_empty_count = data['precio'].isna().sum()
+    null_or_empty_count = perfil_precio.nulos
     if null_or_empty_count == expected_count:
         logger.info(f"Efectivamente los registros vacíos en la columna precio son: {null_or_empty_count}")
     else:
@@ -155,10 +144,9 @@ def test_no_negative_values_in_price(load_data):
     assert negative_count == 0, "Se encontraron valores negativos en 'precio', pero no deberían existir."
 
 # Caso 13: Confirmar que todos los valores en 'precio' son numéricos
-def test_all_numeric_values_in_price(load_data):
+def test_all_numeric_values_in_price(perfil_precio):
     '''Caso de prueba 13: Confirmar que todos los valores en la columna 'precio' son numéricos.'''
-    data = load_data
-    non_numeric_count = data['precio'].apply(lambda x: not isinstance(x, (int, float))).sum()
+    non_numeric_count = perfil_precio.no_numericos
     logger.info(f"Valores no numéricos en 'precio' son: {non_numeric_count}")
     assert non_numeric_count == 0, "Se encontraron valores no numéricos en 'precio'."
 
@@ -171,19 +159,17 @@ def test_all_values_are_numeric_in_price(load_data):
     assert non_numeric_values == 0, f"Se encontraron {non_numeric_values} valores no numéricos en la columna precio."
 
 # Caso de prueba 15: Contar cuántos registros son de tipo de dato cadena de texto en la columna precio.
-def test_count_text_values_in_price(load_data):
+def test_count_text_values_in_price(perfil_precio):
     '''Caso de prueba 15: Contar cuántos registros son tipo de dato cadena de texto en la columna precio.'''
-    data = load_data
-    text_values = data['precio'].apply(lambda x: isinstance(x, str) and not x.isnumeric()).sum()
+    text_values = perfil_precio.textos_no_numericos
     logger.info(f"La cantidad de registros con cadenas de texto en 'precio' son: {text_values}")
     assert text_values >= 0, "El conteo de cadenas de texto no es correcto."
 
 # Caso de prueba 16: Asegurarse de que 6085 registros son tipo de dato cadena de texto en la columna precio.
 @pytest.mark.parametrize("expected_count", [6085])
-def test_count_exact_text_values_in_price(load_data, expected_count):
+def test_count_exact_text_values_in_price(perfil_precio, expected_count):
     '''Caso de prueba 16: Asegurarse de que 6085 registros son tipo de dato cadena de texto en la columna precio.'''
-    data = load_data
-    text_values = data['precio'].apply(lambda x: isinstance(x, str) and not x.isnumeric()).sum()
+    text_values = perfil_precio.textos_no_numericos
     if text_values == expected_count:
         logger.info(f"Efectivamente la cantidad de registros con cadenas de texto en 'precio' son: {text_values}")
     else:
@@ -191,19 +177,17 @@ def test_count_exact_text_values_in_price(load_data, expected_count):
         assert text_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {text_values}.")
 
 # Caso de prueba 17: Contar cuántos registros tienen valores entre 100 y 200 en la columna precio.
-def test_count_values_between_100_and_200_in_price(load_data):
+def test_count_values_between_100_and_200_in_price(perfil_precio):
     '''Caso de prueba 17: Contar cuántos registros tienen valores entre 100 y 200 en la columna precio.'''
-    data = load_data
-    in_range_values = data['precio'].apply(lambda x: 100 <= pd.to_numeric(x, errors='coerce') <= 200).sum()
+    in_range_values = perfil_precio.en_rango(100, 200)
     logger.info(f"Registros con valores entre 100 y 200 en 'precio': {in_range_values}")
     assert in_range_values >= 0, "El conteo de valores entre 100 y 200 no es correcto."
 
 # Caso de prueba 18: Asegurarse de que 923 registros tienen valores entre 100 y 200 en la columna precio.
 @pytest.mark.parametrize("expected_count", [923])
-def test_count_exact_values_between_100_and_200_in_price(load_data, expected_count):
+def test_count_exact_values_between_100_and_200_in_price(perfil_precio, expected_count):
     '''Caso de prueba 18: Asegurarse de que 923 registros tienen valores entre 100 y 200 en la columna precio.'''
-    data = load_data
-    in_range_values = data['precio'].apply(lambda x: 100 <= pd.to_numeric(x, errors='coerce') <= 200).sum()
+    in_range_values = perfil_precio.en_rango(100, 200)
     if in_range_values == expected_count:
         logger.info(f"Efectivamente, los registros con valores entre 100 y 200 en 'precio': {in_range_values}")
     else:
@@ -211,19 +195,17 @@ def test_count_exact_values_between_100_and_200_in_price(load_data, expected_cou
         assert in_range_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {in_range_values}.")
 
 # Caso de prueba 19: Contar cuántos registros empiezan con $ en la columna precio.
-def test_values_starting_with_dollar_in_price(load_data):
+def test_values_starting_with_dollar_in_price(perfil_precio):
     '''Caso de prueba 19: Contar cuántos registros empiezan con $ en la columna precio.'''
-    data = load_data
-    dollar_start_values = data['precio'].astype(str).str.startswith('$').sum()
+    dollar_start_values = perfil_precio.prefijos['$']
     logger.info(f"La cantidad de registros que empiezan con $ en 'precio' son: {dollar_start_values}")
     assert dollar_start_values > 0, "No se encontraron registros que comienzan con $ en la columna precio."
 
 # Caso de prueba 20: Asegurarse de que 225 registros empiezan con $ en la columna precio.
 @pytest.mark.parametrize("expected_count", [225])
-def test_values_exact_starting_with_dollar_in_price(load_data, expected_count):
+def test_values_exact_starting_with_dollar_in_price(perfil_precio, expected_count):
     '''Caso de prueba 20: Asegurarse de que 225 registros empiezan con $ en la columna precio.'''
-    data = load_data
-    dollar_start_values = data['precio'].astype(str).str.startswith('$').sum()
+    dollar_start_values = perfil_precio.prefijos['$']
     if dollar_start_values == expected_count:
         logger.info(f"Efectivamente, los registros que empiezan con $ en 'precio': {dollar_start_values}")
     else:
@@ -231,19 +213,17 @@ def test_values_exact_starting_with_dollar_in_price(load_data, expected_count):
         assert dollar_start_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {dollar_start_values}.")
 
 # Caso de prueba 21: Contar cuántos registros empiezan con - en la columna precio.
-def test_values_starting_with_minus_in_price(load_data):
+def test_values_starting_with_minus_in_price(perfil_precio):
     '''Caso de prueba 21: Contar cuántos registros empiezan con - en la columna precio.'''
-    data = load_data
-    minus_start_values = data['precio'].astype(str).str.startswith('-').sum()
+    minus_start_values = perfil_precio.prefijos['-']
     logger.info(f"La cantidad de registros que empiezan con - en 'precio' son: {minus_start_values}")
     assert minus_start_values > 0, "No se encontraron registros que comienzan con - en la columna precio."
 
 # Caso de prueba 22: Asegurarse de que 492 registros empiezan con - en la columna precio.
 @pytest.mark.parametrize("expected_count", [492])
-def test_values_exact_starting_with_minus_in_price(load_data, expected_count):
+def test_values_exact_starting_with_minus_in_price(perfil_precio, expected_count):
     '''Caso de prueba 22: Asegurarse de que 492 registros empiezan con - en la columna precio.'''
-    data = load_data
-    minus_start_values = data['precio'].astype(str).str.startswith('-').sum()
+    minus_start_values = perfil_precio.prefijos['-']
     if minus_start_values == expected_count:
         logger.info(f"Efectivamente, los registros que empiezan con - en 'precio': {minus_start_values}")
     else:
@@ -251,60 +231,74 @@ def test_values_exact_starting_with_minus_in_price(load_data, expected_count):
         assert minus_start_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {minus_start_values}.")
 
 # Caso de prueba 23: Contar cuántos registros tienen valores que comienzan con - en la columna precio.
-def test_count_values_starting_with_minus_in_price_total(load_data):
+def test_count_values_starting_with_minus_in_price_total(perfil_precio):
     '''Caso de prueba 23: Contar cuántos registros tienen valores que comienzan con - en la columna precio.'''
-    data = load_data
-    minus_start_values = data['precio'].astype(str).str.contains('-').sum()
+    minus_start_values = perfil_precio.contiene['-']
     logger.info(f"La cantidad de registros que comienzan con - en 'precio': {minus_start_values}")
     assert minus_start_values >= 0, "El conteo de valores que comienzan con - no es correcto."
 
 # Caso de prueba 24: Asegurarse de que 507 registros empiezan con - en la columna precio.
 @pytest.mark.parametrize("expected_count", [507])
-def test_values_exact_begin_with_minus_in_price_total(load_data, expected_count):
+def test_values_exact_begin_with_minus_in_price_total(perfil_precio, expected_count):
     '''Caso de prueba 24: Asegurarse de que 507 registros empiezan con - en la columna precio.'''
-    data = load_data
-    minus_start_values = data['precio'].astype(str).str.contains('-').sum()
+    minus_start_values = perfil_precio.contiene['-']
     if minus_start_values == expected_count:
         logger.info(f"Efectivamente, los registros que empiezan con - en 'precio': {minus_start_values}")
     else:
         logger.error(f"Error: se esperaban {expected_count} registros, pero la cantidad de registros que empiezan con - son: {minus_start_values}")
         assert minus_start_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {minus_start_values}.")
 
+# Caso de prueba 25: Convertir los precios que empiezan con $ ('$150.51', '$-9.9') a número
+def test_dollar_values_are_parsed_in_price(datos_ventas):
+    '''Caso de prueba 25: Convertir los precios que empiezan con $ ('$150.51', '$-9.9') a número.'''
+    precio = columna_moneda(datos_ventas, 'precio')
+    con_moneda = datos_ventas['precio'][precio.mascara(TEXTO_MONEDA)]
+    logger.info(f"Precios con $ convertidos: {dict(zip(con_moneda.head(5), precio.valores[precio.mascara(TEXTO_MONEDA)][:5]))}")
+    assert precio.cantidad(TEXTO_MONEDA) == 224, f"Se esperaban 224 precios con $ convertidos, pero se encontraron {precio.cantidad(TEXTO_MONEDA)}."
+    assert precio.valores[precio.validos].min() == -844.33 and precio.valores[precio.validos].max() == 849.91
+
+# Caso de prueba 26: Asegurarse de que solo '$N/A' queda sin convertir al interpretar el $ en la columna precio
+def test_only_dollar_na_is_not_parsed_in_price(datos_ventas):
+    '''Caso de prueba 26: Asegurarse de que solo '$N/A' queda sin convertir al interpretar el $ en la columna precio.'''
+    precio = columna_moneda(datos_ventas, 'precio')
+    no_convertibles = datos_ventas['precio'][precio.mascara(NO_CONVERTIBLE)].tolist()
+    logger.info(f"Precios que no se pueden convertir: {no_convertibles}")
+    assert no_convertibles == ['$N/A'], f"Se esperaba solo '$N/A', pero se encontraron: {no_convertibles}."
+
 @pytest.mark.parametrize(
     "test_name, validation_function, expected_value",
     [
         # Caso 2: Valor más alto en la columna 'precio'
-        ("Valor más alto", lambda data: pd.to_numeric(data['precio'], errors='coerce').max(), 849.91),
+        ("Valor más alto", lambda perfil: perfil.maximo, 849.91),
         
         # Caso 4: Valor más bajo en la columna 'precio'
-        ("Valor más bajo", lambda data: pd.to_numeric(data['precio'], errors='coerce').min(), -844.33),
+        ("Valor más bajo", lambda perfil: perfil.minimo, -844.33),
         
         # Caso 6: Registros positivos en la columna 'precio'
-        ("Registros positivos 1", lambda data: pd.to_numeric(data['precio'], errors='coerce').gt(0).sum(), 5368),
+        ("Registros positivos 1", lambda perfil: perfil.positivos, 5368),
                     
         # Caso 12: Registros negativos en la columna 'precio'
-        ("Sin valores negativos", lambda data: pd.to_numeric(data['precio'], errors='coerce').lt(0).sum(), 492),
+        ("Sin valores negativos", lambda perfil: perfil.negativos, 492),
              
         # Caso 16: Registros string en la columna 'precio'
-        ("Registros como string", lambda data: data['precio'].apply(lambda x: isinstance(x, str)).sum(), 6085),
+        ("Registros como string", lambda perfil: perfil.textos, 6085),
         
         # Caso 18: Valores entre 100 y 200 en la columna 'precio'
-        ("Valores entre 100 y 200", lambda data: pd.to_numeric(data['precio'], errors='coerce').between(100, 200).sum(), 923),
+        ("Valores entre 100 y 200", lambda perfil: perfil.en_rango(100, 200), 923),
         
         # Caso 20: Valores que empiezan con '$' en la columna 'precio'
-        ("Empiezan con $", lambda data: data['precio'].astype(str).str.startswith('$').sum(), 225),
+        ("Empiezan con $", lambda perfil: perfil.prefijos['$'], 225),
         
         # Caso 22: Valores que empiezan con '-' en la columna 'precio'
-        ("Empiezan con - (492 registros)", lambda data: data['precio'].astype(str).str.startswith('-').sum(), 492),
+        ("Empiezan con - (492 registros)", lambda perfil: perfil.prefijos['-'], 492),
         
         # Caso 24: Valores que contienen '-' en la columna 'precio'
-        ("Empiezan con - (507 registros)", lambda data: data['precio'].astype(str).str.contains('-').sum(), 507),
+        ("Empiezan con - (507 registros)", lambda perfil: perfil.contiene['-'], 507),
     ]
 )
-def test_validations(load_data, test_name, validation_function, expected_value):
+def test_validations(perfil_precio, test_name, validation_function, expected_value):
     '''Validaciones parametrizadas para diferentes casos en la columna 'precio'.'''
-    data = load_data
-    result = validation_function(data)
+    result = validation_function(perfil_precio)
     if result == expected_value:
         logger.info(f"{test_name}: Validación exitosa. Resultado esperado y obtenido: {result}")
     else:
@@ -1,7 +1,8 @@
-import pandas as pd
 import pytest
 import logging
 
+from multipatron import buscar_patrones
+
 '''@uthor: José Luis García Quinayás
 date: 02/12/2024
 github: https://github.com/iamjosel
@@ -26,32 +27,32 @@ pytest test_region.py -v --tb=short --log-cli-level=INFO --html=report_region.ht
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def load_data():
-    '''Carga los datos desde el archivo Excel especificado.'''
-    # Cargar el archivo
-    file_path = "O:/productos/ventas1.xlsx"
-    data = pd.read_excel(file_path)
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
 
 special_char = ['Ã³', 'Ã©', 'Ã¡', 'Ã']
 regions = ['Centro', 'Este', 'Norte', 'Oeste', 'Sur' ]
 
+# Textos que se buscan en 'region'; todos se buscan juntos con una sola pasada por la columna
+patrones_region = special_char + ['Centro', 'Este', 'Norte', 'Oeste', 'Sur', 'e', 'o']
+
+@pytest.fixture(scope="module")
+def coincidencias_region(datos_ventas):
+    '''Máscaras de todos los patrones de 'region', calculadas una sola vez por módulo.'''
+    return buscar_patrones(datos_ventas['region'], patrones_region)
+
 # Caso de prueba 1: Identificar registros con caracteres especiales en 'region'
-def test_find_special_characters(load_data):
+def test_find_special_characters(coincidencias_region):
     '''Caso de prueba 1: Identificar registros con caracteres especiales en la columna "region".'''
-    data = load_data
-    special_characters = data['region'].str.contains('|'.join(special_char), na=False)
+    special_characters = coincidencias_region.alguno(special_char)
     special_count = special_characters.sum()
     logger.info(f"Total de registros con caracteres especiales: {special_count}")
     assert special_count > 0, "No se encontraron registros con caracteres especiales"
 
 # Caso de prueba 2: Verificar que haya exactamente 0 registros con caracteres especiales
 @pytest.mark.parametrize("expected_count", [0])
-def test_exact_special_characters_count(load_data, expected_count):
+def test_exact_special_characters_count(coincidencias_region, expected_count):
     '''Caso de prueba 2: Verificar que haya exactamente 0 registros con caracteres especiales en "region".'''
-    data = load_data
-    special_count = data['region'].str.contains('|'.join(special_char), na=False).sum()
+    special_count = coincidencias_region.alguno(special_char).sum()
     if special_count == expected_count:
         logger.info(f"Efectivamente hay {special_count} registros con caracteres especiales en la columna 'region'")
     else:
@@ -59,19 +60,17 @@ def test_exact_special_characters_count(load_data, expected_count):
         assert special_count == expected_count, f"Se esperaban {expected_count} registros con caracteres especiales, pero se encontraron {special_count}"
 
 # Caso de prueba 3: Contar registros con el valor "Centro"
-def test_find_centro(load_data):
+def test_find_centro(coincidencias_region):
     '''Caso de prueba 3: Contar registros con el valor "Centro" en la columna "region".'''
-    data = load_data
-    centro_count = data['region'].str.contains("Centro", na=False).sum()
+    centro_count = coincidencias_region["Centro"].sum()
     logger.info(f"Total de registros con el nombre 'Centro': {centro_count}")
     assert centro_count > 0, "No se encontraron registros con el nombre 'Centro'"
 
 # Caso de prueba 4: Confirmar que hay exactamente 1172 registros con "Centro"
 @pytest.mark.parametrize("expected_count", [1172])
-def test_exact_centro_count(load_data, expected_count):
+def test_exact_centro_count(coincidencias_region, expected_count):
     '''Caso de prueba 4: Confirmar que hay exactamente 1172 registros con "Centro" en "region".'''
-    data = load_data
-    centro_count = data['region'].str.contains("Centro", na=False).sum()
+    centro_count = coincidencias_region["Centro"].sum()
     if centro_count == expected_count:
         logger.info(f"Efectivamente hay {centro_count} registros con nombre 'Centro' en la columna 'region'")
     else:
@@ -79,19 +78,17 @@ def test_exact_centro_count(load_data, expected_count):
         assert centro_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {centro_count}"
 
 # Caso de prueba 5: Contar registros con el valor "Este"
-def test_find_este(load_data):
+def test_find_este(coincidencias_region):
     '''Caso de prueba 5: Contar registros con el valor "Este" en la columna "region".'''
-    data = load_data
-    este_count = data['region'].str.contains("Este", na=False).sum()
+    este_count = coincidencias_region["Este"].sum()
     logger.info(f"Total de registros con el nombre 'Este': {este_count}")
     assert este_count > 0, "No se encontraron registros con el nombre 'Este'"
 
 # Caso de prueba 6: Confirmar que hay exactamente 1238 registros con "Este"
 @pytest.mark.parametrize("expected_count", [1238])
-def test_exact_este_count(load_data, expected_count):
+def test_exact_este_count(coincidencias_region, expected_count):
     '''Caso de prueba 6: Confirmar que hay exactamente 1238 registros con "Este" en "region".'''
-    data = load_data
-    este_count = data['region'].str.contains("Este", na=False).sum()
+    este_count = coincidencias_region["Este"].sum()
     if este_count == expected_count:
         logger.info(f"Efectivamente hay {este_count} registros con nombre 'Este' en la columna 'region'")
     else:
@@ -99,19 +96,17 @@ def test_exact_este_count(load_data, expected_count):
         assert este_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {este_count}"
 
 # Caso de prueba 7: Contar registros con el valor "Norte"
-def test_find_norte(load_data):
+def test_find_norte(coincidencias_region):
     '''Caso de prueba 7: Contar registros con el valor "Norte" en la columna "region".'''
-    data = load_data
-    norte_count = data['region'].str.contains("Norte", na=False).sum()
+    norte_count = coincidencias_region["Norte"].sum()
     logger.info(f"Total de registros con el nombre 'Norte': {norte_count}")
     assert norte_count > 0, "No se encontraron registros con el nombre 'Norte'"
 
 # Caso de prueba 8: Confirmar que hay exactamente 1195 registros con "Norte"
 @pytest.mark.parametrize("expected_count", [1195])
-def test_exact_norte_count(load_data, expected_count):
+def test_exact_norte_count(coincidencias_region, expected_count):
     '''Caso de prueba 8: Confirmar que hay exactamente 1195 registros con "Norte" en "region".'''
-    data = load_data
-    norte_count = data['region'].str.contains("Norte", na=False).sum()
+    norte_count = coincidencias_region["Norte"].sum()
     if norte_count == expected_count:
         logger.info(f"Efectivamente hay {norte_count} registros con nombre 'Norte' en la columna 'region'")
     else:
@@ -119,19 +114,17 @@ def test_exact_norte_count(load_data, expected_count):
         assert norte_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {norte_count}"
 
 # Caso de prueba 9: Contar registros con el valor "Oeste"
-def test_find_oeste(load_data):
+def test_find_oeste(coincidencias_region):
     '''Caso de prueba 9: Contar registros con el valor "Oeste" en la columna "region".'''
-    data = load_data
-    oeste_count = data['region'].str.contains("Oeste", na=False).sum()
+    oeste_count = coincidencias_region["Oeste"].sum()
     logger.info(f"Total de registros con el nombre 'Oeste': {oeste_count}")
     assert oeste_count > 0, "No se encontraron registros con el nombre 'Oeste'"
 
 # Caso de prueba 10: Confirmar que hay exactamente 1217 registros con "Oeste"
 @pytest.mark.parametrize("expected_count", [1217])
-def test_exact_oeste_count(load_data, expected_count):
+def test_exact_oeste_count(coincidencias_region, expected_count):
     '''Caso de prueba 10: Confirmar que hay exactamente 1217 registros con "Oeste" en "region".'''
-    data = load_data
-    oeste_count = data['region'].str.contains("Oeste", na=False).sum()
+    oeste_count = coincidencias_region["Oeste"].sum()
     if oeste_count == expected_count:
         logger.info(f"Efectivamente hay {oeste_count} registros con nombre 'Oeste' en la columna 'region'")
     else:
@@ -139,19 +132,17 @@ def test_exact_oeste_count(load_data, expected_count):
         assert oeste_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {oeste_count}"
 
 # Caso de prueba 11: Contar registros con el valor "Sur"
-def test_find_sur(load_data):
+def test_find_sur(coincidencias_region):
     '''Caso de prueba 11: Contar registros con el valor "Sur" en la columna "region".'''
-    data = load_data
-    sur_count = data['region'].str.contains("Sur", na=False).sum()
+    sur_count = coincidencias_region["Sur"].sum()
     logger.info(f"Total de registros con el nombre 'Sur': {sur_count}")
     assert sur_count > 0, "No se encontraron registros con el nombre 'Sur'"
 
 # Caso de prueba 12: Confirmar que hay exactamente 1257 registros con "Sur"
 @pytest.mark.parametrize("expected_count", [1257])
-def test_exact_sur_count(load_data, expected_count):
+def test_exact_sur_count(coincidencias_region, expected_count):
     '''Caso de prueba 12: Confirmar que hay exactamente 1257 registros con "Sur" en "region".'''
-    data = load_data
-    sur_count = data['region'].str.contains("Sur", na=False).sum()
+    sur_count = coincidencias_region["Sur"].sum()
     if sur_count == expected_count:
         logger.info(f"Efectivamente hay {sur_count} registros con nombre 'Sur' en la columna 'region'")
     else:
@@ -210,19 +201,17 @@ def test_exact_all_count_regions(load_data, expected_count):
         assert all_count_regions == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {all_count_regions}."
 
 # Caso de prueba 17: Contar registros que contienen la letra e en la columna region
-def test_letter_e(load_data):
+def test_letter_e(coincidencias_region):
     '''Caso de prueba 17: Contar registros que contienen la letra e en la columna region'''
-    data = load_data
-    null_count = data['region'].str.contains("e", na=False).sum()
+    null_count = coincidencias_region["e"].sum()
     logger.info(f"Total de registros con el nombre 'e': {null_count}")
     assert null_count > 0, "No se encontraron registros que contienen la letra 'e'"
 
 # Caso de prueba 18: Confirmar que hay exactamente 4822 registros que contienen la letra "e"
 @pytest.mark.parametrize("expected_count", [4822])
-def test_exact_letter_e(load_data, expected_count):
+def test_exact_letter_e(coincidencias_region, expected_count):
     '''Caso de prueba 18: Confirmar que hay exactamente 4822 registros que contienen la letra "e"'''
-    data = load_data
-    null_count = data['region'].str.contains("e", na=False).sum()
+    null_count = coincidencias_region["e"].sum()
     if null_count == expected_count:
         logger.info(f"Efectivamente hay {null_count} registros que contienen la letra 'e' en la columna 'region'")
     else:
@@ -230,19 +219,17 @@ def test_exact_letter_e(load_data, expected_count):
         assert null_count == expected_count, f"Se esperaban {expected_count} registros, pero se encontraron {null_count}"
 
 # Caso de prueba 19: Contar registros que contienen la letra o en la columna region
-def test_letter_o(load_data):
+def test_letter_o(coincidencias_region):
     '''Caso de prueba 19: Contar registros que contienen la letra o en la columna region'''
-    data = load_data
-    null_count = data['region'].str.contains("o", na=False).sum()
+    null_count = coincidencias_region["o"].sum()
     logger.info(f"Total de registros con el nombre 'e': {null_count}")
     assert null_count > 0, "No se encontraron registros que contienen la letra 'e'"
 
 # Caso de prueba 20: Confirmar que hay exactamente 2367 registros que contienen la letra "o"
 @pytest.mark.parametrize("expected_count", [2367])
-def test_exact_letter_o(load_data, expected_count):
+def test_exact_letter_o(coincidencias_region, expected_count):
     '''Caso de prueba 20: Confirmar que hay exactamente 2367 registros que contienen la letra "o"'''
-    data = load_data
-    null_count = data['region'].str.contains("o", na=False).sum()
+    null_count = coincidencias_region["o"].sum()
     if null_count == expected_count:
         logger.info(f"Efectivamente hay {null_count} registros que contienen la letra 'o' en la columna 'region'")
     else:
@@ -0,0 +1,71 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from reglas import cargar_reglas, evaluar_reglas
+
+'''
+para ejecutar los casos
+
+pytest test_reglas.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def escribir_reglas(ruta, reglas):
+    ruta.write_text(json.dumps({"reglas": reglas}), encoding="utf-8")
+    return ruta
+
+@pytest.fixture
+def datos():
+    return pd.DataFrame({"precio": ["10", "$20", np.nan, "-5"], "region": ["Centro", "Norte", "Centro", np.nan]})
+
+# Caso de prueba 1: Un predicado que no existe se rechaza al leer el archivo
+def test_unknown_predicate(tmp_path):
+    '''Caso de prueba 1: Confirmar que un predicado desconocido detiene la carga e indica la regla.'''
+    ruta = escribir_reglas(tmp_path / "reglas_prueba.json", [
+        {"id": "precio_positivos", "columna": "precio", "predicado": "positivos", "esperado": 1},
+        {"id": "precio_promedio", "columna": "precio", "predicado": "promedio", "esperado": 8.33},
+    ])
+    with pytest.raises(ValueError, match="precio_promedio: predicado desconocido 'promedio'"):
+        cargar_reglas(ruta)
+
+# Caso de prueba 2: Identificadores de regla repetidos se rechazan al leer el archivo
+def test_duplicate_rule_ids(tmp_path):
+    '''Caso de prueba 2: Confirmar que dos reglas con el mismo id detienen la carga.'''
+    ruta = escribir_reglas(tmp_path / "reglas_prueba.json", [
+        {"id": "precio_nulos", "columna": "precio", "predicado": "nulos", "esperado": 1},
+        {"id": "precio_nulos", "columna": "precio", "predicado": "filas", "esperado": 4},
+    ])
+    with pytest.raises(ValueError, match=r"reglas_prueba.json: identificadores de regla repetidos \['precio_nulos'\]"):
+        cargar_reglas(ruta)
+
+# Caso de prueba 3: Una regla incompleta se rechaza al leer el archivo
+def test_incomplete_rule(tmp_path):
+    '''Caso de prueba 3: Confirmar que una regla sin valor esperado detiene la carga.'''
+    ruta = escribir_reglas(tmp_path / "reglas_prueba.json", [
+        {"id": "precio_nulos", "columna": "precio", "predicado": "nulos"},
+    ])
+    with pytest.raises(ValueError, match=r"Regla incompleta precio_nulos: faltan \['esperado'\]"):
+        cargar_reglas(ruta)
+
+# Caso de prueba 4: Una regla sobre una columna inexistente falla sin detener las demás
+def test_rule_on_missing_column(tmp_path, datos):
+    '''Caso de prueba 4: Validar que la regla sobre una columna que no existe queda con error y las demás se evalúan.'''
+    ruta = escribir_reglas(tmp_path / "reglas_prueba.json", [
+        {"id": "precio_nulos", "columna": "precio", "predicado": "nulos", "esperado": 1},
+        {"id": "descuento_nulos", "columna": "descuento", "predicado": "nulos", "esperado": 0},
+        {"id": "region_centro", "columna": "region", "predicado": "igual", "argumentos": ["Centro"], "esperado": 2},
+    ])
+    resultados = evaluar_reglas(datos, cargar_reglas(ruta))
+    faltante = resultados["descuento_nulos"]
+    logger.info(f"descuento_nulos: {faltante.error!r}")
+    assert isinstance(faltante.error, KeyError) and "descuento" in str(faltante.error)
+    assert not faltante.correcto
+    assert [resultado.regla.id for resultado in resultados.fallidas] == ["descuento_nulos"]
+    assert [resultado.regla.id for resultado in resultados] == ["precio_nulos", "descuento_nulos", "region_centro"]
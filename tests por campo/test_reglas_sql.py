@@ -0,0 +1,73 @@
+import sqlite3
+from pathlib import Path
+import pytest
+import logging
+
+from reglas import cargar_reglas
+from reglas_sql import DialectoMySQL, ReglaNoCompilable, compilar_reglas, evaluar_reglas_sql, registrar_regexp
+
+'''
+para ejecutar los casos
+
+pytest test_reglas_sql.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REGLAS = cargar_reglas(Path(__file__).parent / "reglas_ventas.json")
+
+@pytest.fixture(scope="module")
+def conexion_sqlite(datos_ventas):
+    '''Base SQLite en memoria con la tabla ventas, en reemplazo de products.ventas.'''
+    conexion = registrar_regexp(sqlite3.connect(":memory:"))
+    datos_ventas.to_sql("ventas", conexion, index=False)
+    yield conexion
+    conexion.close()
+
+@pytest.fixture(scope="module")
+def resultados_sql(conexion_sqlite):
+    '''Evalúa todas las reglas de reglas_ventas.json, registrando las consultas ejecutadas.'''
+    consultas = []
+    conexion_sqlite.set_trace_callback(consultas.append)
+    resultados = evaluar_reglas_sql(conexion_sqlite, REGLAS, tabla="ventas")
+    conexion_sqlite.set_trace_callback(None)
+    return resultados, consultas
+
+# Caso de prueba 1: Todas las reglas se evalúan con una sola consulta
+def test_all_rules_in_one_query(resultados_sql):
+    '''Caso de prueba 1: Confirmar que todas las reglas se calculan con una única consulta sobre la tabla.'''
+    _, consultas = resultados_sql
+    logger.info(f"Consultas ejecutadas: {len(consultas)}")
+    assert len(consultas) == 1, f"Se esperaba 1 consulta, pero se ejecutaron {len(consultas)}."
+    assert consultas[0].count("FROM") == 1, "La consulta recorre la tabla más de una vez."
+
+# Caso de prueba 2: Cada regla compilada obtiene en la base de datos el valor esperado
+@pytest.mark.parametrize("regla", [regla for regla in REGLAS if regla.predicado not in ("textos", "repeticiones")],
+                         ids=lambda regla: regla.id)
+def test_rule_result_in_database(resultados_sql, regla):
+    '''Caso de prueba 2: Validar el resultado de cada regla calculado por la base de datos.'''
+    resultados, _ = resultados_sql
+    resultado = resultados[regla.id]
+    logger.info(f"{regla.id}: {resultado.resultado}")
+    assert resultado.error is None, f"La regla {regla.id} no se pudo evaluar: {resultado.error}"
+    assert resultado.correcto, f"Se esperaba {regla.esperado}, pero se encontró {resultado.resultado}."
+
+# Caso de prueba 3: Las reglas que no caben en una consulta de agregados se informan sin ejecutarse
+def test_rules_not_compilable_are_reported(resultados_sql):
+    '''Caso de prueba 3: Confirmar que las reglas de tipo de celda o de repeticiones quedan marcadas como no compilables.'''
+    resultados, _ = resultados_sql
+    no_compilables = sorted(resultado.regla.id for resultado in resultados if isinstance(resultado.error, ReglaNoCompilable))
+    logger.info(f"Reglas no compilables: {no_compilables}")
+    assert no_compilables == ["id_producto_repetidos_7_veces", "precio_textos", "total_venta_textos"]
+
+# Caso de prueba 4: La consulta para MySQL usa marcadores %s y nombres entre comillas invertidas
+def test_mysql_query_uses_parameters():
+    '''Caso de prueba 4: Validar que la consulta compilada para MySQL no incluye los valores en el texto.'''
+    consulta, parametros, compiladas, _ = compilar_reglas(REGLAS, tabla="ventas", dialecto=DialectoMySQL())
+    assert "FROM `ventas`" in consulta
+    assert consulta.count("%s") == len(parametros), "La cantidad de marcadores no coincide con los parámetros."
+    assert "Centro" not in consulta and "Centro" in parametros
+    assert consulta.count(" AS r") == len(compiladas)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from reparacion_texto import quitar_acentos, reparar_columna, reparar_serie, reparar_texto
+from vista_datos import VistaDatos
+
+'''
+para ejecutar los casos
+
+pytest test_reparacion_texto.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Caso de prueba 1: Reparar textos con doble codificación
+@pytest.mark.parametrize("texto, esperado", [
+    ("ComputaciÃ³n", "Computación"),
+    ("FotografÃ\xada", "Fotografía"),
+    ("Tarjeta de CrÃ©dito", "Tarjeta de Crédito"),
+    ("aramÃ¡C", "aramáC"),
+    ("NiÃ±o", "Niño"),
+    ("ComputaciÃƒÂ³n", "Computación"),  # codificado dos veces
+])
+def test_repair_double_encoding(texto, esperado):
+    '''Caso de prueba 1: Reparar textos con doble codificación'''
+    assert reparar_texto(texto) == esperado
+
+# Caso de prueba 2: Los textos correctos quedan igual
+@pytest.mark.parametrize("texto", ["Audio", "Computación", "Ã", "Año 2024 ¡oferta!", ""])
+def test_clean_text_unchanged(texto):
+    '''Caso de prueba 2: Los textos correctos quedan igual'''
+    assert reparar_texto(texto) == texto
+
+# Caso de prueba 3: Quitar acentos
+def test_remove_accents():
+    '''Caso de prueba 3: Quitar acentos'''
+    assert quitar_acentos("Fotografía Electrónica Niño") == "Fotografia Electronica Nino"
+
+# Caso de prueba 4: Columna original, reparada, sin acentos y máscara de corruptos
+def test_repaired_column():
+    '''Caso de prueba 4: Columna original, reparada, sin acentos y máscara de corruptos'''
+    serie = pd.Series(["ComputaciÃ³n", "Audio", np.nan, "Computación", "ComputaciÃ³n", 5], index=[10, 11, 12, 13, 14, 15], name="categoria")
+    reparada = reparar_serie(serie)
+    assert reparada.original.equals(serie.astype(object))
+    assert reparada.reparada.tolist()[:2] == ["Computación", "Audio"]
+    assert pd.isna(reparada.reparada[12]) and reparada.reparada[15] == 5
+    assert reparada.sin_acentos[10] == "Computacion"
+    assert reparada.corrupta.tolist() == [True, False, False, False, True, False]
+    assert reparada.corrupta.index.equals(serie.index)
+    assert reparada.traducciones() == {"ComputaciÃ³n": "Computación"}
+
+# Caso de prueba 5: La reparación se calcula una vez por DataFrame y la vista la comparte
+def test_cached_per_dataframe():
+    '''Caso de prueba 5: La reparación se calcula una vez por DataFrame y la vista la comparte'''
+    data = pd.DataFrame({"region": ["Norte", "Sur"], "metodo_pago": ["Tarjeta de CrÃ©dito", "Efectivo"]})
+    vista = VistaDatos(data)
+    assert vista.reparada("metodo_pago") is reparar_columna(data, "metodo_pago")
+    vista["metodo_pago"] = ["Efectivo", "CrÃ©dito"]
+    assert vista.reparada("metodo_pago").corrupta.tolist() == [False, True]
+    assert reparar_columna(data, "metodo_pago").corrupta.tolist() == [True, False]
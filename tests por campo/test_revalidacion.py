@@ -0,0 +1,127 @@
+import multiprocessing
+import pytest
+import pandas as pd
+import logging
+
+from coercion import columna_numerica
+from conciliacion import huellas_filas
+from perfil_numerico import perfilar_columna
+from revalidacion import Metrica, Revalidador, cortes_por_contenido, revalidar
+
+'''
+para ejecutar los casos
+
+pytest test_revalidacion.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bloques pequeños para que el archivo de prueba se divida en varias partes
+TAMANO_MEDIO = 256
+
+METRICA = Metrica("perfil_precio", ['precio'],
+    lambda bloque: perfilar_columna(bloque['precio'], rangos=[(100, 200)], prefijos=['$', '-'], contiene=['-'],
+                                    numerica=columna_numerica(bloque, 'precio')))
+
+@pytest.fixture
+def ventas(datos_ventas):
+    return datos_ventas[['precio', 'region']].copy()
+
+# Caso de prueba 1: Los bloques cubren todas las filas y respetan los tamaños mínimo y máximo
+def test_content_defined_cuts(ventas):
+    '''Caso de prueba 1: Validar que los cortes por contenido dividen las filas en bloques de tamaño acotado.'''
+    cortes = cortes_por_contenido(huellas_filas(ventas, ['precio']), TAMANO_MEDIO)
+    tamanos = pd.Series(list(cortes[1:]) + [len(ventas)]) - pd.Series(cortes)
+    logger.info(f"Bloques: {len(cortes)}, tamaño mínimo {tamanos.min()}, máximo {tamanos.max()}")
+    assert cortes[0] == 0 and tamanos.sum() == len(ventas)
+    assert tamanos[:-1].min() >= TAMANO_MEDIO // 4 and tamanos.max() <= 4 * TAMANO_MEDIO
+    assert len(cortes) > 1
+
+# Caso de prueba 2: El estado unido de los bloques es igual al calculado sobre la columna completa
+def test_merged_blocks_equal_full_computation(ventas, tmp_path):
+    '''Caso de prueba 2: Confirmar que unir los perfiles de los bloques da el perfil de la columna completa.'''
+    resultado = revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    assert resultado.recalculados == resultado.bloques > 1
+    assert resultado.estado == METRICA.calcular(ventas)
+
+# Caso de prueba 3: Sin cambios en los datos no se recalcula ningún bloque
+def test_unchanged_data_reuses_all_blocks(ventas, tmp_path):
+    '''Caso de prueba 3: Validar que una segunda ejecución sobre los mismos datos reutiliza todos los bloques.'''
+    revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    resultado = revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    assert resultado.recalculados == 0
+    assert resultado.estado == METRICA.calcular(ventas)
+
+# Caso de prueba 4: Solo se recalculan los bloques que cambiaron
+@pytest.mark.parametrize("cambio", ["celda", "fila_eliminada", "filas_insertadas"])
+def test_only_changed_blocks_are_recomputed(ventas, tmp_path, cambio):
+    '''Caso de prueba 4: Confirmar que un cambio pequeño recalcula pocos bloques y da el resultado correcto.'''
+    revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    if cambio == "celda":
+        ventas.loc[3000, 'precio'] = '1.5'
+    elif cambio == "fila_eliminada":
+        ventas = ventas.drop(index=3000).reset_index(drop=True)
+    else:
+        ventas = pd.concat([ventas.iloc[:10], ventas.iloc[:5], ventas.iloc[10:]], ignore_index=True)
+    resultado = revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    logger.info(f"{cambio}: {resultado.recalculados} de {resultado.bloques} bloques recalculados")
+    assert resultado.recalculados <= 2
+    assert resultado.estado == METRICA.calcular(ventas)
+
+# Caso de prueba 5: Los estados de bloques que ya no existen se eliminan
+def test_stale_states_are_removed(ventas, tmp_path):
+    '''Caso de prueba 5: Validar que el directorio de estados solo guarda los bloques de la última ejecución.'''
+    revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    ventas.loc[3000, 'precio'] = '1.5'
+    resultado = revalidar(ventas, METRICA, tmp_path, TAMANO_MEDIO)
+    guardados = list((tmp_path / "perfil_precio-1").iterdir())
+    assert len(guardados) == resultado.bloques
+
+# Caso de prueba 6: Sin directorio de estados la métrica se calcula sobre los datos completos
+def test_revalidator_without_state_dir(ventas):
+    '''Caso de prueba 6: Confirmar que el revalidador sin --incremental calcula la métrica directamente.'''
+    revalidador = Revalidador()
+    assert revalidador.calcular(ventas, METRICA) == METRICA.calcular(ventas)
+    assert revalidador.resultados == {}
+
+# Caso de prueba 7: Un valor que cambia de tipo ('12.5' -> 12.5) recalcula su bloque
+def test_type_change_recomputes_block(tmp_path):
+    '''Caso de prueba 7: Validar que un cambio de tipo en una celda no reutiliza el estado anterior del bloque.'''
+    datos = pd.DataFrame({'precio': ['12.5', '3', '$4'] * 1000})
+    revalidar(datos, METRICA, tmp_path, TAMANO_MEDIO)
+    datos['precio'] = datos['precio'].replace('12.5', 12.5)
+    resultado = revalidar(datos, METRICA, tmp_path, TAMANO_MEDIO)
+    logger.info(f"Bloques recalculados después del cambio de tipo: {resultado.recalculados} de {resultado.bloques}")
+    assert resultado.recalculados > 0
+    assert resultado.estado == METRICA.calcular(datos)
+    assert resultado.estado.textos == 2000
+
+def _revalidar_en_otro_proceso(dir_estado, cola):
+    '''Revalida varias veces los mismos datos sobre un directorio de estados compartido.'''
+    datos = pd.DataFrame({'precio': [str(numero / 4) for numero in range(3000)] + ['$4'] * 500})
+    try:
+        for _ in range(3):
+            resultado = revalidar(datos, METRICA, dir_estado, TAMANO_MEDIO)
+        cola.put((resultado.estado == METRICA.calcular(datos), resultado.bloques))
+    except Exception as error:
+        cola.put((repr(error), 0))
+
+# Caso de prueba 8: Varios procesos revalidan a la vez sobre el mismo directorio de estados (pytest -n)
+def test_concurrent_processes_share_state_dir(tmp_path):
+    '''Caso de prueba 8: Validar que procesos concurrentes no corrompen ni borran los estados de los otros.'''
+    contexto = multiprocessing.get_context("spawn")
+    cola = contexto.Queue()
+    procesos = [contexto.Process(target=_revalidar_en_otro_proceso, args=(tmp_path, cola)) for _ in range(6)]
+    for proceso in procesos:
+        proceso.start()
+    resultados = [cola.get(timeout=120) for _ in procesos]
+    for proceso in procesos:
+        proceso.join(timeout=60)
+    logger.info(f"Resultados de los procesos (estado correcto, bloques): {resultados}")
+    assert all(proceso.exitcode == 0 for proceso in procesos), "Algún proceso terminó con error."
+    assert all(correcto is True for correcto, _ in resultados), f"Resultados de los procesos: {resultados}"
+    guardados = list((tmp_path / "perfil_precio-1").iterdir())
+    assert all(ruta.suffix == ".pkl" for ruta in guardados) and len(guardados) == resultados[0][1]
@@ -1,7 +1,12 @@
+import numpy as np
 import pytest
-import pandas as pd
 import logging
 
+from coercion import columna_numerica
+from consistencia_total import CONSISTENTE, INCONSISTENTE, SIN_DATOS, verificar_total
+from perfil_numerico import perfilar_columna
+from revalidacion import Metrica
+
 '''
 @uthor: José Luis García Quinayás
 date: 02/12/2024
@@ -27,28 +32,28 @@ pytest test_total_venta.py -v --tb=short --log-cli-level=INFO --html=report_tota
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Función para cargar los datos
-@pytest.fixture
-def load_data():
-    # Cargar los datos desde el archivo Excel
-    data = pd.read_excel("O:/productos/ventas1.xlsx")
-    return data
+# Los datos se cargan una sola vez por sesión con la fixture load_data de conftest.py
+
+# Métricas de la columna 'total_venta': la columna se convierte a número una sola vez para todos los casos
+@pytest.fixture(scope="module")
+def perfil_total_venta(datos_ventas, revalidacion):
+    '''Calcula en una sola pasada las métricas de la columna total_venta.'''
+    metrica = Metrica("perfil_total_venta", ['total_venta'],
+        lambda bloque: perfilar_columna(bloque['total_venta'], rangos=[(200, 1200)], contiene=['Total inconsistente'],
+                                        numerica=columna_numerica(bloque, 'total_venta')))
+    return revalidacion.calcular(datos_ventas, metrica)
 
 # Caso 1: Determinar el valor más alto en la columna 'total_venta'
-def test_max_value_in_total_sale(load_data):
+def test_max_value_in_total_sale(perfil_total_venta):
     '''Caso de prueba 1: Determinar cuál es el valor más alto registrado en la columna 'total_venta'.'''
-    data = load_data
-    data['total_venta'] = pd.to_numeric(data['total_venta'], errors='coerce')
-    max_value = data['total_venta'].max()
+    max_value = perfil_total_venta.maximo
     logger.info(f"El valor más alto en la columna 'total_venta' es: {max_value}")
     assert max_value > 0, "El valor más alto en 'total_venta' debe ser positivo."
 
 @pytest.mark.parametrize("expected_count", [22914.7])
-def test_exact_value_more_hight(load_data, expected_count):
+def test_exact_value_more_hight(perfil_total_venta, expected_count):
     '''Caso 2: Asegurarse de que el valor más alto en la columna total_venta es 22914.7'''
-    data = load_data
-    data['total_venta'] = pd.to_numeric(data['total_venta'], errors='coerce')
-    max_value = data['total_venta'].max()
+    max_value = perfil_total_venta.maximo
     if max_value == expected_count:
         logger.info(f"Efectivamente el valor más alto en la columna 'total_venta' es: {max_value}")
     else:
@@ -56,20 +61,16 @@ def test_exact_value_more_hight(load_data, expected_count):
         assert max_value == expected_count, (f"Se esperaba el valor {expected_count}, pero se encontró {max_value}.")
 
 # Caso 3: Determinar el valor más bajo en la columna 'total_venta'
-def test_min_value_in_total_sale(load_data):
+def test_min_value_in_total_sale(perfil_total_venta):
     '''Caso de prueba 3: Determinar cuál es el valor más bajo registrado en la columna 'total_venta'.'''
-    data = load_data
-    data['total_venta'] = pd.to_numeric(data['total_venta'], errors='coerce')
-    min_value = data['total_venta'].min()
+    min_value = perfil_total_venta.minimo
     logger.info(f"El valor más bajo en la columna 'total_venta' es: {min_value}")
     assert min_value >= 0, "El valor más bajo en 'total_venta' no debe ser negativo."
 
 @pytest.mark.parametrize("expected_count", [-4104288.13])
-def test_exact_value_lower(load_data, expected_count):
+def test_exact_value_lower(perfil_total_venta, expected_count):
     '''Caso 4: Asegurarse de que el valor más bajo en la columna total_venta es -4104288.13'''
-    data = load_data
-    data['total_venta'] = pd.to_numeric(data['total_venta'], errors='coerce')
-    min_value = data['total_venta'].min()
+    min_value = perfil_total_venta.minimo
     if min_value == expected_count:
         logger.info(f"Efectivamente se encontró que el valor más bajo en la columna 'total_venta' es: {min_value}")
     else:
@@ -77,42 +78,34 @@ def test_exact_value_lower(load_data, expected_count):
         assert min_value == expected_count, (f"Se esperaba el valor {expected_count}, pero se encontró {min_value}.")
 
 # Caso de prueba 5: Contar cuántos registros tienen valores positivos en la columna total_venta.
-def test_count_positive_values_in_total_sale(load_data):
+def test_count_positive_values_in_total_sale(perfil_total_venta):
     '''Caso de prueba 5: Contar cuántos registros tienen valores positivos en la columna total_venta.'''
-    data = load_data
-    positive_values = data['total_venta'].apply(lambda x: pd.to_numeric(x, errors='coerce') > 0)
-    positive_count = positive_values.sum()
+    positive_count = perfil_total_venta.positivos
     logger.info(f"Registros con valores positivos: {positive_count}")
     assert positive_count >= 0, "El conteo de valores positivos no es correcto."
 
 # Caso de prueba 6: Asegurarse de que en la columna 'total_venta' la cantidad de registros positvios son: 5577
 @pytest.mark.parametrize("expected_count", [5577])
-def test_exact_count_positive_values_in_total_sale(load_data, expected_count):
+def test_exact_count_positive_values_in_total_sale(perfil_total_venta, expected_count):
     '''Caso de prueba 6: Asegurarse de que en la columna 'total_venta' la cantidad de registros positvios son: 5577'''
-    data = load_data
-    positive_values = data['total_venta'].apply(lambda x: pd.to_numeric(x, errors='coerce') > 0)
-    positive_count = positive_values.sum()
+    positive_count = perfil_total_venta.positivos
     if positive_count == expected_count:
         logger.info(f"Efectivamente los registros con valores positivos en la columna total_venta son : {positive_count}")
     else:
         logger.error(f"Error: Se esperaban {expected_count}, pero se encontraron {positive_count}.")
         assert positive_count == expected_count, (f"Se esperaba que los valores positivos fuesen {expected_count}, pero se encontraron {positive_count}.")
 
-def test_count_negative_values_in_total_sale(load_data):
+def test_count_negative_values_in_total_sale(perfil_total_venta):
     '''Caso de prueba 7: Contar cuántos registros tienen valores negativos en la columna total_venta.'''
-    data = load_data
-    negative_values = data['total_venta'].apply(lambda x: pd.to_numeric(x, errors='coerce') < 0)
-    negative_count = negative_values.sum()
+    negative_count = perfil_total_venta.negativos
     logger.info(f"Registros con valores negativos: {negative_count}")
     assert negative_count >= 0, "El conteo de valores negativos no es correcto."
 
 #Caso de prueba 8: Asegurarse de que en la columna 'total_venta' la cantidad de registros negativos son: 507
 @pytest.mark.parametrize("expected_count", [507])
-def test_count_exact_negative_values_in_total_sale(load_data, expected_count):
+def test_count_exact_negative_values_in_total_sale(perfil_total_venta, expected_count):
     '''Caso de prueba 8: Asegurarse de que en la columna 'total_venta' la cantidad de registros negativos son: 507'''
-    data = load_data
-    negative_values = data['total_venta'].apply(lambda x: pd.to_numeric(x, errors='coerce') < 0)
-    negative_count = negative_values.sum()
+    negative_count = perfil_total_venta.negativos
     if negative_count == expected_count:
         logger.info(f"Efectivamente los registros con valores positivos en la columna total_venta son: {negative_count}")
     else:
@@ -120,18 +113,16 @@ def test_count_exact_negative_values_in_total_sale(load_data, expected_count):
         assert negative_count == expected_count, (f"Se esperaba que los valores positivos fuesen {expected_count}, pero se encontraron {negative_count}.")
 
 # Caso 9: Confirmar que no existan valores nulos o vacíos en 'total_venta'
-def test_no_null_or_empty_values_in_total_sale(load_data):
+def test_no_null_or_empty_values_in_total_sale(perfil_total_venta):
     '''Caso de prueba 9: Contar cuántos registros vacíos hay en la columna total_venta.'''
-    data = load_data
-    null_or_empty_count = data['total_venta'].isna().sum()
+    null_or_empty_count = perfil_total_venta.nulos
     logger.info(f"Valores nulos o vacíos en 'total_venta': {null_or_empty_count}")
     assert null_or_empty_count == 0, "Se encontraron valores nulos o vacíos en 'total_venta'."
 
 @pytest.mark.parametrize("expected_count", [0])
-def test_count_exact_or_empty_values_null_in_total_sale(load_data, expected_count):
+def test_count_exact_or_empty_values_null_in_total_sale(perfil_total_venta, expected_count):
     '''Caso de prueba 10: Asegurarse de que en la columna 'total_venta' la cantidad de registros vacíos son: 0'''
-    data = load_data
-    null_or_empty_count = data['total_venta'].isna().sum()
+    null_or_empty_count = perfil_total_venta.nulos
     if null_or_empty_count == expected_count:
         logger.info(f"Efectivamente los registros vacíos en la columna total_venta son: {null_or_empty_count}")
     else:
@@ -155,10 +146,9 @@ def test_no_negative_values_in_total_sale(load_data):
     assert negative_count == 0, "Se encontraron valores negativos en 'total_venta', pero no deberían existir."
 
 # Caso 13: Confirmar que todos los valores en 'total_venta' son numéricos
-def test_all_numeric_values_in_total_sale(load_data):
+def test_all_numeric_values_in_total_sale(perfil_total_venta):
     '''Caso de prueba 13: Confirmar que todos los valores en la columna 'total_venta' son numéricos.'''
-    data = load_data
-    non_numeric_count = data['total_venta'].apply(lambda x: not isinstance(x, (int, float))).sum()
+    non_numeric_count = perfil_total_venta.no_numericos
     logger.info(f"Valores no numéricos en 'total_venta' son: {non_numeric_count}")
     assert non_numeric_count == 0, "Se encontraron valores no numéricos en 'total_venta'."
 
@@ -171,19 +161,17 @@ def test_all_values_are_numeric_in_total_sale(load_data):
     assert non_numeric_values == 0, f"Se encontraron {non_numeric_values} valores no numéricos en la columna total_venta."'''
 
 # Caso de prueba 15: Contar cuántos registros son de tipo de dato cadena de texto en la columna total_venta.
-def test_count_text_values_in_total_sale(load_data):
+def test_count_text_values_in_total_sale(perfil_total_venta):
     '''Caso de prueba 15: Contar cuántos registros son tipo de dato cadena de texto en la columna total_venta.'''
-    data = load_data
-    text_values = data['total_venta'].apply(lambda x: isinstance(x, str) and not x.isnumeric()).sum()
+    text_values = perfil_total_venta.textos_no_numericos
     logger.info(f"La cantidad de registros con cadenas de texto en 'total_venta' son: {text_values}")
     assert text_values >= 0, "El conteo de cadenas de texto no es correcto."
 
 # Caso de prueba 16: Asegurarse de que 6120 registros son tipo de dato cadena de texto en la columna total_venta.
 @pytest.mark.parametrize("expected_count", [6120])
-def test_count_exact_text_values_in_total_sale(load_data, expected_count):
+def test_count_exact_text_values_in_total_sale(perfil_total_venta, expected_count):
     '''Caso de prueba 16: Asegurarse de que 6120 registros son tipo de dato cadena de texto en la columna total_venta.'''
-    data = load_data
-    text_values = data['total_venta'].apply(lambda x: isinstance(x, str) and not x.isnumeric()).sum()
+    text_values = perfil_total_venta.textos_no_numericos
     if text_values == expected_count:
         logger.info(f"Efectivamente la cantidad de registros con cadenas de texto en 'total_venta' son: {text_values}")
     else:
@@ -191,19 +179,17 @@ def test_count_exact_text_values_in_total_sale(load_data, expected_count):
         assert text_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {text_values}.")
 
 # Caso de prueba 17: Contar cuántos registros tienen valores entre 200 y 1200 en la columna total_venta.
-def test_count_values_between_200_and_1200_in_total_sale(load_data):
+def test_count_values_between_200_and_1200_in_total_sale(perfil_total_venta):
     '''Caso de prueba 17: Contar cuántos registros tienen valores entre 200 y 1200 en la columna total_venta.'''
-    data = load_data
-    in_range_values = data['total_venta'].apply(lambda x: 200 <= pd.to_numeric(x, errors='coerce') <= 1200).sum()
+    in_range_values = perfil_total_venta.en_rango(200, 1200)
     logger.info(f"Registros con valores entre 200 y 1200 en 'total_venta': {in_range_values}")
     assert in_range_values >= 0, "El conteo de valores entre 200 y 1200 no es correcto."
 
 # Caso de prueba 18: Asegurarse de que 15 registros tienen valores entre 200 y 1200 en la columna total_venta.
 @pytest.mark.parametrize("expected_count", [1607])
-def test_count_exact_values_between_200_and_1200_in_total_sale(load_data, expected_count):
+def test_count_exact_values_between_200_and_1200_in_total_sale(perfil_total_venta, expected_count):
     '''Caso de prueba 18: Asegurarse de que 1607 registros tienen valores entre 200 y 1200 en la columna total_venta.'''
-    data = load_data
-    in_range_values = data['total_venta'].apply(lambda x: 200 <= pd.to_numeric(x, errors='coerce') <= 1200).sum()
+    in_range_values = perfil_total_venta.en_rango(200, 1200)
     if in_range_values == expected_count:
         logger.info(f"Efectivamente, los registros con valores entre 200 y 1200 en 'total_venta': {in_range_values}")
     else:
@@ -211,60 +197,95 @@ def test_count_exact_values_between_200_and_1200_in_total_sale(load_data, expect
         assert in_range_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {in_range_values}.")
 
 # Caso de prueba 19: Contar cuántos registros tienen valores que comienzan con 'Total inconsistente' en la columna total_venta.
-def test_count_values_with_total_in_total_sale(load_data):
+def test_count_values_with_total_in_total_sale(perfil_total_venta):
     '''Caso de prueba 19: Contar cuántos registros tienen valores 'Total inconsistente' en la columna total_venta.'''
-    data = load_data
-    total_inconsistent_values = data['total_venta'].astype(str).str.contains('Total inconsistente').sum()
+    total_inconsistent_values = perfil_total_venta.contiene['Total inconsistente']
     logger.info(f"La cantidad de registros que comienzan con 'Total inconsistente en' 'total_venta': {total_inconsistent_values}")
     assert total_inconsistent_values >= 0, "El conteo de valores que comienzan con - no es correcto."
 
 # Caso de prueba 20: Asegurarse de que 36 registros empiezan con 'Total inconsistente' en la columna total_venta.
 @pytest.mark.parametrize("expected_count",  [36])
-def test_values_exact_with_total_in_total_sale(load_data, expected_count):
+def test_values_exact_with_total_in_total_sale(perfil_total_venta, expected_count):
     '''Caso de prueba 20: Asegurarse de que 36 registros tienen 'Total inconsiente' en la columna total_venta.'''
-    data = load_data
-    total_inconsistent_values = data['total_venta'].astype(str).str.contains('Total inconsistente').sum()
+    total_inconsistent_values = perfil_total_venta.contiene['Total inconsistente']
     if total_inconsistent_values == expected_count:
         logger.info(f"Efectivamente, los registros que empiezan con 'Total inconsistente' en 'total_venta': {total_inconsistent_values}")
     else:
         logger.error(f"Error: se esperaban {expected_count} registros, pero la cantidad de registros que empiezan con 'Total inconsistente' son: {total_inconsistent_values}")
         assert total_inconsistent_values == expected_count, (f"Se esperaba que el número de registros fuesen {expected_count}, pero se encontraron: {total_inconsistent_values}.")
 
+# Consistencia de 'total_venta' con 'precio' × 'cantidad_vendida', calculada una sola vez para todos los casos
+@pytest.fixture(scope="module")
+def consistencia_total(datos_ventas):
+    '''Compara total_venta con precio × cantidad_vendida en todas las filas (tolerancia de un centavo).'''
+    return verificar_total(datos_ventas, tolerancia=0.01)
+
+# Caso de prueba 21: Identificar registros donde 'total_venta' no es 'precio' × 'cantidad_vendida'
+def test_find_total_not_matching_price_times_quantity(consistencia_total):
+    '''Caso de prueba 21: Identificar registros donde 'total_venta' no es 'precio' × 'cantidad_vendida'.'''
+    logger.info(f"Consistencia de 'total_venta': {consistencia_total.resumen()}")
+    logger.info(f"Registros con mayor diferencia:\n{consistencia_total.mayores_diferencias(5)}")
+    assert consistencia_total.cantidad(INCONSISTENTE) > 0, "No se encontraron totales inconsistentes."
+
+# Caso de prueba 22: Asegurarse de que 302 registros tienen un total distinto de 'precio' × 'cantidad_vendida'
+@pytest.mark.parametrize("expected_count", [302])
+def test_exact_total_not_matching_price_times_quantity(consistencia_total, expected_count):
+    '''Caso de prueba 22: Asegurarse de que 302 registros tienen un total distinto de 'precio' × 'cantidad_vendida'.'''
+    inconsistent_count = consistencia_total.cantidad(INCONSISTENTE)
+    logger.info(f"Registros con total inconsistente: {list(consistencia_total.indices()[:20])} ...")
+    assert inconsistent_count == expected_count, (f"Se esperaban {expected_count} registros, pero se encontraron {inconsistent_count}.")
+    assert consistencia_total.cantidad(SIN_DATOS) == 260, "Se esperaban 260 registros sin precio, cantidad o total numérico."
+
+# Caso de prueba 23: El valor más bajo de 'total_venta' (-4104288.13) corresponde a su precio y cantidad
+def test_lowest_total_matches_price_times_quantity(datos_ventas, consistencia_total):
+    '''Caso de prueba 23: El valor más bajo de 'total_venta' (-4104288.13) corresponde a su precio y cantidad.'''
+    posicion = np.nanargmin(columna_numerica(datos_ventas, 'total_venta').valores)
+    fila = datos_ventas.iloc[posicion][['precio', 'cantidad_vendida', 'total_venta']].tolist()
+    logger.info(f"Registro con el total más bajo (precio, cantidad_vendida, total_venta): {fila}")
+    assert consistencia_total.estado[posicion] == CONSISTENTE, "El total más bajo no corresponde a precio × cantidad_vendida."
+
+# Caso de prueba 24: Con los precios con $ convertidos, solo quedan sin comparar los registros sin número
+def test_total_with_currency_prices(datos_ventas):
+    '''Caso de prueba 24: Con los precios con $ convertidos, solo quedan sin comparar los registros sin número.'''
+    resultado = verificar_total(datos_ventas, tolerancia=0.01, moneda=True)
+    logger.info(f"Consistencia de 'total_venta' con los precios con $ convertidos: {resultado.resumen()}")
+    assert resultado.cantidad(SIN_DATOS) == 36, f"Se esperaban 36 registros sin datos, pero se encontraron {resultado.cantidad(SIN_DATOS)}."
+    assert resultado.cantidad(INCONSISTENTE) == 309, f"Se esperaban 309 registros inconsistentes, pero se encontraron {resultado.cantidad(INCONSISTENTE)}."
+
 @pytest.mark.parametrize(
     "test_name, validation_function, expected_value",
     [
         # Caso 2: Valor más alto en la columna 'total_venta'
-        ("Valor más alto", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').max(), 22914.7),
+        ("Valor más alto", lambda perfil: perfil.maximo, 22914.7),
         
         # Caso 4: Valor más bajo en la columna 'total_venta'
-        ("Valor más bajo", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').min(), -4104288.13),
+        ("Valor más bajo", lambda perfil: perfil.minimo, -4104288.13),
         
         # Caso 6: Registros positivos en la columna 'total_venta'
-        ("Registros positivos 1", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').gt(0).sum(), 5577),
+        ("Registros positivos 1", lambda perfil: perfil.positivos, 5577),
                     
         # Caso 12: Registros negativos en la columna 'total_venta'
-        ("Sin valores negativos", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').lt(0).sum(), 507),
+        ("Sin valores negativos", lambda perfil: perfil.negativos, 507),
              
         # Caso 16: Registros string en la columna 'total_venta'
-        ("Registros como string", lambda data: data['total_venta'].apply(lambda x: isinstance(x, str)).sum(), 6120),
+        ("Registros como string", lambda perfil: perfil.textos, 6120),
         
         # Caso 18: Valores entre 200 y 1200 en la columna 'total_venta'
-        ("Valores entre 200 y 1200", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').between(200, 1200).sum(), 1607),    
+        ("Valores entre 200 y 1200", lambda perfil: perfil.en_rango(200, 1200), 1607),    
 
         #casos failed para ver el mensaje de error     
-        ("Valor más alto", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').max(), 22914.6),
-        ("Valor más bajo", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').min(), -4104288.11),
-        ("Registros positivos 1", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').gt(0).sum(), 5566 ),
-        ("Sin valores negativos", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').lt(0).sum(), 506),
-        ("Registros como string", lambda data: data['total_venta'].apply(lambda x: isinstance(x, str)).sum(), 6121),
-        ("Valores entre 200 y 1200", lambda data: pd.to_numeric(data['total_venta'], errors='coerce').between(200, 1200).sum(), 1606),
+        ("Valor más alto", lambda perfil: perfil.maximo, 22914.6),
+        ("Valor más bajo", lambda perfil: perfil.minimo, -4104288.11),
+        ("Registros positivos 1", lambda perfil: perfil.positivos, 5566 ),
+        ("Sin valores negativos", lambda perfil: perfil.negativos, 506),
+        ("Registros como string", lambda perfil: perfil.textos, 6121),
+        ("Valores entre 200 y 1200", lambda perfil: perfil.en_rango(200, 1200), 1606),
     ]
 )
 
-def test_validations(load_data, test_name, validation_function, expected_value):
+def test_validations(perfil_total_venta, test_name, validation_function, expected_value):
     '''Validaciones parametrizadas para diferentes casos en la columna 'total_venta'.'''
-    data = load_data
-    result = validation_function(data)
+    result = validation_function(perfil_total_venta)
     if result == expected_value:
         logger.info(f"{test_name}: Validación exitosa. Resultado esperado y obtenido: {result}")
     else:
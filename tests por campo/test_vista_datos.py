@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+import logging
+
+from coercion import columna_numerica
+from vista_datos import VistaDatos
+
+'''
+para ejecutar los casos
+
+pytest test_vista_datos.py -v --tb=short --log-cli-level=INFO
+
+'''
+
+# Configurar logging para pytest en la consola
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def compartido():
+    '''DataFrame compartido por las vistas, como datos_ventas en la sesión.'''
+    return pd.DataFrame({"precio": ["10", "$20", np.nan, "-5"], "region": ["Centro", "Norte", "Centro", "Sur"]})
+
+# Caso de prueba 1: Las columnas compartidas no se copian y no se pueden escribir
+def test_shared_columns_are_read_only(compartido):
+    '''Caso de prueba 1: Confirmar que la vista entrega los arreglos del DataFrame compartido marcados como no escribibles.'''
+    vista = VistaDatos(compartido)
+    for columna in (vista["precio"], vista.marco["region"]):
+        valores = columna.to_numpy(copy=False)
+        assert np.shares_memory(valores, compartido[columna.name].to_numpy(copy=False))
+        assert not valores.flags.writeable
+        with pytest.raises(ValueError, match="read-only"):
+            valores[0] = "0"
+    assert compartido["precio"].to_numpy(copy=False).flags.writeable, "La vista marcó como no escribible el DataFrame compartido."
+
+# Caso de prueba 2: Asignar una columna en una vista no cambia el DataFrame compartido ni otra vista
+def test_assignment_stays_in_its_view(compartido):
+    '''Caso de prueba 2: Validar que la columna asignada solo existe en la vista que la asignó.'''
+    original = compartido.copy()
+    vista, otra = VistaDatos(compartido), VistaDatos(compartido)
+    vista["precio"] = pd.to_numeric(vista["precio"], errors="coerce")
+    vista["total"] = 1.0
+    logger.info(f"Columnas modificadas: {vista.columnas_modificadas}")
+    assert vista.columnas_modificadas == ["precio", "total"]
+    assert vista["precio"].isna().sum() == 2
+    assert otra.columnas_modificadas == [] and "total" not in otra
+    pd.testing.assert_series_equal(otra["precio"], original["precio"])
+    pd.testing.assert_frame_equal(compartido, original)
+    assert vista.numerica("precio") is not otra.numerica("precio")
+    assert otra.numerica("precio") is columna_numerica(compartido, "precio")
+
+# Caso de prueba 3: Escribir sobre la copia propia de una columna no alcanza a los datos compartidos
+def test_writes_to_own_copy_stay_in_its_view(compartido):
+    '''Caso de prueba 3: Confirmar que reasignar una columna compartida la copia antes de permitir escribirla.'''
+    vista, otra = VistaDatos(compartido), VistaDatos(compartido)
+    vista["region"] = vista["region"]
+    propia = vista["region"]
+    assert propia.to_numpy(copy=False).flags.writeable
+    propia.iloc[0] = "Oriente"
+    assert vista["region"].iloc[0] == "Oriente"
+    assert otra["region"].iloc[0] == compartido["region"].iloc[0] == "Centro"
@@ -0,0 +1,110 @@
+import pandas as pd
+
+from coercion import columna_numerica, convertir_columna
+from columna_diccionario import codificar_columna, columna_diccionario
+from reparacion_texto import ColumnaReparada, reparar_columna
+
+
+class VistaDatos:
+    '''
+    Vista de solo lectura sobre el DataFrame compartido de la sesión.
+
+    Las columnas se entregan sin copiar los datos, sobre arreglos marcados como no escribibles, de modo
+    que un caso de prueba no puede alterar los datos de los demás. Cuando un caso asigna una columna
+    (data['precio'] = pd.to_numeric(...)), la vista guarda una copia propia solo de esa columna.
+    '''
+
+    def __init__(self, base):
+        self._base = base
+        self._propias = {}
+        self._numericas = {}
+        self._diccionarios = {}
+        self._reparadas = {}
+        self._marco = None
+
+    def _columna_compartida(self, nombre):
+        valores = self._base[nombre].to_numpy(copy=False).view()
+        valores.flags.writeable = False
+        return pd.Series(valores, index=self._base.index, name=nombre, copy=False)
+
+    def columna(self, nombre):
+        '''Devuelve la columna indicada, propia si el caso ya la modificó o compartida en caso contrario.'''
+        if nombre in self._propias:
+            return self._propias[nombre]
+        return self._columna_compartida(nombre)
+
+    def numerica(self, nombre):
+        '''Conversión a número de la columna (ver coercion.py), compartida entre casos si la columna no se modificó.'''
+        if nombre not in self._propias:
+            return columna_numerica(self._base, nombre)
+        if nombre not in self._numericas:
+            self._numericas[nombre] = convertir_columna(self._propias[nombre])
+        return self._numericas[nombre]
+
+    def diccionario(self, nombre):
+        '''Columna codificada como diccionario (ver columna_diccionario.py), compartida entre casos si la columna no se modificó.'''
+        if nombre not in self._propias:
+            return columna_diccionario(self._base, nombre)
+        if nombre not in self._diccionarios:
+            self._diccionarios[nombre] = codificar_columna(self._propias[nombre])
+        return self._diccionarios[nombre]
+
+    def reparada(self, nombre):
+        '''Columna sin doble codificación (ver reparacion_texto.py), compartida entre casos si la columna no se modificó.'''
+        if nombre not in self._propias:
+            return reparar_columna(self._base, nombre)
+        if nombre not in self._reparadas:
+            self._reparadas[nombre] = ColumnaReparada(self.diccionario(nombre))
+        return self._reparadas[nombre]
+
+    @property
+    def columnas_modificadas(self):
+        '''Nombres de las columnas de las que la vista tiene una copia propia.'''
+        return list(self._propias)
+
+    @property
+    def marco(self):
+        '''DataFrame con las columnas de la vista, sin copiar las columnas compartidas.'''
+        if self._marco is None:
+            columnas = {nombre: self.columna(nombre) for nombre in self._base.columns}
+            columnas.update(self._propias)
+            self._marco = pd.DataFrame(columnas, index=self._base.index, copy=False)
+        return self._marco
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str) and (clave in self._propias or clave in self._base.columns):
+            return self.columna(clave)
+        return self.marco[clave]
+
+    def __setitem__(self, nombre, valor):
+        if isinstance(valor, pd.Series):
+            serie = valor.reindex(self._base.index)
+        else:
+            serie = pd.Series(valor, index=self._base.index)
+        # Solo se copia si el valor asignado sigue apuntando a datos compartidos
+        if not serie.to_numpy(copy=False).flags.writeable:
+            serie = serie.copy()
+        serie.name = nombre
+        self._propias[nombre] = serie
+        self._numericas.pop(nombre, None)
+        self._diccionarios.pop(nombre, None)
+        self._reparadas.pop(nombre, None)
+        self._marco = None
+
+    def __contains__(self, nombre):
+        return nombre in self._propias or nombre in self._base.columns
+
+    def __len__(self):
+        return len(self._base)
+
+    def __iter__(self):
+        return iter(self.marco.columns)
+
+    def __getattr__(self, atributo):
+        # Los demás atributos (columns, shape, groupby, ...) se resuelven sobre el DataFrame de la vista
+        if atributo.startswith("_"):
+            raise AttributeError(atributo)
+        return getattr(self.marco, atributo)
+
+    def __repr__(self):
+        return repr(self.marco)